@@ -1,4 +1,7 @@
 import subprocess
+import multiprocessing
+import queue
+import threading
 from tkinter import filedialog, messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
@@ -15,6 +18,8 @@ from scripts.cartpanda_transformer import process_cartpanda
 from scripts.process_files_peron import process_files_peron
 from scripts.process_meta_text_logs import process_meta_text_logs
 from scripts.check_one_file_hash import check_one_file_hash
+from scripts.hash_report_tools import AUTO_HASH_FUNC
+from scripts.hash_progress import ProgressEvent, format_progress_line
 from scripts.microsoft_transformer import process_microsoft
 from scripts.telegram_transformer import process_telegram
 from scripts.yahoo_transformer import process_yahoo
@@ -163,7 +168,7 @@ class Janela(ttk.Window):
             **kwargs,
         )
         self.title("Processamento de telemática")
-        self.centralize_window(900, 460)
+        self.centralize_window(900, 500)
         self.configure_tabs()
         self.configure_tab1()
         self.configure_tab2()
@@ -199,9 +204,27 @@ class Janela(ttk.Window):
             command=lambda: selecionar_pasta(self.entry_pasta_hashes),
         ).pack()
 
-        ttk.Button(
+        self.force_rehash_tab1 = ttk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.tab1,
+            text="Forçar recálculo das hashes (cadeia de custódia)",
+            variable=self.force_rehash_tab1,
+        ).pack(pady=(20, 0))
+
+        self.button_hashes_tab1 = ttk.Button(
             self.tab1, text="Verificar Hashes", command=self.executar_script_hashes
-        ).pack(pady=40)
+        )
+        self.button_hashes_tab1.pack(pady=(40, 10))
+
+        self.progress_bar_tab1 = ttk.Progressbar(
+            self.tab1, length=600, maximum=100, mode="determinate"
+        )
+        self.progress_bar_tab1.pack(pady=(10, 3))
+
+        self.progress_label_tab1 = ttk.Label(self.tab1, text="")
+        self.progress_label_tab1.pack()
+
+        self.progress_events: queue.Queue[ProgressEvent | dict] = queue.Queue()
 
     def configure_tab2(self):
         # === Aba 2: Processamento de Logs ===
@@ -235,9 +258,24 @@ class Janela(ttk.Window):
             text="Selecionar Pasta",
             command=lambda: selecionar_pasta(self.entry_pasta_listagem),
         ).pack()
+
+        self.seal_tab3 = ttk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.tab3,
+            text="Calcular as hashes reais (SHA256) em vez do modelo",
+            variable=self.seal_tab3,
+        ).pack(pady=(20, 0))
+
+        self.write_csv_tab3 = ttk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.tab3,
+            text="Gravar também hashes.csv com tamanho e data de modificação",
+            variable=self.write_csv_tab3,
+        ).pack(pady=(10, 0))
+
         ttk.Button(
             self.tab3,
-            text="Gerar modelo hashes.txt",
+            text="Gerar hashes.txt",
             command=self.executar_script_criacao_modelo,
         ).pack(pady=20)
 
@@ -254,15 +292,22 @@ class Janela(ttk.Window):
         self.hash_type = ttk.StringVar()
         ttk.Label(self.tab4, text="Tipo da hash:").pack(pady=(10, 0))
         self.hash_box = ttk.Combobox(self.tab4, textvariable=self.hash_type)
-        self.hash_box["values"] = ("SHA256", "SHA512")
+        self.hash_box["values"] = (AUTO_HASH_FUNC, "SHA256", "SHA512", "SHA1", "MD5")
         self.hash_box.state(["readonly"])
-        self.hash_box.set("SHA256")
+        self.hash_box.set(AUTO_HASH_FUNC)
         self.hash_box.pack(pady=(3, 10))
 
         ttk.Label(self.tab4, text="Hash original:").pack(pady=(10, 0))
         self.entry_original_hash = ttk.Entry(self.tab4, width=path_input_width)
         self.entry_original_hash.pack(pady=(3, 10))
 
+        self.force_rehash_tab4 = ttk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.tab4,
+            text="Forçar recálculo da hash (cadeia de custódia)",
+            variable=self.force_rehash_tab4,
+        ).pack(pady=(10, 0))
+
         ttk.Button(
             self.tab4, text="Comparar hash", command=self.comparate_single_file_hash
         ).pack(pady=20)
@@ -356,18 +401,63 @@ class Janela(ttk.Window):
             messagebox.showerror("Erro", "Verifique a pasta e o arquivo de hashes.")
             return
 
+        self.button_hashes_tab1.configure(state="disabled")
+        self.progress_bar_tab1.configure(value=0)
+        self.progress_label_tab1.configure(text="Listando arquivos...")
+
+        # a verificação roda em outra thread e a janela acompanha pela fila
+        threading.Thread(
+            target=self.verify_hashes_in_background,
+            args=(str(path.resolve()), self.force_rehash_tab1.get()),
+            daemon=True,
+        ).start()
+
+        self.after(100, self.poll_hashes_progress)
+
+    def verify_hashes_in_background(self, folder_path: str, force_rehash: bool):
         try:
-            result = verify_hashes(str(path.resolve()))
-            if e := result.get("error"):
-                messagebox.showerror("Erro", f"Erro ao executar script:\n{e}")
+            result = verify_hashes(
+                folder_path,
+                force_rehash=force_rehash,
+                progress_listeners=[self.progress_events.put],
+            )
+        except Exception as e:
+            result = {"error": str(e)}
+
+        self.progress_events.put({"type": "done", "result": result})
+
+    def poll_hashes_progress(self):
+        while True:
+            try:
+                event = self.progress_events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event["type"] == "done":
+                self.finish_hashes_verification(event["result"])
                 return
 
-            messagebox.showinfo(
-                "Sucesso",
-                "Verificação de hashes concluída.\n\nFoi criado um relatório em pdf na mesma pasta.",
-            )
-        except subprocess.CalledProcessError as e:
+            if event["total_bytes"]:
+                percent = event["bytes_hashed"] / event["total_bytes"] * 100
+            else:
+                percent = 100
+            self.progress_bar_tab1.configure(value=percent)
+            self.progress_label_tab1.configure(text=format_progress_line(event))
+
+        self.after(100, self.poll_hashes_progress)
+
+    def finish_hashes_verification(self, result: dict):
+        self.button_hashes_tab1.configure(state="normal")
+
+        if e := result.get("error"):
+            self.progress_label_tab1.configure(text="")
             messagebox.showerror("Erro", f"Erro ao executar script:\n{e}")
+            return
+
+        messagebox.showinfo(
+            "Sucesso",
+            "Verificação de hashes concluída.\n\nFoi criado um relatório em pdf na mesma pasta.",
+        )
 
     def executar_script_logs(self):
         pasta_raiz = self.entry_pasta_logs.get()
@@ -400,7 +490,18 @@ class Janela(ttk.Window):
             return
 
         try:
-            create_hashes_file(pasta)
+            seal = self.seal_tab3.get()
+            result = create_hashes_file(
+                pasta, seal=seal, write_csv=seal and self.write_csv_tab3.get()
+            )
+
+            if failures := result.get("failures"):
+                messagebox.showerror(
+                    "Erro",
+                    "Não foi possível calcular a hash de:\n" + "\n".join(failures),
+                )
+                return
+
             messagebox.showinfo("Sucesso", "O arquivo hashes.txt foi criado.")
         except subprocess.CalledProcessError as e:
             messagebox.showerror("Erro", f"Erro ao executar script:\n{e}")
@@ -420,7 +521,12 @@ class Janela(ttk.Window):
             return
 
         try:
-            result = check_one_file_hash(file, original_hash, hash_type)
+            result = check_one_file_hash(
+                file,
+                original_hash,
+                hash_type,
+                force_rehash=self.force_rehash_tab4.get(),
+            )
 
             if result.get("success"):
                 messagebox.showinfo(
@@ -575,6 +681,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # necessário para o modo de processos no executável do PyInstaller
+    multiprocessing.freeze_support()
     main()
 
 
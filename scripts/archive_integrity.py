@@ -0,0 +1,290 @@
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TypedDict
+from natsort import natsorted
+import py7zr
+
+try:
+    # disponível a partir do py7zr 0.21, permite extrair para a memória
+    from py7zr.io import Py7zIO, WriterFactory
+except ImportError:
+    Py7zIO = None
+    WriterFactory = None
+
+successIcon = "✅"
+errorIcon = "❌"
+
+read_size = 1024 * 1024
+
+
+class MemberResult(TypedDict):
+    member: str
+    size: int
+    ok: bool
+    error: str | None
+    sha256: str | None
+
+
+class ArchiveResult(TypedDict):
+    archive: Path
+    ok: bool
+    error: str | None
+    members: list[MemberResult]
+
+
+def default_max_workers():
+    return min(8, os.cpu_count() or 1)
+
+
+def verify_zip_member(
+    archive_path: Path,
+    info: zipfile.ZipInfo,
+    with_sha256: bool,
+    local: threading.local,
+) -> MemberResult:
+    # cada thread usa o seu próprio ZipFile para não disputar o ponteiro do arquivo
+    if not hasattr(local, "zip_files"):
+        local.zip_files = {}
+
+    zip_file: zipfile.ZipFile | None = local.zip_files.get(archive_path)
+    if zip_file is None:
+        zip_file = zipfile.ZipFile(archive_path)
+        local.zip_files[archive_path] = zip_file
+
+    sha256 = hashlib.sha256() if with_sha256 else None
+    size = 0
+
+    try:
+        # o ZipExtFile confere o CRC ao chegar no fim do membro
+        with zip_file.open(info) as member:
+            while chunk := member.read(read_size):
+                size += len(chunk)
+                if sha256:
+                    sha256.update(chunk)
+
+        return {
+            "member": info.filename,
+            "size": size,
+            "ok": True,
+            "error": None,
+            "sha256": sha256.hexdigest() if sha256 else None,
+        }
+    except Exception as e:
+        return {
+            "member": info.filename,
+            "size": size,
+            "ok": False,
+            "error": str(e),
+            "sha256": None,
+        }
+
+
+def verify_zip(
+    archive_path: Path, with_sha256: bool = False, max_workers: int | None = None
+) -> ArchiveResult:
+    try:
+        with zipfile.ZipFile(archive_path) as zip_file:
+            infos = [info for info in zip_file.infolist() if not info.is_dir()]
+    except Exception as e:
+        return {"archive": archive_path, "ok": False, "error": str(e), "members": []}
+
+    local = threading.local()
+    max_workers = max_workers or default_max_workers()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        members = list(
+            executor.map(
+                lambda info: verify_zip_member(archive_path, info, with_sha256, local),
+                infos,
+            )
+        )
+
+    return {
+        "archive": archive_path,
+        "ok": all(member["ok"] for member in members),
+        "error": None,
+        "members": members,
+    }
+
+
+if Py7zIO is not None:
+
+    class HashingIO(Py7zIO):
+        # recebe os dados descompactados do py7zr sem gravá-los em disco
+        def __init__(self, filename: str, with_sha256: bool):
+            self.filename = filename
+            self.sha256 = hashlib.sha256() if with_sha256 else None
+            self.length = 0
+
+        def write(self, s):
+            self.length += len(s)
+            if self.sha256:
+                self.sha256.update(s)
+            return len(s)
+
+        def read(self, size=None):
+            return b""
+
+        def seek(self, offset, whence=0):
+            return 0
+
+        def flush(self):
+            pass
+
+        def size(self):
+            return self.length
+
+    class HashingFactory(WriterFactory):
+        def __init__(self, with_sha256: bool):
+            self.with_sha256 = with_sha256
+            self.writers: dict[str, HashingIO] = {}
+
+        def create(self, filename: str):
+            writer = HashingIO(filename, self.with_sha256)
+            self.writers[filename] = writer
+            return writer
+
+
+def verify_7z(archive_path: Path, with_sha256: bool = False) -> ArchiveResult:
+    # arquivos 7z sólidos são um único fluxo: o paralelismo fica entre arquivos
+    try:
+        with py7zr.SevenZipFile(archive_path, mode="r") as archive:
+            if Py7zIO is None:
+                bad_member = archive.testzip()
+                if bad_member:
+                    raise ValueError(f"CRC incorreto em {bad_member}")
+
+                members: list[MemberResult] = [
+                    {
+                        "member": info.filename,
+                        "size": info.uncompressed,
+                        "ok": True,
+                        "error": None,
+                        "sha256": None,
+                    }
+                    for info in archive.list()
+                    if not info.is_directory
+                ]
+            else:
+                factory = HashingFactory(with_sha256)
+                # o py7zr confere o CRC de cada membro durante a extração
+                archive.extractall(factory=factory)
+
+                members = [
+                    {
+                        "member": writer.filename,
+                        "size": writer.length,
+                        "ok": True,
+                        "error": None,
+                        "sha256": (
+                            writer.sha256.hexdigest() if writer.sha256 else None
+                        ),
+                    }
+                    for writer in factory.writers.values()
+                ]
+
+        return {"archive": archive_path, "ok": True, "error": None, "members": members}
+    except Exception as e:
+        return {"archive": archive_path, "ok": False, "error": str(e), "members": []}
+
+
+def verify_archive(
+    archive_path: Path, with_sha256: bool = False, max_workers: int | None = None
+) -> ArchiveResult:
+    if archive_path.name.endswith(".7z") or py7zr.is_7zfile(archive_path):
+        return verify_7z(archive_path, with_sha256)
+
+    return verify_zip(archive_path, with_sha256, max_workers)
+
+
+def find_archives(root_path: Path):
+    archives = [
+        item
+        for item in root_path.rglob("*")
+        if item.is_file() and item.name.endswith((".zip", ".7z"))
+    ]
+
+    return natsorted(archives)
+
+
+def verify_archives(
+    archives: list[Path],
+    with_sha256: bool = False,
+    max_workers: int | None = None,
+    max_archives: int = 2,
+) -> list[ArchiveResult]:
+    with ThreadPoolExecutor(max_workers=max_archives) as executor:
+        return list(
+            executor.map(
+                lambda archive: verify_archive(archive, with_sha256, max_workers),
+                archives,
+            )
+        )
+
+
+def print_archive_result(result: ArchiveResult):
+    if result["ok"]:
+        print(
+            f"{successIcon} {result['archive']} íntegro ({len(result['members'])} arquivos)"
+        )
+    else:
+        print(f"{errorIcon} {result['archive']} corrompido")
+
+    if result["error"]:
+        print(f"      erro: {result['error']}")
+
+    for member in result["members"]:
+        if not member["ok"]:
+            print(f"      {member['member']}: {member['error']}")
+        elif member["sha256"]:
+            print(f"      {member['member']}: {member['sha256']}")
+
+
+def verify_archives_in_folder(
+    folder_path: str, with_sha256: bool = False, max_workers: int | None = None
+):
+    archives = find_archives(Path(folder_path))
+
+    print(f"Verificando a integridade de {len(archives)} arquivos compactados\n")
+
+    results = verify_archives(archives, with_sha256, max_workers)
+
+    for result in results:
+        print_archive_result(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        "Verifica a integridade de arquivos .zip e .7z sem extraí-los"
+    )
+    parser.add_argument(
+        "--pasta",
+        type=str,
+        required=True,
+        help="Pasta onde estão os arquivos compactados",
+    )
+    parser.add_argument(
+        "--sha256",
+        action="store_true",
+        help="Calcula também a hash SHA256 de cada arquivo compactado",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade de threads por arquivo compactado",
+    )
+
+    args = parser.parse_args()
+
+    results = verify_archives_in_folder(args.pasta, args.sha256, args.workers)
+
+    sys.exit(0 if all(result["ok"] for result in results) else 1)
@@ -0,0 +1,186 @@
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from multiprocessing.managers import SyncManager
+from typing import Iterator
+
+# a partir deste tamanho a leitura do próximo bloco acontece em paralelo ao hash
+READ_AHEAD_THRESHOLD = 1024 * 1024 * 64
+
+READ_AHEAD_BUFFERS = 2
+
+# janela do posix_fadvise: pede a próxima ao kernel e descarta a já lida
+FADVISE_WINDOW = 1024 * 1024 * 64
+
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+
+class BandwidthLimiter:
+    """
+    Balde de tokens compartilhado por todos os leitores de uma execução. Com
+    um SyncManager o estado fica no processo do manager, e o mesmo balde vale
+    para os workers de um ProcessPoolExecutor.
+    """
+
+    def __init__(self, bytes_per_second: float, manager: SyncManager | None = None):
+        self.rate = bytes_per_second
+
+        # começa vazio para que o limite valha desde o primeiro segundo
+        state = [0.0, time.monotonic()]
+
+        if manager:
+            self.state = manager.list(state)
+            self.lock = manager.Lock()
+        else:
+            self.state = state
+            self.lock = threading.Lock()
+
+    def acquire(self, size: int):
+        with self.lock:
+            available, last = self.state[:]
+            now = time.monotonic()
+
+            available = min(self.rate, available + (now - last) * self.rate) - size
+            self.state[:] = [available, now]
+
+        if available < 0:
+            time.sleep(-available / self.rate)
+
+
+class IOConfig:
+    """
+    Como as evidências são lidas: drop_cache evita que a verificação de
+    terabytes expulse do cache de páginas os dados de outros programas, e o
+    limiter limita a banda de leitura. Enviada junto com cada arquivo, para
+    que execuções simultâneas não dividam configurações.
+    """
+
+    __slots__ = ("drop_cache", "limiter")
+
+    def __init__(
+        self, drop_cache: bool = False, limiter: BandwidthLimiter | None = None
+    ):
+        self.drop_cache = drop_cache and HAS_FADVISE
+        self.limiter = limiter
+
+
+class ReadTracker:
+    # aplica os avisos ao kernel e o limite de banda a cada bloco lido
+    def __init__(self, fd: int, config: IOConfig):
+        self.fd = fd
+        self.config = config
+        self.offset = 0
+        self.dropped = 0
+
+        if config.drop_cache:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, FADVISE_WINDOW, os.POSIX_FADV_WILLNEED)
+
+    def consumed(self, size: int):
+        self.offset += size
+
+        if self.config.limiter:
+            self.config.limiter.acquire(size)
+
+        if self.config.drop_cache and self.offset - self.dropped >= FADVISE_WINDOW:
+            self.drop_consumed()
+            os.posix_fadvise(
+                self.fd, self.offset, FADVISE_WINDOW, os.POSIX_FADV_WILLNEED
+            )
+
+    def drop_consumed(self):
+        # o trecho já está nos nossos buffers: o kernel pode liberar as páginas
+        length = self.offset - self.dropped
+        os.posix_fadvise(self.fd, self.dropped, length, os.POSIX_FADV_DONTNEED)
+        self.dropped = self.offset
+
+    def finish(self):
+        if self.config.drop_cache and self.offset > self.dropped:
+            self.drop_consumed()
+
+
+def iter_file_chunks(
+    file_path: Path,
+    chunk_size: int,
+    read_ahead: bool | None = None,
+    io_config: IOConfig | None = None,
+) -> Iterator[memoryview]:
+    """
+    Lê o arquivo com readinto em buffers pré-alocados, sem criar um objeto
+    bytes por bloco. Cada memoryview só é válida até o próximo bloco ser pedido.
+    """
+    if read_ahead is None:
+        try:
+            read_ahead = Path(file_path).stat().st_size >= READ_AHEAD_THRESHOLD
+        except OSError:
+            read_ahead = False
+
+    io_config = io_config or IOConfig()
+
+    if read_ahead:
+        yield from _iter_read_ahead(file_path, chunk_size, io_config)
+        return
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+
+    with open(file_path, "rb", buffering=0) as file:
+        tracker = ReadTracker(file.fileno(), io_config)
+
+        while size := file.readinto(buffer):
+            tracker.consumed(size)
+            yield view[:size]
+
+        tracker.finish()
+
+
+def _iter_read_ahead(
+    file_path: Path, chunk_size: int, io_config: IOConfig
+) -> Iterator[memoryview]:
+    # buffer duplo: a thread lê o bloco N+1 enquanto o bloco N é processado
+    free_buffers: queue.Queue[bytearray | None] = queue.Queue()
+    filled_buffers: queue.Queue[tuple[bytearray | None, int | BaseException]] = (
+        queue.Queue()
+    )
+
+    for _ in range(READ_AHEAD_BUFFERS):
+        free_buffers.put(bytearray(chunk_size))
+
+    file = open(file_path, "rb", buffering=0)
+    tracker = ReadTracker(file.fileno(), io_config)
+
+    def reader():
+        try:
+            while (buffer := free_buffers.get()) is not None:
+                size = file.readinto(buffer)
+                if not size:
+                    break
+                tracker.consumed(size)
+                filled_buffers.put((buffer, size))
+            tracker.finish()
+            filled_buffers.put((None, 0))
+        except BaseException as e:
+            filled_buffers.put((None, e))
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            buffer, result = filled_buffers.get()
+
+            if buffer is None:
+                if isinstance(result, BaseException):
+                    raise result
+                break
+
+            yield memoryview(buffer)[:result]
+
+            free_buffers.put(buffer)
+    finally:
+        # libera a thread caso o consumidor pare antes do fim do arquivo
+        free_buffers.put(None)
+        thread.join()
+        file.close()
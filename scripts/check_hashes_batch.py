@@ -0,0 +1,290 @@
+import sys
+import argparse
+from pathlib import Path
+from typing import TypedDict
+from scripts.hash_report_tools import Reporter
+from scripts.report_writers import DEFAULT_VOLUME_SIZE, REPORT_FORMATS, ReportFormat
+from scripts.manifest_parser import ManifestEntry, parse_sum_lines
+from scripts.hash_engine import HashEngine, HashJob, EngineMode
+
+# códigos de saída no estilo do sha256sum -c
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INVALID_LIST = 2
+
+
+class BatchEntry(TypedDict):
+    file: Path
+    entry: ManifestEntry
+
+
+class BatchSummary(TypedDict):
+    ok: int
+    failed: int
+    missing: int
+    invalid_lines: int
+
+
+def read_batch_entries(lines: list[str], base_path: Path):
+    entries: list[BatchEntry] = []
+
+    # os caminhos da lista são relativos à pasta base, como no sha256sum -c
+    for name, hexdigest, size in parse_sum_lines(lines, keep_path=True):
+        file = Path(name)
+        if not file.is_absolute():
+            file = base_path.joinpath(file)
+
+        entries.append(
+            {"file": file, "entry": ManifestEntry(name, bytes.fromhex(hexdigest), size)}
+        )
+
+    return entries
+
+
+def group_entries_by_file(entries: list[BatchEntry]):
+    # o mesmo arquivo pode aparecer em várias linhas (sha256 e sha512, por
+    # exemplo): é lido uma vez e conferido com todas elas
+    entries_by_file: dict[Path, list[BatchEntry]] = {}
+
+    for item in entries:
+        entries_by_file.setdefault(item["file"], []).append(item)
+
+    return entries_by_file
+
+
+def create_batch_jobs(entries_by_file: dict[Path, list[BatchEntry]]):
+    jobs: list[HashJob] = []
+    missing: list[BatchEntry] = []
+
+    for file, items in entries_by_file.items():
+        try:
+            stat = file.stat()
+        except OSError:
+            missing.extend(items)
+            continue
+
+        hash_funcs = tuple(dict.fromkeys(item["entry"].hash_func for item in items))
+
+        jobs.append(
+            {
+                "file": file,
+                "hash_funcs": hash_funcs,
+                "size": stat.st_size,
+                "inode": stat.st_ino,
+            }
+        )
+
+    return jobs, missing
+
+
+def check_hashes_batch(
+    lines: list[str],
+    base_path: Path,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    force_rehash: bool = False,
+    save_report: bool = True,
+    report_formats: tuple[ReportFormat, ...] = ("pdf",),
+    volume_size: int = DEFAULT_VOLUME_SIZE,
+) -> BatchSummary:
+    """
+    Confere uma lista de hashes no formato do sha256sum/sha512sum, calculando
+    todas em paralelo e gerando um único relatório.
+    """
+    entries = read_batch_entries(lines, base_path)
+    entries_by_file = group_entries_by_file(entries)
+
+    valid_lines = [line for line in lines if line.strip()]
+
+    summary: BatchSummary = {
+        "ok": 0,
+        "failed": 0,
+        "missing": 0,
+        "invalid_lines": len(valid_lines) - len(entries),
+    }
+
+    reporter = Reporter(
+        hashes_count=len(entries),
+        files=list(entries_by_file),
+        formats=report_formats,
+        volume_size=volume_size,
+        pdf_layout="table",
+    )
+    reporter.configure_pdf()
+
+    jobs, missing = create_batch_jobs(entries_by_file)
+
+    for item in missing:
+        print(f"{item['entry'].name}: FAILED open or read")
+        summary["missing"] += 1
+
+        report = Reporter.create_file_report(
+            item["file"],
+            hash_not_found=False,
+            has_collision=True,
+            original_hash=item["entry"].hexdigest,
+            generated_hash=None,
+            file_missing=True,
+        )
+        reporter.add_report_to_pdf(report)
+
+    engine = HashEngine(
+        mode=mode,
+        max_workers=max_workers,
+        force_rehash=force_rehash,
+        schedule="largest_first",
+    )
+
+    for result in engine.run(jobs):
+        reports = []
+
+        for item in entries_by_file[result["file"]]:
+            entry = item["entry"]
+            generated_hash = result["digests"].get(entry.hash_func)
+
+            if generated_hash is None:
+                print(f"{entry.name}: FAILED open or read")
+                summary["missing"] += 1
+            elif entry.matches(generated_hash):
+                print(f"{entry.name}: OK")
+                summary["ok"] += 1
+            else:
+                print(f"{entry.name}: FAILED")
+                summary["failed"] += 1
+
+            report = Reporter.create_file_report(
+                result["file"],
+                hash_not_found=False,
+                has_collision=not entry.matches(generated_hash),
+                original_hash=entry.hexdigest,
+                generated_hash=generated_hash,
+                file_missing=generated_hash is None,
+            )
+            reports.append(report)
+
+        reporter.add_reports_to_pdf(reports)
+
+    if save_report:
+        reporter.save_reports(base_path)
+    else:
+        reporter.close()
+
+    return summary
+
+
+def print_summary(summary: BatchSummary):
+    # avisos no stderr, como o sha256sum, para não misturar com os resultados
+    if summary["invalid_lines"]:
+        print(
+            f"AVISO: {summary['invalid_lines']} linhas com formato inválido",
+            file=sys.stderr,
+        )
+
+    if summary["missing"]:
+        print(
+            f"AVISO: {summary['missing']} arquivos listados não puderam ser lidos",
+            file=sys.stderr,
+        )
+
+    if summary["failed"]:
+        print(
+            f"AVISO: {summary['failed']} hashes calculadas NÃO conferem",
+            file=sys.stderr,
+        )
+
+
+def exit_status(summary: BatchSummary):
+    if summary["ok"] + summary["failed"] + summary["missing"] == 0:
+        return EXIT_INVALID_LIST
+
+    if summary["failed"] or summary["missing"]:
+        return EXIT_FAILED
+
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        "Confere em lote uma lista de hashes no formato do sha256sum -c"
+    )
+    parser.add_argument(
+        "lista",
+        type=str,
+        nargs="?",
+        default="-",
+        help="Arquivo com a lista de hashes (use - ou omita para ler da entrada padrão)",
+    )
+    parser.add_argument(
+        "--pasta",
+        type=str,
+        default=None,
+        help="Pasta base dos caminhos da lista (padrão: pasta da lista ou a atual)",
+    )
+    parser.add_argument(
+        "--modo",
+        type=str,
+        choices=["thread", "process"],
+        default="thread",
+        help="Executa o cálculo das hashes em threads ou em processos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade máxima de workers (padrão: definida pela quantidade de núcleos)",
+    )
+    parser.add_argument(
+        "--forcar-recalculo",
+        action="store_true",
+        help="Ignora o cache e lê novamente todos os arquivos (cadeia de custódia)",
+    )
+    parser.add_argument(
+        "--sem-relatorio",
+        action="store_true",
+        help="Não gera o relatorio_hashes.pdf",
+    )
+    parser.add_argument(
+        "--formatos",
+        nargs="+",
+        choices=REPORT_FORMATS,
+        default=["pdf"],
+        help="Formatos do relatório: pdf, json, csv e/ou html",
+    )
+    parser.add_argument(
+        "--volume",
+        type=int,
+        default=DEFAULT_VOLUME_SIZE,
+        help="Quantidade máxima de arquivos por volume do relatório",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if args.lista == "-":
+            lines = sys.stdin.readlines()
+            default_base_path = Path.cwd()
+        else:
+            list_path = Path(args.lista)
+            with open(list_path, "r", encoding="utf-8-sig") as file:
+                lines = file.readlines()
+            default_base_path = list_path.resolve().parent
+    except OSError as e:
+        print(f"Erro ao ler a lista de hashes: {e}", file=sys.stderr)
+        sys.exit(EXIT_INVALID_LIST)
+
+    base_path = Path(args.pasta) if args.pasta else default_base_path
+
+    summary = check_hashes_batch(
+        lines,
+        base_path.resolve(),
+        mode=args.modo,
+        max_workers=args.workers,
+        force_rehash=args.forcar_recalculo,
+        save_report=not args.sem_relatorio,
+        report_formats=tuple(args.formatos),
+        volume_size=args.volume,
+    )
+
+    print_summary(summary)
+
+    sys.exit(exit_status(summary))
@@ -1,16 +1,23 @@
 from pathlib import Path
-from scripts.hash_report_tools import Reporter, Hasher, HashFunc
+from scripts.hash_report_tools import Reporter, Hasher, HashFuncOption
 
 
-def check_one_file_hash(file_path: str, original_hash: str, hash_func: HashFunc):
+def check_one_file_hash(
+    file_path: str,
+    original_hash: str,
+    hash_func: HashFuncOption,
+    force_rehash: bool = False,
+):
     file = Path(file_path)
 
-    Reporter.configure_pdf()
+    reporter = Reporter(hashes_count=1, files=[file])
+    reporter.configure_pdf()
 
-    Reporter.hashes_count += 1
     print(f"\nIniciando verificação\n")
 
-    result = Hasher.hash_comparator(file, original_hash, hash_func=hash_func)
+    result = Hasher.hash_comparator(
+        file, original_hash, hash_func=hash_func, force_rehash=force_rehash
+    )
 
     file_report = Reporter.create_file_report(
         file,
@@ -20,10 +27,10 @@ def check_one_file_hash(file_path: str, original_hash: str, hash_func: HashFunc)
         generated_hash=result.get("generated_hash"),
     )
 
-    Reporter.add_report_to_pdf(file_report)
+    reporter.add_report_to_pdf(file_report)
 
-    Reporter.print_file_report(file_report)
+    reporter.print_file_report(file_report)
 
-    Reporter.save_report_pdf(file.parent.resolve())
+    reporter.save_report_pdf(file.parent.resolve())
 
     return result
@@ -0,0 +1,375 @@
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import TypedDict
+from scripts.hash_report_tools import HashFunc
+from scripts.hash_engine import EngineMode, default_max_workers
+
+# cada bloco é verificado de forma independente: um erro aponta só o seu trecho
+MANIFEST_CHUNK_SIZE = 1024 * 1024 * 64
+
+READ_SIZE = 1024 * 1024
+
+sidecar_suffix = ".blocos.json"
+
+successIcon = "✅"
+errorIcon = "❌"
+
+
+class ChunkManifest(TypedDict):
+    file: str
+    size: int
+    mtime_ns: int
+    algorithm: HashFunc
+    chunk_size: int
+    chunks: list[str]
+    merkle_root: str
+
+
+class ChunkVerification(TypedDict):
+    file: Path
+    ok: bool
+    size_mismatch: tuple[int, int] | None
+    bad_ranges: list[tuple[int, int]]
+    merkle_root: str | None
+
+
+def sidecar_path(file_path: Path):
+    return file_path.with_name(file_path.name + sidecar_suffix)
+
+
+def hash_chunk(file_path: Path, offset: int, length: int, hash_func: HashFunc):
+    # cada tarefa abre o próprio descritor: as leituras em paralelo não
+    # disputam a posição do arquivo
+    hasher = hashlib.new(hash_func.lower())
+    buffer = bytearray(READ_SIZE)
+    view = memoryview(buffer)
+
+    with open(file_path, "rb", buffering=0) as file:
+        file.seek(offset)
+        remaining = length
+
+        while remaining > 0:
+            size = file.readinto(view[: min(READ_SIZE, remaining)])
+            if not size:
+                break
+            hasher.update(view[:size])
+            remaining -= size
+
+    return hasher.hexdigest()
+
+
+class ChunkDigester:
+    """
+    Hashes dos blocos calculadas sobre os trechos de uma leitura sequencial,
+    como a do cálculo da hash do arquivo inteiro, sem ler o arquivo de novo.
+    """
+
+    def __init__(self, hash_func: HashFunc, chunk_size: int):
+        self.hash_func = hash_func
+        self.chunk_size = chunk_size
+        self.chunks: list[str] = []
+        self.hasher = hashlib.new(hash_func.lower())
+        self.filled = 0
+        self.updated = False
+
+    def update(self, data: memoryview):
+        self.updated = True
+
+        while data:
+            size = min(len(data), self.chunk_size - self.filled)
+            self.hasher.update(data[:size])
+            self.filled += size
+            data = data[size:]
+
+            if self.filled == self.chunk_size:
+                self.close_chunk()
+
+    def close_chunk(self):
+        self.chunks.append(self.hasher.hexdigest())
+        self.hasher = hashlib.new(self.hash_func.lower())
+        self.filled = 0
+
+    def finish(self):
+        # sem nenhuma leitura (hashes vindas do cache) não há blocos
+        if not self.updated:
+            return None
+
+        if self.filled:
+            self.close_chunk()
+
+        return self.chunks
+
+
+def chunk_ranges(size: int, chunk_size: int):
+    return [
+        (offset, min(chunk_size, size - offset))
+        for offset in range(0, size, chunk_size)
+    ]
+
+
+def create_executor(mode: EngineMode, max_workers: int | None) -> Executor:
+    max_workers = max_workers or default_max_workers(mode)
+
+    if mode == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def compute_chunk_digests(
+    file_path: Path,
+    size: int,
+    hash_func: HashFunc = "SHA256",
+    chunk_size: int = MANIFEST_CHUNK_SIZE,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+):
+    ranges = chunk_ranges(size, chunk_size)
+
+    with create_executor(mode, max_workers) as executor:
+        futures = [
+            executor.submit(hash_chunk, file_path, offset, length, hash_func)
+            for offset, length in ranges
+        ]
+        return [future.result() for future in futures]
+
+
+def merkle_root(chunks: list[str], hash_func: HashFunc):
+    # árvore binária sobre as hashes dos blocos; em nível ímpar o último nó
+    # é combinado com ele mesmo
+    if not chunks:
+        return hashlib.new(hash_func.lower(), b"").hexdigest()
+
+    level = [bytes.fromhex(chunk) for chunk in chunks]
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+
+        level = [
+            hashlib.new(hash_func.lower(), level[index] + level[index + 1]).digest()
+            for index in range(0, len(level), 2)
+        ]
+
+    return level[0].hex()
+
+
+def create_chunk_manifest(
+    file_path: Path,
+    hash_func: HashFunc = "SHA256",
+    chunk_size: int = MANIFEST_CHUNK_SIZE,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+) -> ChunkManifest:
+    """
+    Calcula em paralelo as hashes de cada bloco do arquivo e grava o
+    manifesto ao lado dele, em <arquivo>.blocos.json.
+    """
+    size = file_path.stat().st_size
+
+    chunks = compute_chunk_digests(
+        file_path, size, hash_func, chunk_size, mode, max_workers
+    )
+
+    return save_chunk_manifest(file_path, hash_func, chunk_size, chunks)
+
+
+def save_chunk_manifest(
+    file_path: Path, hash_func: HashFunc, chunk_size: int, chunks: list[str]
+) -> ChunkManifest:
+    # grava o manifesto de hashes já calculadas (por exemplo pelo ChunkDigester)
+    stat = file_path.stat()
+
+    manifest: ChunkManifest = {
+        "file": file_path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "algorithm": hash_func,
+        "chunk_size": chunk_size,
+        "chunks": chunks,
+        "merkle_root": merkle_root(chunks, hash_func),
+    }
+
+    with open(sidecar_path(file_path), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+    return manifest
+
+
+def load_chunk_manifest(file_path: Path) -> ChunkManifest | None:
+    path = sidecar_path(file_path)
+
+    if not path.exists():
+        return None
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def verify_chunk_manifest(
+    file_path: Path,
+    manifest: ChunkManifest | None = None,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    chunks: list[str] | None = None,
+) -> ChunkVerification | None:
+    """
+    Confere os blocos e devolve os trechos de bytes divergentes. Com chunks
+    (hashes dos blocos do arquivo atual, calculadas na leitura da hash do
+    arquivo inteiro) nada é lido de novo; sem eles, os blocos são lidos em
+    paralelo.
+    """
+    manifest = manifest or load_chunk_manifest(file_path)
+
+    if manifest is None:
+        return None
+
+    size = file_path.stat().st_size
+    hash_func = manifest["algorithm"]
+    chunk_size = manifest["chunk_size"]
+
+    # os blocos que existem nos dois lados ainda podem ser comparados
+    compared_size = min(size, manifest["size"])
+    ranges = chunk_ranges(compared_size, chunk_size)
+
+    if chunks is None or len(chunks) < len(ranges):
+        chunks = compute_chunk_digests(
+            file_path, compared_size, hash_func, chunk_size, mode, max_workers
+        )
+    else:
+        chunks = chunks[: len(ranges)]
+
+        # arquivo maior que o do manifesto: o último bloco comparado é só o
+        # começo do bloco calculado, e apenas ele é lido de novo
+        if ranges and compared_size < size and compared_size % chunk_size:
+            offset, length = ranges[-1]
+            chunks[-1] = hash_chunk(file_path, offset, length, hash_func)
+
+    bad_ranges: list[tuple[int, int]] = []
+    expected_chunks = manifest["chunks"]
+
+    def add_bad_range(start: int, end: int):
+        # blocos vizinhos corrompidos viram um único trecho
+        if bad_ranges and bad_ranges[-1][1] == start:
+            bad_ranges[-1] = (bad_ranges[-1][0], end)
+        else:
+            bad_ranges.append((start, end))
+
+    for index, (offset, length) in enumerate(ranges):
+        expected = expected_chunks[index] if index < len(expected_chunks) else None
+
+        if chunks[index] != expected:
+            add_bad_range(offset, offset + length)
+
+    size_mismatch = None
+    if size != manifest["size"]:
+        size_mismatch = (manifest["size"], size)
+        add_bad_range(compared_size, max(size, manifest["size"]))
+
+    return {
+        "file": file_path,
+        "ok": not bad_ranges,
+        "size_mismatch": size_mismatch,
+        "bad_ranges": bad_ranges,
+        "merkle_root": merkle_root(chunks, hash_func) if not size_mismatch else None,
+    }
+
+
+def format_bad_ranges(verification: ChunkVerification):
+    indent = 6 * " "
+    lines = [
+        f"{indent}trecho corrompido: bytes {start} a {end - 1} ({end - start} bytes)"
+        for start, end in verification["bad_ranges"]
+    ]
+
+    if verification["size_mismatch"]:
+        expected_size, size = verification["size_mismatch"]
+        lines.append(
+            f"{indent}tamanho no manifesto de blocos: {expected_size} bytes, "
+            + f"encontrado: {size} bytes"
+        )
+
+    return "\n".join(lines)
+
+
+def print_chunk_verification(verification: ChunkVerification):
+    if verification["ok"]:
+        print(f"{successIcon} {verification['file']} todos os blocos conferem")
+        return
+
+    print(f"{errorIcon} {verification['file']} possui blocos divergentes")
+    print(format_bad_ranges(verification))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        "Manifesto de hashes por bloco (árvore de Merkle) para arquivos grandes"
+    )
+    parser.add_argument("arquivos", nargs="+", type=str, help="Arquivos a processar")
+    parser.add_argument(
+        "--verificar",
+        action="store_true",
+        help="Confere os arquivos com os manifestos .blocos.json existentes",
+    )
+    parser.add_argument(
+        "--algoritmo",
+        type=str,
+        choices=["SHA256", "SHA512", "SHA1", "MD5"],
+        default="SHA256",
+    )
+    parser.add_argument(
+        "--tamanho-bloco",
+        type=int,
+        default=MANIFEST_CHUNK_SIZE // (1024 * 1024),
+        help="Tamanho de cada bloco em MB",
+    )
+    parser.add_argument(
+        "--modo",
+        type=str,
+        choices=["thread", "process"],
+        default="thread",
+        help="Executa o cálculo das hashes em threads ou em processos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade máxima de workers (padrão: definida pela quantidade de núcleos)",
+    )
+
+    args = parser.parse_args()
+
+    all_ok = True
+
+    for name in args.arquivos:
+        file_path = Path(name)
+
+        if args.verificar:
+            verification = verify_chunk_manifest(
+                file_path, mode=args.modo, max_workers=args.workers
+            )
+            if verification is None:
+                print(f"{errorIcon} {file_path} não possui manifesto de blocos")
+                all_ok = False
+                continue
+
+            print_chunk_verification(verification)
+            all_ok = all_ok and verification["ok"]
+        else:
+            manifest = create_chunk_manifest(
+                file_path,
+                args.algoritmo,
+                args.tamanho_bloco * 1024 * 1024,
+                args.modo,
+                args.workers,
+            )
+            print(
+                f"{file_path}: {len(manifest['chunks'])} blocos, "
+                + f"raiz {manifest['merkle_root']}"
+            )
+
+    sys.exit(0 if all_ok else 1)
@@ -0,0 +1,311 @@
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable
+from scripts.hash_report_tools import HashFunc, Reporter
+from scripts.buffered_reader import IOConfig, iter_file_chunks
+from scripts.evidence_walker import walk_evidence_tree
+from scripts.hash_engine import (
+    DEFAULT_CHUNK_SIZE,
+    EngineMode,
+    HashEngine,
+    HashJob,
+    HashJobResult,
+)
+from scripts.report_writers import (
+    DEFAULT_VOLUME_SIZE,
+    REPORT_FORMATS,
+    ReportFormat,
+)
+from scripts.hash_progress import (
+    ConsoleProgress,
+    JsonRunLog,
+    ProgressListener,
+    ProgressTracker,
+)
+from scripts.verifica_hashes_threads import (
+    check_if_google_file,
+    create_manifest,
+    hash_funcs_for_file,
+    process_file,
+    run_log_filename,
+)
+
+partial_suffix = ".parcial"
+
+
+class CopyJob(HashJob):
+    destination: Path
+
+
+def copy_file_job(
+    source: Path,
+    destination: Path,
+    hash_funcs: tuple[HashFunc, ...],
+    chunk_size: int,
+    progress: Callable[[int], None] | None = None,
+    io_config: IOConfig | None = None,
+):
+    """
+    Copia o arquivo calculando as hashes na mesma leitura. A cópia é gravada
+    com o sufixo .parcial e só recebe o nome final depois de completa.
+    """
+    start = time.perf_counter()
+    hashers = {hash_func: hashlib.new(hash_func.lower()) for hash_func in hash_funcs}
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = destination.with_name(destination.name + partial_suffix)
+
+    try:
+        with open(partial_path, "wb") as output:
+            for chunk in iter_file_chunks(source, chunk_size, io_config=io_config):
+                output.write(chunk)
+
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+
+                if progress:
+                    progress(len(chunk))
+
+            output.flush()
+            os.fsync(output.fileno())
+
+        shutil.copystat(source, partial_path)
+        partial_path.replace(destination)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+
+    # as hashes vêm da leitura da origem; elas não vão para o cache da cópia,
+    # que só é confirmada quando a verificação do destino ler o arquivo gravado
+    digests = {hash_func: hasher.hexdigest() for hash_func, hasher in hashers.items()}
+
+    return digests, time.perf_counter() - start, None
+
+
+class CopyEngine(HashEngine):
+    def submit_job(self, executor: Executor, job: CopyJob, chunk_size: int):
+        return executor.submit(
+            copy_file_job,
+            job["file"],
+            job["destination"],
+            job["hash_funcs"],
+            chunk_size,
+            self.bytes_callback(job),
+            self.io,
+        )
+
+
+def copy_remaining_files(source: Path, destination: Path, copied: set[Path]):
+    # arquivos que não são evidências (hashes.txt, pastas internas) também
+    # vão para o destino, sem verificação
+    for folder, _, files in os.walk(source):
+        for name in files:
+            file = Path(folder).joinpath(name)
+            if file in copied:
+                continue
+
+            target = destination.joinpath(file.relative_to(source))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(file, target)
+
+
+def copy_and_verify(
+    source_folder_path: str,
+    destination_folder_path: str,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    progress_listeners: list[ProgressListener] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    drop_cache: bool = False,
+    max_mbps: float | None = None,
+    report_formats: tuple[ReportFormat, ...] = ("pdf",),
+    volume_size: int = DEFAULT_VOLUME_SIZE,
+):
+    """
+    Copia a pasta de evidências (por exemplo de um disco USB) para o destino,
+    conferindo cada arquivo com o hashes.txt durante a própria cópia. O
+    relatório de hashes é gravado na pasta de destino.
+    """
+    source = Path(source_folder_path).resolve()
+    destination = Path(destination_folder_path).resolve()
+
+    if not source.exists():
+        msg = "o caminho da pasta de origem não existe"
+        print(msg)
+        return {"error": msg}
+
+    if destination == source or destination.is_relative_to(source):
+        msg = "a pasta de destino não pode ficar dentro da pasta de origem"
+        print(msg)
+        return {"error": msg}
+
+    tree = walk_evidence_tree(source)
+    hashes_path = tree["hashes_path"]
+
+    if not hashes_path:
+        msg = "o caminho do arquivo de hashes.txt ou .csv não existe"
+        print(msg)
+        return {"error": msg}
+
+    destination.mkdir(parents=True, exist_ok=True)
+
+    is_google_hashes = check_if_google_file(hashes_path)
+    manifest = create_manifest(hashes_path, is_google_hashes)
+    default_hash_func: HashFunc = "SHA512" if is_google_hashes else "SHA256"
+
+    copy_targets = {
+        file.path: destination.joinpath(file.path.relative_to(source))
+        for file in tree["files"]
+    }
+
+    jobs: list[CopyJob] = [
+        {
+            "file": file.path,
+            "destination": copy_targets[file.path],
+            "hash_funcs": hash_funcs_for_file(file.path, manifest, default_hash_func),
+            "size": file.size,
+            "inode": file.inode,
+        }
+        for file in tree["files"]
+    ]
+
+    reporter = Reporter(
+        hashes_count=len(manifest),
+        files=list(copy_targets.values()),
+        formats=report_formats,
+        volume_size=volume_size,
+        pdf_layout="table",
+    )
+
+    run_info = {"Origem da cópia": str(source), "Modo de execução": mode}
+    if max_mbps:
+        run_info["Limite de leitura"] = f"{max_mbps:g} MB/s"
+    reporter.run_info.update(run_info)
+
+    listeners = [JsonRunLog(destination.joinpath(run_log_filename))]
+    listeners += progress_listeners or []
+
+    progress = ProgressTracker(
+        total_bytes=sum(job["size"] for job in jobs),
+        files_total=len(jobs),
+        listeners=listeners,
+        run_info=run_info,
+    )
+
+    # a ordem física reduz os saltos de leitura em discos USB mecânicos
+    engine = CopyEngine(
+        mode=mode,
+        max_workers=max_workers,
+        progress=progress,
+        schedule="physical",
+        chunk_size=chunk_size,
+        drop_cache=drop_cache,
+        max_mbps=max_mbps,
+    )
+
+    print(f"\nCopiando {len(jobs)} arquivos de {source} para {destination}\n")
+
+    failed_copies: list[Path] = []
+
+    progress.run_started()
+
+    try:
+        for result in engine.run(jobs):
+            copied_file = copy_targets[result["file"]]
+
+            if not any(result["digests"].values()):
+                failed_copies.append(result["file"])
+
+            # o relatório aponta a cópia, que é o arquivo que será trabalhado
+            copied_result: HashJobResult = {**result, "file": copied_file}
+            report = process_file(copied_result, manifest, default_hash_func)
+
+            reporter.add_report_to_pdf(report)
+            reporter.print_file_report(report)
+    finally:
+        progress.run_finished()
+
+    copy_remaining_files(source, destination, set(copy_targets))
+
+    reporter.save_reports(destination)
+
+    if failed_copies:
+        print(f"\n{len(failed_copies)} arquivos não puderam ser copiados:")
+        for file in failed_copies:
+            print(f"      {file}")
+
+    return {
+        "collisions": reporter.collisions,
+        "failed_copies": [str(file) for file in failed_copies],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        "Copia evidências de uma mídia removível verificando as hashes na cópia"
+    )
+    parser.add_argument(
+        "--origem",
+        type=str,
+        required=True,
+        help="Pasta com os arquivos e o arquivo de hashes (por exemplo, o disco USB)",
+    )
+    parser.add_argument(
+        "--destino",
+        type=str,
+        required=True,
+        help="Pasta de destino no servidor de trabalho",
+    )
+    parser.add_argument(
+        "--modo",
+        type=str,
+        choices=["thread", "process"],
+        default="thread",
+        help="Executa a cópia e o cálculo das hashes em threads ou em processos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade máxima de workers (padrão: definida pela quantidade de núcleos)",
+    )
+    parser.add_argument(
+        "--preservar-cache",
+        action="store_true",
+        help="Descarta do cache de páginas o que já foi lido (Linux)",
+    )
+    parser.add_argument(
+        "--limite-mbps",
+        type=float,
+        default=None,
+        help="Limita a leitura da origem a esta quantidade de MB/s",
+    )
+    parser.add_argument(
+        "--formatos",
+        nargs="+",
+        choices=REPORT_FORMATS,
+        default=["pdf"],
+        help="Formatos do relatório: pdf, json, csv e/ou html",
+    )
+
+    args = parser.parse_args()
+
+    result = copy_and_verify(
+        args.origem,
+        args.destino,
+        mode=args.modo,
+        max_workers=args.workers,
+        progress_listeners=[ConsoleProgress()],
+        drop_cache=args.preservar_cache,
+        max_mbps=args.limite_mbps,
+        report_formats=tuple(args.formatos),
+    )
+
+    if any(result.get(key) for key in ("error", "collisions", "failed_copies")):
+        sys.exit(1)
@@ -1,8 +1,96 @@
+import csv
 import pathlib
 import argparse
+from datetime import datetime
+from scripts.hash_report_tools import HashFunc
+from scripts.hash_engine import DEFAULT_CHUNK_SIZE, HashEngine, HashJob, EngineMode
 
+placeholder_hash = "hash"
 
-def create_hashes_file(folder_path: str):
+
+def seal_files(
+    current_path: pathlib.Path,
+    files: list[str],
+    hash_func: HashFunc,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    jobs: list[HashJob] = []
+    stats = {}
+
+    for name in files:
+        file = current_path.joinpath(name)
+        stat = file.stat()
+        stats[name] = stat
+
+        jobs.append(
+            {
+                "file": file,
+                "hash_funcs": (hash_func,),
+                "size": stat.st_size,
+                "inode": stat.st_ino,
+            }
+        )
+
+    # as hashes são lidas do disco, nunca do cache: o arquivo gerado é o lacre
+    engine = HashEngine(
+        mode=mode,
+        max_workers=max_workers,
+        force_rehash=True,
+        schedule="largest_first",
+        chunk_size=chunk_size,
+    )
+
+    digests: dict[str, str | None] = {}
+
+    for result in engine.run(jobs):
+        digest = result["digests"].get(hash_func)
+        digests[result["file"].name] = digest
+
+        if digest is None:
+            print(f"Erro ao calcular a hash de {result['file'].name}")
+        else:
+            print(f"{result['file'].name}: {digest}")
+
+    return digests, stats
+
+
+def write_hashes_csv(
+    csv_path: pathlib.Path,
+    files: list[str],
+    digests: dict[str, str | None],
+    stats: dict,
+    hash_func: HashFunc,
+):
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["arquivo", "tamanho", "mtime", "algoritmo", "hash"])
+
+        for name in files:
+            stat = stats[name]
+            mtime = datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+
+            writer.writerow(
+                [
+                    name,
+                    stat.st_size,
+                    mtime,
+                    hash_func,
+                    digests.get(name) or placeholder_hash,
+                ]
+            )
+
+
+def create_hashes_file(
+    folder_path: str,
+    seal: bool = False,
+    hash_func: HashFunc = "SHA256",
+    write_csv: bool = False,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
     current_path = pathlib.Path(folder_path)
 
     files = []
@@ -19,21 +107,33 @@ def create_hashes_file(folder_path: str):
     ]
     files.extend(pdf_files)
 
-    for index in range(len(files)):
+    digests: dict[str, str | None] = {}
 
-        if (index + 1) != len(files):
-            files[index] += ":hash\n"
-        else:
-            files[index] += ":hash"
+    if seal:
+        print(f"Calculando {hash_func} de {len(files)} arquivos\n")
+        digests, stats = seal_files(
+            current_path, files, hash_func, mode, max_workers, chunk_size
+        )
+
+        if write_csv:
+            write_hashes_csv(
+                current_path.joinpath("hashes.csv"), files, digests, stats, hash_func
+            )
+
+    lines = [f"{name}:{digests.get(name) or placeholder_hash}" for name in files]
 
     textfile_path = current_path.joinpath("hashes.txt")
 
     with open(textfile_path, "wt", encoding="utf-8") as file:
         file.seek(0)
         file.truncate()
-        file.writelines(files)
+        file.write("\n".join(lines))
         print(f"{len(files)} arquivos foram encontrados e salvos em hashes.txt")
 
+    failures = [name for name in files if seal and not digests.get(name)]
+
+    return {"files": len(files), "failures": failures}
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -46,7 +146,45 @@ if __name__ == "__main__":
         help="O caminho da pasta onde estão os arquivos .zip",
     )
 
+    parser.add_argument(
+        "--selar",
+        action="store_true",
+        help="Calcula as hashes reais em vez de escrever o modelo com 'hash'",
+    )
+    parser.add_argument(
+        "--algoritmo",
+        type=str,
+        choices=["SHA256", "SHA512", "SHA1", "MD5"],
+        default="SHA256",
+        help="Algoritmo usado com --selar",
+    )
+    parser.add_argument(
+        "--csv",
+        action="store_true",
+        help="Com --selar, grava também hashes.csv com tamanho e data de modificação",
+    )
+    parser.add_argument(
+        "--modo",
+        type=str,
+        choices=["thread", "process"],
+        default="thread",
+        help="Executa o cálculo das hashes em threads ou em processos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade máxima de workers (padrão: definida pela quantidade de núcleos)",
+    )
+
     args = parser.parse_args()
 
     folder_path: str = args.pasta
-    create_hashes_file(folder_path)
+    create_hashes_file(
+        folder_path,
+        seal=args.selar,
+        hash_func=args.algoritmo,
+        write_csv=args.csv,
+        mode=args.modo,
+        max_workers=args.workers,
+    )
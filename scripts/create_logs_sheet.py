@@ -219,4 +219,7 @@ def create_logs_sheet(
         else f"log-acesso-{user_logs['identifier']}-{user_logs['service']}.xlsx"
     )
 
-    wb.save(path.joinpath(full_name).resolve())
+    output_path = path.joinpath(full_name).resolve()
+    wb.save(output_path)
+
+    return output_path
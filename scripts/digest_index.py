@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Literal
+from scripts.hash_cache import default_cache_dir
+from scripts.hash_report_tools import HashFunc
+from scripts.hash_engine import HashEngine, HashJob
+
+index_file_name = "digest_index.sqlite3"
+
+# etapas que podem ser puladas quando o mesmo conteúdo já foi processado
+Stage = Literal["extraction", "meta_logs", "peron"]
+
+INDEX_HASH_FUNC: HashFunc = "SHA256"
+
+# com esta variável definida o índice não é usado; vale também para os
+# processos filhos, que herdam o ambiente
+DISABLE_ENV_VAR = "DATA_PROCESSING_TOOLS_SEM_INDICE"
+
+
+def disable_digest_index():
+    os.environ[DISABLE_ENV_VAR] = "1"
+
+
+def is_temporary_path(path: Path):
+    # testes e benchmarks em pastas temporárias não entram no índice global
+    temp_dir = Path(tempfile.gettempdir()).resolve()
+    return Path(path).resolve().is_relative_to(temp_dir)
+
+
+class DigestIndex:
+    """
+    Índice de hashes entre pastas de casos: encontra arquivos idênticos
+    byte a byte e guarda quais etapas já foram feitas para cada conteúdo.
+    """
+
+    def __init__(self, db_path: Path | None = None):
+        if db_path is None:
+            db_path = default_cache_dir().joinpath(index_file_name)
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            str(db_path), check_same_thread=False, timeout=30
+        )
+
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    PRIMARY KEY (path, algorithm)
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS files_digest ON files (algorithm, digest)"
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stages (
+                    digest TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    output_path TEXT NOT NULL,
+                    PRIMARY KEY (digest, stage)
+                )
+                """
+            )
+            self.connection.commit()
+
+    def add_file(self, file_path: Path, algorithm: HashFunc, digest: str, size: int):
+        if is_temporary_path(file_path):
+            return
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                (str(Path(file_path).resolve()), algorithm, digest.lower(), size),
+            )
+            self.connection.commit()
+
+    def duplicates(self, file_path: Path, algorithm: HashFunc, digest: str):
+        # outros caminhos com o mesmo conteúdo que ainda existem no disco
+        path = str(Path(file_path).resolve())
+
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT path FROM files WHERE algorithm = ? AND digest = ? AND path != ?",
+                (algorithm, digest.lower(), path),
+            ).fetchall()
+
+        return [row[0] for row in rows if os.path.exists(row[0])]
+
+    def previous_output(self, digest: str, stage: Stage, output_path: Path):
+        """
+        Saída de uma etapa já feita para o mesmo conteúdo em outro lugar, ou
+        None quando a etapa precisa ser executada.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT output_path FROM stages WHERE digest = ? AND stage = ?",
+                (digest.lower(), stage),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        previous = Path(row[0])
+        current = Path(output_path).resolve()
+
+        # a mesma pasta sendo reprocessada, ou a saída anterior foi apagada
+        if previous == current or current in previous.parents:
+            return None
+
+        if not previous.exists():
+            return None
+
+        return str(previous)
+
+    def mark_stage(self, digest: str, stage: Stage, output_path: Path):
+        """Registra a saída final da etapa (a pasta ou o arquivo gerado)."""
+        if is_temporary_path(output_path):
+            return
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO stages VALUES (?, ?, ?)",
+                (digest.lower(), stage, str(Path(output_path).resolve())),
+            )
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+_index: DigestIndex | None = None
+_index_unavailable = False
+_index_lock = threading.Lock()
+
+
+def get_digest_index():
+    # uma instância por processo, criada apenas quando usada
+    global _index, _index_unavailable
+
+    if os.environ.get(DISABLE_ENV_VAR):
+        return None
+
+    with _index_lock:
+        if _index is None and not _index_unavailable:
+            try:
+                _index = DigestIndex()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Índice de hashes indisponível: {e}")
+                _index_unavailable = True
+
+        return _index
+
+
+def index_files(files: list[Path]) -> dict[Path, str | None]:
+    """Calcula em paralelo a SHA256 dos arquivos e registra no índice."""
+    jobs: list[HashJob] = []
+
+    for file in files:
+        try:
+            stat = file.stat()
+        except OSError:
+            continue
+
+        jobs.append(
+            {
+                "file": file,
+                "hash_funcs": (INDEX_HASH_FUNC,),
+                "size": stat.st_size,
+                "inode": stat.st_ino,
+            }
+        )
+
+    index = get_digest_index()
+    digests: dict[Path, str | None] = {file: None for file in files}
+
+    for result in HashEngine(schedule="largest_first").run(jobs):
+        digest = result["digests"].get(INDEX_HASH_FUNC)
+        digests[result["file"]] = digest
+
+        if index and digest:
+            index.add_file(result["file"], INDEX_HASH_FUNC, digest, result["size"])
+
+    return digests
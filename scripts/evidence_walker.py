@@ -0,0 +1,220 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Literal, TypedDict
+from natsort import natsorted
+
+FileKind = Literal["archive", "pdf", "gpg", "manifest", "google_manifest", "other"]
+
+google_pdf_filename = str("Valores de Hash")
+
+MAGIC_NUMBERS: list[tuple[bytes, FileKind]] = [
+    (b"PK\x03\x04", "archive"),
+    (b"PK\x05\x06", "archive"),
+    (b"7z\xbc\xaf\x27\x1c", "archive"),
+    (b"%PDF", "pdf"),
+]
+
+MAGIC_SIZE = 8
+
+EXTENSION_KINDS: dict[str, FileKind] = {
+    ".zip": "archive",
+    ".7z": "archive",
+    ".gpg": "gpg",
+    ".pdf": "pdf",
+}
+
+MANIFEST_NAMES = {"hashes.txt", "HASHES.txt"}
+
+# arquivos gerados pelas próprias ferramentas não são evidências
+IGNORED_NAME_PARTS = ("relatorio_hashes",)
+
+# downloads ainda em andamento (Chrome, Firefox, Edge e gerenciadores)
+INCOMPLETE_DOWNLOAD_SUFFIXES = (".crdownload", ".part", ".partial", ".download")
+
+# ordem de preferência quando a pasta tem mais de um arquivo de hashes
+MANIFEST_PRIORITY: dict[FileKind, int] = {"google_manifest": 0, "manifest": 1}
+
+
+class EvidenceFile:
+    __slots__ = ("path", "size", "mtime_ns", "inode", "kind", "depth")
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        mtime_ns: int,
+        inode: int,
+        kind: FileKind,
+        depth: int,
+    ):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.inode = inode
+        self.kind = kind
+        self.depth = depth
+
+
+class EvidenceTree(TypedDict):
+    files: list[EvidenceFile]
+    hashes_path: Path | None
+
+
+_classification_cache: dict[tuple[str, int, int], FileKind] = {}
+_classification_lock = threading.Lock()
+
+
+def read_magic_kind(path: str) -> FileKind:
+    try:
+        with open(path, "rb") as file:
+            header = file.read(MAGIC_SIZE)
+    except OSError:
+        return "other"
+
+    for magic, kind in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return kind
+
+    return "other"
+
+
+def reads_magic(name: str):
+    # .docx, .xlsx, .apk e outros também começam com PK: os primeiros bytes só
+    # são lidos em arquivos sem extensão ou com cara de 7z (x.7z.001, x.001)
+    extension = os.path.splitext(name)[1].lower()
+
+    return not extension or ".7z" in name.lower() or extension[1:].isdigit()
+
+
+def classify_entry(entry: os.DirEntry, stat: os.stat_result) -> FileKind:
+    name = entry.name
+
+    if any(part in name for part in IGNORED_NAME_PARTS):
+        return "other"
+
+    if name.lower().endswith(INCOMPLETE_DOWNLOAD_SUFFIXES):
+        return "other"
+
+    if name in MANIFEST_NAMES or name.endswith(".csv"):
+        return "manifest"
+
+    if google_pdf_filename in name and name.endswith(".pdf"):
+        return "google_manifest"
+
+    kind = EXTENSION_KINDS.get(os.path.splitext(name)[1].lower())
+    if kind:
+        return kind
+
+    if not reads_magic(name):
+        return "other"
+
+    # uma única leitura dos primeiros bytes, com cache
+    key = (entry.path, stat.st_size, stat.st_mtime_ns)
+
+    with _classification_lock:
+        cached = _classification_cache.get(key)
+
+    if cached:
+        return cached
+
+    kind = read_magic_kind(entry.path)
+
+    with _classification_lock:
+        _classification_cache[key] = kind
+
+    return kind
+
+
+def scan_directory(directory: str, depth: int):
+    files: list[EvidenceFile] = []
+    subdirectories: list[str] = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                        continue
+
+                    if not entry.is_file():
+                        continue
+
+                    # no Windows o stat vem da própria listagem, sem nova chamada
+                    stat = entry.stat()
+                except OSError as e:
+                    print(f"Erro ao ler {entry.path}: {e}")
+                    continue
+
+                kind = classify_entry(entry, stat)
+
+                if kind == "other":
+                    continue
+
+                files.append(
+                    EvidenceFile(
+                        Path(entry.path),
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        stat.st_ino,
+                        kind,
+                        depth,
+                    )
+                )
+    except OSError as e:
+        print(f"Erro ao listar {directory}: {e}")
+
+    return files, subdirectories
+
+
+def manifest_priority(file: EvidenceFile):
+    # PDF do Google, depois hashes.txt e por último os CSVs
+    is_csv = file.path.name.endswith(".csv")
+    return MANIFEST_PRIORITY[file.kind], is_csv, file.path.name
+
+
+def walk_evidence_tree(
+    root_path: Path, max_depth: int | None = None, max_workers: int = 8
+) -> EvidenceTree:
+    """
+    Percorre a pasta em qualquer profundidade, listando as subpastas em
+    paralelo (útil em compartilhamentos de rede com milhares de arquivos).
+    """
+    root = str(Path(root_path).resolve())
+
+    evidence_files: list[EvidenceFile] = []
+    manifests: list[EvidenceFile] = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: dict[Future, int] = {executor.submit(scan_directory, root, 0): 0}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                depth = pending.pop(future)
+                files, subdirectories = future.result()
+
+                for file in files:
+                    if file.kind in MANIFEST_PRIORITY:
+                        # o arquivo de hashes é procurado apenas na pasta raiz
+                        if depth == 0:
+                            manifests.append(file)
+                    else:
+                        evidence_files.append(file)
+
+                if max_depth is not None and depth >= max_depth:
+                    continue
+
+                for subdirectory in subdirectories:
+                    future = executor.submit(scan_directory, subdirectory, depth + 1)
+                    pending[future] = depth + 1
+
+    manifests.sort(key=manifest_priority)
+
+    return {
+        "files": natsorted(evidence_files, key=lambda file: str(file.path)),
+        "hashes_path": manifests[0].path if manifests else None,
+    }
@@ -1,46 +1,147 @@
 from pypdf import PdfReader
 import argparse
+import json
+import os
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from scripts.hash_cache import default_cache_dir
+from scripts.hash_report_tools import Hasher
+from scripts.manifest_parser import parse_google_lines
 
 
-pdf_parts: list[str] = []
-
 page_y = {"page_zero_y": 550, "all_pages_y": 660}
 
-current_page_y = page_y["page_zero_y"]
+# abaixo disso abrir o PDF em vários processos custa mais do que ler direto
+PROCESS_POOL_MIN_PAGES = 500
 
+cache_folder_name = "google_pdf"
 
-def pdf_visitor_body(text: str, cm, tm, font_dict, font_size):
-    global current_page_y
-    y: float = cm[5]
+# faz parte do nome do cache: incrementar sempre que a extração mudar (page_y,
+# expressões do parse_google_lines), para não reaproveitar índices antigos
+PARSER_VERSION = 1
 
-    if 50 < y < current_page_y:
-        if text == "":
-            text = text.replace("", "\n")
 
-        pdf_parts.append(text)
+def extract_pages_text(pdf_path: str, start: int, end: int):
+    """Trechos de texto dentro da área das hashes nas páginas [start, end)."""
+    reader = PdfReader(pdf_path)
+    parts: list[str] = []
 
+    for index in range(start, end):
+        max_y = page_y["page_zero_y"] if index == 0 else page_y["all_pages_y"]
 
-def read_google_hashes_pdf(pdf_path: str):
+        def pdf_visitor_body(text: str, cm, tm, font_dict, font_size):
+            y: float = cm[5]
 
-    global current_page_y
+            if 50 < y < max_y:
+                if text == "":
+                    text = text.replace("", "\n")
 
-    reader = PdfReader(pdf_path)
+                parts.append(text)
+
+        reader.pages[index].extract_text(0, visitor_text=pdf_visitor_body)
+
+    return parts
+
+
+def page_batches(pages_count: int, batches_count: int):
+    batch_size = -(-pages_count // batches_count)
+
+    return [
+        (start, min(start + batch_size, pages_count))
+        for start in range(0, pages_count, batch_size)
+    ]
+
+
+def extract_google_pdf_text(pdf_path: pathlib.Path, max_workers: int | None = None):
+    pages_count = len(PdfReader(str(pdf_path)).pages)
+
+    if pages_count < PROCESS_POOL_MIN_PAGES:
+        yield from extract_pages_text(str(pdf_path), 0, pages_count)
+        return
+
+    # o pypdf é Python puro: só processos leem páginas em paralelo de fato
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(extract_pages_text, str(pdf_path), start, end)
+            for start, end in page_batches(pages_count, max_workers)
+        ]
+
+        # os lotes são consumidos na ordem das páginas: uma entrada pode
+        # começar em uma página e terminar na seguinte
+        for future in futures:
+            yield from future.result()
+
+
+def cache_path(pdf_digest: str):
+    file_name = f"{pdf_digest}_v{PARSER_VERSION}.json"
+    return default_cache_dir().joinpath(cache_folder_name, file_name)
 
-    for index, page in enumerate(reader.pages):
-        if index > 0:
-            current_page_y = page_y.get("all_pages_y")
 
-        page.extract_text(0, visitor_text=pdf_visitor_body)
+def load_cached_hashes(pdf_digest: str) -> dict[str, str] | None:
+    try:
+        with open(cache_path(pdf_digest), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
 
+
+def save_cached_hashes(pdf_digest: str, hashes: dict[str, str]):
+    path = cache_path(pdf_digest)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(hashes, file)
+
+        temp_path.replace(path)
+    except OSError as e:
+        print(f"Não foi possível salvar o cache do PDF de hashes: {e}")
+
+
+def read_google_hashes(pdf_path: str | pathlib.Path, max_workers: int | None = None):
+    """
+    Extrai do PDF "Valores de Hash" do Google o índice {arquivo: sha512}, sem
+    gravar arquivos intermediários. O resultado fica em cache pela SHA256 do
+    próprio PDF e pela versão do parser, então o mesmo PDF só é lido uma vez
+    enquanto a extração não mudar.
+    """
     path = pathlib.Path(pdf_path)
-    dir_path = path.parent
-    new_textfile_path = dir_path.joinpath("hashes.txt")
 
-    with open(new_textfile_path, "w") as file:
-        file.seek(0)
-        file.truncate()
-        file.writelines(pdf_parts)
+    pdf_digest = Hasher.read_digests(path, ("SHA256",)).get("SHA256")
+
+    if pdf_digest:
+        cached = load_cached_hashes(pdf_digest)
+        if cached is not None:
+            return cached
+
+    hashes: dict[str, str] = {}
+    for name, hexdigest, _ in parse_google_lines(
+        extract_google_pdf_text(path, max_workers)
+    ):
+        hashes[name] = hexdigest
+
+    # PDF sem nenhuma hash reconhecida não vai para o cache
+    if pdf_digest and hashes:
+        save_cached_hashes(pdf_digest, hashes)
+
+    return hashes
+
+
+def read_google_hashes_pdf(pdf_path: str):
+    # grava o hashes.txt no modelo nome:hash ao lado do PDF
+    path = pathlib.Path(pdf_path)
+    hashes = read_google_hashes(path)
+
+    new_textfile_path = path.parent.joinpath("hashes.txt")
+
+    with open(new_textfile_path, "w", encoding="utf-8") as file:
+        file.writelines(f"{name}:{hexdigest}\n" for name, hexdigest in hashes.items())
+
+    return hashes
 
 
 if __name__ == "__main__":
@@ -0,0 +1,431 @@
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+from typing import Literal, TypedDict
+
+try:
+    import resource
+except ImportError:
+    # Windows: CPU e memória de pico vêm do psutil, se estiver instalado
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+Scenario = Literal["small_pdfs", "large_zips", "mixed"]
+Target = Literal["verify_hashes", "check_one_file_hash", "create_hashes_file"]
+
+SCENARIOS: tuple[Scenario, ...] = ("small_pdfs", "large_zips", "mixed")
+TARGETS: tuple[Target, ...] = (
+    "create_hashes_file",
+    "verify_hashes",
+    "check_one_file_hash",
+)
+
+MB = 1024 * 1024
+
+# arquivos de referência na escala 1.0
+SMALL_PDF_COUNT = 2000
+SMALL_PDF_SIZE = 64 * 1024
+LARGE_ZIP_COUNT = 3
+LARGE_ZIP_SIZE = 2048 * MB
+
+WRITE_BLOCK_SIZE = 8 * MB
+
+
+class BenchmarkConfig(TypedDict):
+    mode: str
+    workers: int | None
+    chunk_size: int
+
+
+class BenchmarkResult(TypedDict):
+    scenario: Scenario
+    target: Target
+    mode: str
+    workers: int | None
+    chunk_size: int
+    bytes: int
+    seconds: float
+    mbps: float
+    cpu_percent: float | None
+    peak_rss_mb: float | None
+
+
+def write_random_file(path: Path, size: int, header: bytes):
+    with open(path, "wb") as file:
+        file.write(header)
+        remaining = size - len(header)
+
+        while remaining > 0:
+            block = min(WRITE_BLOCK_SIZE, remaining)
+            file.write(os.urandom(block))
+            remaining -= block
+
+
+def create_evidence_tree(folder: Path, scenario: Scenario, scale: float):
+    folder.mkdir(parents=True, exist_ok=True)
+
+    small_count = max(1, int(SMALL_PDF_COUNT * scale))
+    large_size = max(MB, int(LARGE_ZIP_SIZE * scale))
+
+    if scenario in ("small_pdfs", "mixed"):
+        count = small_count if scenario == "small_pdfs" else small_count // 2
+        for index in range(max(1, count)):
+            write_random_file(
+                folder.joinpath(f"documento_{index}.pdf"), SMALL_PDF_SIZE, b"%PDF-1.4\n"
+            )
+
+    if scenario in ("large_zips", "mixed"):
+        count = LARGE_ZIP_COUNT if scenario == "large_zips" else 1
+        for index in range(count):
+            write_random_file(
+                folder.joinpath(f"exportacao_{index}.zip"), large_size, b"PK\x03\x04"
+            )
+
+    # hashes.txt real para o verify_hashes ter o que comparar
+    from scripts.create_hashes_model_file import create_hashes_file
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        create_hashes_file(str(folder), seal=True)
+
+
+def evidence_files(folder: Path):
+    return [
+        file
+        for file in folder.iterdir()
+        if file.name.endswith((".zip", ".pdf")) and "relatorio_hashes" not in file.name
+    ]
+
+
+def tree_size(folder: Path):
+    return sum(file.stat().st_size for file in evidence_files(folder))
+
+
+def largest_file(folder: Path):
+    return max(evidence_files(folder), key=lambda file: file.stat().st_size)
+
+
+def cpu_seconds():
+    if resource is not None:
+        self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return (
+            self_usage.ru_utime
+            + self_usage.ru_stime
+            + children_usage.ru_utime
+            + children_usage.ru_stime
+        )
+
+    if psutil is not None:
+        process = psutil.Process()
+        times = process.cpu_times()
+        total = times.user + times.system
+        for child in process.children(recursive=True):
+            try:
+                child_times = child.cpu_times()
+                total += child_times.user + child_times.system
+            except psutil.Error:
+                pass
+        return total
+
+    return None
+
+
+def peak_rss_mb():
+    if resource is not None:
+        self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        peak = max(self_peak, children_peak)
+        # ru_maxrss vem em KB no Linux e em bytes no macOS
+        return peak / MB if sys.platform == "darwin" else peak / 1024
+
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / MB
+
+    return None
+
+
+def reference_hash(file: Path):
+    from scripts.hash_report_tools import Hasher
+
+    return Hasher.read_digests(file, ("SHA256",))["SHA256"]
+
+
+def run_target(
+    folder: Path,
+    target: Target,
+    config: BenchmarkConfig,
+    original_hash: str | None = None,
+):
+    if target == "verify_hashes":
+        from scripts.verifica_hashes_threads import verify_hashes
+
+        verify_hashes(
+            str(folder),
+            mode=config["mode"],
+            max_workers=config["workers"],
+            force_rehash=True,
+            chunk_size=config["chunk_size"],
+        )
+        return tree_size(folder)
+
+    if target == "create_hashes_file":
+        from scripts.create_hashes_model_file import create_hashes_file
+
+        # grava em uma cópia do manifesto para não alterar o do verify_hashes
+        hashes_path = folder.joinpath("hashes.txt")
+        backup_path = folder.joinpath("hashes.txt.original")
+        shutil.copy(hashes_path, backup_path)
+        try:
+            create_hashes_file(
+                str(folder),
+                seal=True,
+                mode=config["mode"],
+                max_workers=config["workers"],
+                chunk_size=config["chunk_size"],
+            )
+        finally:
+            shutil.move(backup_path, hashes_path)
+        return tree_size(folder)
+
+    from scripts.check_one_file_hash import check_one_file_hash
+
+    file = largest_file(folder)
+    check_one_file_hash(str(file), original_hash, "SHA256", force_rehash=True)
+    return file.stat().st_size
+
+
+def measure(folder: Path, scenario: Scenario, target: Target, config: BenchmarkConfig):
+    """Executa uma configuração; chamado no processo filho para isolar a memória."""
+    original_hash = None
+    if target == "check_one_file_hash":
+        # a hash de referência é calculada fora da medição
+        original_hash = reference_hash(largest_file(folder))
+
+    start_cpu = cpu_seconds()
+    start = time.perf_counter()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        size = run_target(folder, target, config, original_hash)
+
+    seconds = time.perf_counter() - start
+
+    end_cpu = cpu_seconds()
+    cpu_percent = None
+    if start_cpu is not None and end_cpu is not None:
+        cpu_percent = (end_cpu - start_cpu) / seconds * 100
+
+    result: BenchmarkResult = {
+        "scenario": scenario,
+        "target": target,
+        "mode": config["mode"],
+        "workers": config["workers"],
+        "chunk_size": config["chunk_size"],
+        "bytes": size,
+        "seconds": seconds,
+        "mbps": size / MB / seconds if seconds else 0.0,
+        "cpu_percent": cpu_percent,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    return result
+
+
+def run_in_subprocess(
+    folder: Path, scenario: Scenario, target: Target, config: BenchmarkConfig
+) -> BenchmarkResult | None:
+    command = [
+        sys.executable,
+        "-m",
+        "scripts.hash_benchmark",
+        "--filho",
+        json.dumps(
+            {
+                "folder": str(folder),
+                "scenario": scenario,
+                "target": target,
+                "config": config,
+            }
+        ),
+    ]
+
+    completed = subprocess.run(command, capture_output=True, text=True)
+
+    if completed.returncode != 0:
+        print(f"Erro em {scenario}/{target}: {completed.stderr.strip()}")
+        return None
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_result(result: BenchmarkResult):
+    workers = result["workers"] or "auto"
+    cpu = "-"
+    if result["cpu_percent"] is not None:
+        cpu = f"{result['cpu_percent']:.0f}%"
+
+    rss = "-"
+    if result["peak_rss_mb"] is not None:
+        rss = f"{result['peak_rss_mb']:.0f} MB"
+
+    print(
+        f"{result['scenario']:<11} {result['target']:<20} {result['mode']:<8} "
+        + f"{workers!s:>7} {result['chunk_size'] // 1024:>7} KB "
+        + f"{result['mbps']:>9.1f} MB/s {cpu:>6} {rss:>9}"
+    )
+
+
+def save_results_csv(path: Path, results: list[BenchmarkResult]):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(BenchmarkResult.__annotations__))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def parse_workers(value: str):
+    return None if value == "auto" else int(value)
+
+
+def run_benchmark(
+    scenarios: list[Scenario],
+    targets: list[Target],
+    configs: list[BenchmarkConfig],
+    scale: float,
+    base_dir: Path | None = None,
+):
+    from scripts.digest_index import disable_digest_index
+
+    # as árvores sintéticas não podem aparecer como duplicatas de casos reais
+    disable_digest_index()
+
+    results: list[BenchmarkResult] = []
+    temp_dir = Path(tempfile.mkdtemp(prefix="benchmark_hashes_", dir=base_dir))
+
+    print(
+        "Os arquivos recém-gerados estão no cache do sistema: os números medem "
+        + "principalmente CPU. Use --pasta-base em outro disco para medir leitura.\n"
+    )
+    print(
+        f"{'cenário':<11} {'alvo':<20} {'modo':<8} {'workers':>7} {'bloco':>10} "
+        + f"{'vazão':>14} {'CPU':>6} {'pico RSS':>9}"
+    )
+
+    try:
+        for scenario in scenarios:
+            folder = temp_dir.joinpath(scenario)
+            create_evidence_tree(folder, scenario, scale)
+
+            for target in targets:
+                # check_one_file_hash lê um único arquivo, sem o engine
+                target_configs = configs
+                if target == "check_one_file_hash":
+                    target_configs = configs[:1]
+
+                for config in target_configs:
+                    result = run_in_subprocess(folder, scenario, target, config)
+                    if result:
+                        print_result(result)
+                        results.append(result)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        "Mede a vazão do cálculo de hashes em árvores de evidências sintéticas"
+    )
+    parser.add_argument(
+        "--cenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=list(SCENARIOS),
+        help="Muitos PDFs pequenos, poucos zips grandes ou uma mistura",
+    )
+    parser.add_argument(
+        "--alvos",
+        nargs="+",
+        choices=TARGETS,
+        default=list(TARGETS),
+        help="Funções medidas",
+    )
+    parser.add_argument(
+        "--modos",
+        nargs="+",
+        choices=["thread", "process"],
+        default=["thread", "process"],
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=parse_workers,
+        default=[None],
+        help="Quantidades máximas de workers a comparar (ou auto)",
+    )
+    parser.add_argument(
+        "--blocos",
+        nargs="+",
+        type=int,
+        default=[1024],
+        help="Tamanhos iniciais de leitura em KB a comparar",
+    )
+    parser.add_argument(
+        "--escala",
+        type=float,
+        default=0.1,
+        help="Fator sobre a referência (2000 PDFs de 64 KB, 3 zips de 2 GB)",
+    )
+    parser.add_argument(
+        "--pasta-base",
+        type=str,
+        default=None,
+        help="Onde criar a árvore sintética (padrão: pasta temporária do sistema)",
+    )
+    parser.add_argument(
+        "--saida",
+        type=str,
+        default=None,
+        help="Grava os resultados em um arquivo .csv",
+    )
+    parser.add_argument("--filho", type=str, default=None, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.filho:
+        job = json.loads(args.filho)
+        result = measure(
+            Path(job["folder"]), job["scenario"], job["target"], job["config"]
+        )
+        print(json.dumps(result))
+        sys.exit(0)
+
+    configs: list[BenchmarkConfig] = [
+        {"mode": mode, "workers": workers, "chunk_size": chunk * 1024}
+        for mode in args.modos
+        for workers in args.workers
+        for chunk in args.blocos
+    ]
+
+    results = run_benchmark(
+        args.cenarios,
+        args.alvos,
+        configs,
+        args.escala,
+        Path(args.pasta_base) if args.pasta_base else None,
+    )
+
+    if args.saida:
+        save_results_csv(Path(args.saida), results)
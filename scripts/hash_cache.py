@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+cache_file_name = "hashes_cache.sqlite3"
+
+
+def default_cache_dir():
+    # pasta de cache do usuário (Windows: LOCALAPPDATA, Linux: XDG_CACHE_HOME)
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+
+    if base:
+        return Path(base).joinpath("data-processing-tools")
+
+    return Path.home().joinpath(".cache", "data-processing-tools")
+
+
+class HashCache:
+    """
+    Cache persistente de hashes. Uma entrada só é reaproveitada quando o
+    arquivo mantém o mesmo caminho, tamanho, mtime_ns e inode.
+    """
+
+    def __init__(self, db_path: Path | None = None):
+        if db_path is None:
+            db_path = default_cache_dir().joinpath(cache_file_name)
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            str(db_path), check_same_thread=False, timeout=30
+        )
+
+        with self.lock:
+            # WAL permite leituras de vários processos enquanto outro escreve
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hashes (
+                    path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    PRIMARY KEY (path, algorithm)
+                )
+                """
+            )
+            self.connection.commit()
+
+    @staticmethod
+    def file_identity(file_path: Path):
+        stat = os.stat(file_path)
+        return (
+            str(Path(file_path).resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+        )
+
+    def get(self, file_path: Path, algorithm: str) -> str | None:
+        try:
+            path, size, mtime_ns, inode = HashCache.file_identity(file_path)
+        except OSError:
+            return None
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT size, mtime_ns, inode, digest FROM hashes WHERE path = ? AND algorithm = ?",
+                (path, algorithm),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        cached_size, cached_mtime_ns, cached_inode, digest = row
+
+        if (cached_size, cached_mtime_ns, cached_inode) != (size, mtime_ns, inode):
+            return None
+
+        return digest
+
+    def set(
+        self,
+        file_path: Path,
+        algorithm: str,
+        digest: str,
+        identity: tuple[str, int, int, int] | None = None,
+    ):
+        try:
+            current_identity = HashCache.file_identity(file_path)
+        except OSError:
+            return
+
+        # o arquivo mudou enquanto a hash era calculada: não guarda
+        if identity is not None and identity != current_identity:
+            return
+
+        path, size, mtime_ns, inode = current_identity
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                (path, algorithm, size, mtime_ns, inode, digest),
+            )
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+_cache: HashCache | None = None
+_cache_unavailable = False
+_cache_lock = threading.Lock()
+
+
+def get_hash_cache():
+    # uma instância por processo, criada apenas quando usada
+    global _cache, _cache_unavailable
+
+    with _cache_lock:
+        if _cache is None and not _cache_unavailable:
+            try:
+                _cache = HashCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Cache de hashes indisponível: {e}")
+                _cache_unavailable = True
+
+        return _cache
@@ -0,0 +1,329 @@
+import os
+import time
+import multiprocessing
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Literal, NotRequired, TypedDict
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    wait,
+)
+from scripts.hash_report_tools import Hasher, HashFunc
+from scripts.hash_progress import ProgressTracker
+from scripts.buffered_reader import BandwidthLimiter, IOConfig
+
+EngineMode = Literal["thread", "process"]
+
+# natural: ordem da listagem; largest_first (LPT): menor tempo total;
+# smallest_first: resultados rápidos no início; physical: pelo inode, menos
+# saltos da cabeça de leitura em discos mecânicos
+SchedulePolicy = Literal["natural", "largest_first", "smallest_first", "physical"]
+
+SCHEDULE_POLICIES: tuple[SchedulePolicy, ...] = (
+    "natural",
+    "largest_first",
+    "smallest_first",
+    "physical",
+)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MIN_CHUNK_SIZE = 1024 * 32
+MAX_CHUNK_SIZE = 1024 * 1024 * 8
+
+# janela mínima de medição antes de ajustar workers ou tamanho de leitura
+TUNING_WINDOW_SECONDS = 1.0
+TUNING_TOLERANCE = 0.05
+
+
+# hashes por bloco calculadas na mesma leitura: algoritmo, tamanho do bloco e
+# se a leitura é obrigatória mesmo com as hashes do arquivo no cache
+ChunkSpec = tuple[HashFunc, int, bool]
+
+
+class HashJob(TypedDict):
+    file: Path
+    hash_funcs: tuple[HashFunc, ...]
+    size: int
+    inode: int
+    chunk_spec: NotRequired[ChunkSpec]
+
+
+class HashJobResult(TypedDict):
+    file: Path
+    digests: dict[HashFunc, str | None]
+    size: int
+    seconds: float
+    chunk_size: int
+    # hashes dos blocos, quando pedidas e o arquivo foi de fato lido
+    chunks: NotRequired[list[str] | None]
+
+
+def hash_file_job(
+    file: Path,
+    hash_funcs: tuple[HashFunc, ...],
+    chunk_size: int,
+    force_rehash: bool,
+    progress: Callable[[int], None] | None = None,
+    io_config: IOConfig | None = None,
+    chunk_spec: ChunkSpec | None = None,
+):
+    # função de módulo para poder ser enviada a um ProcessPoolExecutor
+    start = time.perf_counter()
+
+    digester = None
+    if chunk_spec:
+        # importado aqui: o chunk_manifest depende deste módulo
+        from scripts.chunk_manifest import ChunkDigester
+
+        hash_func, manifest_chunk_size, required = chunk_spec
+        digester = ChunkDigester(hash_func, manifest_chunk_size)
+        force_rehash = force_rehash or required
+
+    digests = Hasher.calculate_digests(
+        file,
+        hash_funcs,
+        chunk_size=chunk_size,
+        force_rehash=force_rehash,
+        progress=progress,
+        io_config=io_config,
+        on_chunk=digester.update if digester else None,
+    )
+    seconds = time.perf_counter() - start
+
+    chunks = None
+    if digester and all(digests.values()):
+        chunks = digester.finish()
+
+    return digests, seconds, chunks
+
+
+def physical_position(job: HashJob):
+    # no Windows o DirEntry.stat() da listagem traz st_ino zerado, o os.stat não
+    if job["inode"]:
+        return job["inode"]
+
+    try:
+        return os.stat(job["file"]).st_ino
+    except OSError:
+        return 0
+
+
+def order_jobs(jobs: Iterable[HashJob], schedule: SchedulePolicy) -> list[HashJob]:
+    # as ordenações são estáveis: empates mantêm a ordem natural
+    ordered = list(jobs)
+
+    if schedule == "largest_first":
+        ordered.sort(key=lambda job: job["size"], reverse=True)
+    elif schedule == "smallest_first":
+        ordered.sort(key=lambda job: job["size"])
+    elif schedule == "physical":
+        inodes = [physical_position(job) for job in ordered]
+
+        if len(ordered) > 1 and not any(inodes):
+            print("Inodes indisponíveis neste sistema de arquivos: ordem natural")
+
+        positions = sorted(range(len(ordered)), key=inodes.__getitem__)
+        ordered = [ordered[index] for index in positions]
+
+    return ordered
+
+
+def default_max_workers(mode: EngineMode):
+    cpus = os.cpu_count() or 1
+
+    if mode == "process":
+        return cpus
+
+    # hashlib e read liberam o GIL, então threads escalam até o limite do disco
+    return min(32, cpus * 2)
+
+
+class ThroughputTuner:
+    """
+    Ajusta a quantidade de workers e o tamanho de leitura por subida de
+    encosta: a cada janela compara o throughput com a janela anterior e
+    mantém a direção do ajuste enquanto houver ganho.
+    """
+
+    def __init__(self, max_workers: int, initial_workers: int, chunk_size: int):
+        self.max_workers = max_workers
+        self.workers = max(1, min(initial_workers, max_workers))
+        self.chunk_size = chunk_size
+
+        self.knob: Literal["workers", "chunk_size"] = "workers"
+        self.direction = 1
+        self.previous_throughput = 0.0
+
+        self.window_bytes = 0
+        self.window_start = time.perf_counter()
+
+    def chunk_size_for(self, size: int):
+        # arquivos pequenos não precisam de buffers grandes
+        chunk = MIN_CHUNK_SIZE
+        while chunk < self.chunk_size and chunk * 16 < size:
+            chunk *= 2
+
+        return chunk
+
+    def record(self, size: int):
+        self.window_bytes += size
+
+        elapsed = time.perf_counter() - self.window_start
+        if elapsed < TUNING_WINDOW_SECONDS:
+            return
+
+        throughput = self.window_bytes / elapsed
+        self.window_bytes = 0
+        self.window_start = time.perf_counter()
+
+        if self.previous_throughput:
+            change = (
+                throughput - self.previous_throughput
+            ) / self.previous_throughput
+
+            if change < -TUNING_TOLERANCE:
+                # piorou: inverte a direção e alterna o parâmetro ajustado
+                self.direction = -self.direction
+                self.knob = "chunk_size" if self.knob == "workers" else "workers"
+            elif change < TUNING_TOLERANCE:
+                # estável: tenta o outro parâmetro
+                self.knob = "chunk_size" if self.knob == "workers" else "workers"
+
+        self.previous_throughput = throughput
+        self.step()
+
+    def step(self):
+        if self.knob == "workers":
+            self.workers = max(1, min(self.max_workers, self.workers + self.direction))
+        else:
+            chunk_size = (
+                self.chunk_size * 2 if self.direction > 0 else self.chunk_size // 2
+            )
+            self.chunk_size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, chunk_size))
+
+
+class HashEngine:
+    def __init__(
+        self,
+        mode: EngineMode = "thread",
+        max_workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        force_rehash: bool = False,
+        progress: ProgressTracker | None = None,
+        schedule: SchedulePolicy = "natural",
+        drop_cache: bool = False,
+        max_mbps: float | None = None,
+    ):
+        self.mode: EngineMode = mode
+        self.schedule: SchedulePolicy = schedule
+        self.drop_cache = drop_cache
+        self.max_mbps = max_mbps
+        self.force_rehash = force_rehash
+        self.progress = progress
+        self.max_workers = max_workers or default_max_workers(mode)
+        self.io = IOConfig()
+
+        # começa com poucos leitores: discos mecânicos e USB pioram com muitos
+        self.tuner = ThroughputTuner(
+            self.max_workers, initial_workers=2, chunk_size=chunk_size
+        )
+
+    def create_executor(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def create_io_config(self, stack: ExitStack):
+        # um único limite para a execução inteira, qualquer que seja a
+        # quantidade de workers em uso no momento
+        limiter = None
+
+        if self.max_mbps:
+            manager = None
+            if self.mode == "process":
+                manager = stack.enter_context(multiprocessing.Manager())
+
+            limiter = BandwidthLimiter(self.max_mbps * 1024 * 1024, manager)
+
+        return IOConfig(drop_cache=self.drop_cache, limiter=limiter)
+
+    def bytes_callback(self, job: HashJob):
+        # callbacks não atravessam processos: no modo de processos o progresso
+        # é contado quando cada arquivo termina
+        if not self.progress or self.mode == "process":
+            return None
+
+        return self.progress.bytes_callback(str(job["file"]))
+
+    def submit_job(self, executor: Executor, job: HashJob, chunk_size: int):
+        # subclasses podem trocar a tarefa executada para cada arquivo
+        return executor.submit(
+            hash_file_job,
+            job["file"],
+            job["hash_funcs"],
+            chunk_size,
+            self.force_rehash,
+            self.bytes_callback(job),
+            self.io,
+            job.get("chunk_spec"),
+        )
+
+    def run(self, jobs: Iterable[HashJob]) -> Iterator[HashJobResult]:
+        pending_jobs = order_jobs(jobs, self.schedule)
+        pending_jobs.reverse()
+
+        running: dict[Future, tuple[HashJob, int, int]] = {}
+
+        with ExitStack() as stack:
+            self.io = self.create_io_config(stack)
+            executor = stack.enter_context(self.create_executor())
+
+            while pending_jobs or running:
+                # mantém em execução apenas os workers definidos pelo tuner
+                while pending_jobs and len(running) < self.tuner.workers:
+                    job = pending_jobs.pop()
+                    size = job["size"]
+                    chunk_size = self.tuner.chunk_size_for(size)
+
+                    # registrado antes do envio: o worker já pode contar bytes
+                    if self.progress:
+                        self.progress.file_started(str(job["file"]), size)
+
+                    future = self.submit_job(executor, job, chunk_size)
+                    running[future] = (job, size, chunk_size)
+
+                if self.progress:
+                    self.progress.set_queue(len(pending_jobs), len(running))
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    job, size, chunk_size = running.pop(future)
+
+                    if self.progress:
+                        self.progress.set_queue(len(pending_jobs), len(running))
+                        self.progress.file_finished(str(job["file"]))
+
+                    try:
+                        digests, seconds, chunks = future.result()
+                    except Exception as e:
+                        print(f"Erro ao calcular hash de {job['file']}: {e}")
+                        digests = {hash_func: None for hash_func in job["hash_funcs"]}
+                        seconds = 0.0
+                        chunks = None
+
+                    self.tuner.record(size)
+
+                    yield {
+                        "file": job["file"],
+                        "digests": digests,
+                        "size": size,
+                        "seconds": seconds,
+                        "chunk_size": chunk_size,
+                        "chunks": chunks,
+                    }
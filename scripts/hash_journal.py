@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TypedDict
+from scripts.hash_report_tools import HashFunc
+
+# intervalo mínimo entre fsyncs: garante o diário em queda de energia sem
+# pagar um fsync por arquivo em pastas com milhares de arquivos pequenos
+FSYNC_INTERVAL = 1.0
+
+
+class JournalRecord(TypedDict):
+    file: str
+    size: int
+    mtime_ns: int
+    digests: dict[HashFunc, str]
+    collision: bool
+
+
+class HashJournal:
+    """
+    Diário append-only das verificações concluídas, gravado na pasta do caso.
+    Uma execução interrompida retoma a partir dele, pulando os arquivos já
+    verificados que não mudaram desde então.
+    """
+
+    def __init__(self, path: Path, root_path: Path):
+        self.path = path
+        self.root_path = root_path
+        self.lock = threading.Lock()
+        self.records: dict[str, JournalRecord] = {}
+        self.file = None
+        self.last_fsync = 0.0
+
+    def key(self, file_path: Path):
+        try:
+            return file_path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    def load(self):
+        if not self.path.exists():
+            return self.records
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record: JournalRecord = json.loads(line)
+                except json.JSONDecodeError:
+                    # a última linha pode ter ficado incompleta na interrupção
+                    continue
+
+                self.records[record["file"]] = record
+
+        return self.records
+
+    def get(
+        self,
+        file_path: Path,
+        size: int,
+        mtime_ns: int,
+        hash_funcs: tuple[HashFunc, ...],
+    ) -> JournalRecord | None:
+        record = self.records.get(self.key(file_path))
+
+        if record is None:
+            return None
+
+        if record["size"] != size or record["mtime_ns"] != mtime_ns:
+            return None
+
+        # o manifesto pode ter mudado de algoritmo entre as execuções
+        if any(not record["digests"].get(func) for func in hash_funcs):
+            return None
+
+        return record
+
+    def append(
+        self,
+        file_path: Path,
+        size: int,
+        mtime_ns: int,
+        digests: dict[HashFunc, str | None],
+        collision: bool,
+    ):
+        record: JournalRecord = {
+            "file": self.key(file_path),
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "digests": {func: digest for func, digest in digests.items() if digest},
+            "collision": collision,
+        }
+
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")
+
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+            now = time.monotonic()
+            if now - self.last_fsync >= FSYNC_INTERVAL:
+                os.fsync(self.file.fileno())
+                self.last_fsync = now
+
+            self.records[record["file"]] = record
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def remove(self):
+        # chamado após o relatório final ser salvo: a próxima execução recomeça
+        self.close()
+        self.path.unlink(missing_ok=True)
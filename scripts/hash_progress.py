@@ -0,0 +1,217 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Literal, TypedDict
+
+ProgressEventType = Literal[
+    "run_started", "file_started", "bytes", "file_finished", "run_finished"
+]
+
+
+class ProgressEvent(TypedDict):
+    type: ProgressEventType
+    timestamp: float
+    file: str | None
+    file_size: int
+    file_bytes: int
+    file_mbps: float
+    bytes_hashed: int
+    total_bytes: int
+    total_mbps: float
+    eta_seconds: float | None
+    files_done: int
+    files_total: int
+    queue_depth: int
+    running: int
+    run_info: dict[str, str] | None
+
+
+ProgressListener = Callable[[ProgressEvent], None]
+
+MB = 1024 * 1024
+
+# intervalo mínimo entre eventos de bytes, para não inundar console e GUI
+BYTES_EVENT_INTERVAL = 0.25
+
+
+class FileProgress:
+    __slots__ = ("size", "bytes", "start")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.bytes = 0
+        self.start = time.perf_counter()
+
+
+class ProgressTracker:
+    """
+    Agrega o progresso das threads de hash e repassa eventos para os
+    listeners (console, GUI, log em JSON).
+    """
+
+    def __init__(
+        self,
+        total_bytes: int,
+        files_total: int,
+        listeners: list[ProgressListener] | None = None,
+        run_info: dict[str, str] | None = None,
+    ):
+        self.total_bytes = total_bytes
+        self.files_total = files_total
+        self.listeners = listeners or []
+        self.run_info = run_info or {}
+
+        self.lock = threading.Lock()
+        self.files: dict[str, FileProgress] = {}
+        self.bytes_hashed = 0
+        self.files_done = 0
+        self.queue_depth = 0
+        self.running = 0
+        self.start = time.perf_counter()
+        self.last_bytes_event = 0.0
+
+    def emit(self, type: ProgressEventType, file: str | None = None):
+        now = time.perf_counter()
+        elapsed = max(now - self.start, 1e-6)
+        total_mbps = self.bytes_hashed / MB / elapsed
+
+        remaining = max(self.total_bytes - self.bytes_hashed, 0)
+        eta_seconds = remaining / (total_mbps * MB) if total_mbps else None
+
+        file_progress = self.files.get(file) if file else None
+        file_mbps = 0.0
+        if file_progress:
+            file_elapsed = max(now - file_progress.start, 1e-6)
+            file_mbps = file_progress.bytes / MB / file_elapsed
+
+        event: ProgressEvent = {
+            "type": type,
+            "timestamp": time.time(),
+            "file": file,
+            "file_size": file_progress.size if file_progress else 0,
+            "file_bytes": file_progress.bytes if file_progress else 0,
+            "file_mbps": file_mbps,
+            "bytes_hashed": self.bytes_hashed,
+            "total_bytes": self.total_bytes,
+            "total_mbps": total_mbps,
+            "eta_seconds": eta_seconds,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "queue_depth": self.queue_depth,
+            "running": self.running,
+            # parâmetros da execução só no início e no fim, para o log
+            "run_info": (
+                self.run_info if type in ("run_started", "run_finished") else None
+            ),
+        }
+
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Erro no listener de progresso: {e}")
+
+    def run_started(self):
+        with self.lock:
+            self.start = time.perf_counter()
+            self.emit("run_started")
+
+    def set_queue(self, queue_depth: int, running: int):
+        with self.lock:
+            self.queue_depth = queue_depth
+            self.running = running
+
+    def file_started(self, file: str, size: int):
+        with self.lock:
+            self.files[file] = FileProgress(size)
+            self.emit("file_started", file)
+
+    def add_bytes(self, file: str, size: int):
+        with self.lock:
+            file_progress = self.files.get(file)
+            if file_progress:
+                file_progress.bytes += size
+            self.bytes_hashed += size
+
+            now = time.perf_counter()
+            if now - self.last_bytes_event >= BYTES_EVENT_INTERVAL:
+                self.last_bytes_event = now
+                self.emit("bytes", file)
+
+    def file_finished(self, file: str):
+        with self.lock:
+            file_progress = self.files.get(file)
+
+            # hashes vindas do cache (ou de outro processo) contam de uma vez
+            if file_progress and file_progress.bytes < file_progress.size:
+                self.bytes_hashed += file_progress.size - file_progress.bytes
+                file_progress.bytes = file_progress.size
+
+            self.files_done += 1
+            self.emit("file_finished", file)
+            self.files.pop(file, None)
+
+    def run_finished(self):
+        with self.lock:
+            self.emit("run_finished")
+
+    def bytes_callback(self, file: str) -> Callable[[int], None]:
+        return lambda size: self.add_bytes(file, size)
+
+
+def format_duration(seconds: float | None):
+    if seconds is None:
+        return "--:--:--"
+
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_progress_line(event: ProgressEvent):
+    percent = (
+        event["bytes_hashed"] / event["total_bytes"] * 100
+        if event["total_bytes"]
+        else 100.0
+    )
+
+    return (
+        f"[{percent:5.1f}%] "
+        + f"{event['bytes_hashed'] / MB:,.0f}/{event['total_bytes'] / MB:,.0f} MB "
+        + f"| {event['total_mbps']:.1f} MB/s "
+        + f"| ETA {format_duration(event['eta_seconds'])} "
+        + f"| arquivos {event['files_done']}/{event['files_total']} "
+        + f"| fila {event['queue_depth']}"
+    )
+
+
+class ConsoleProgress:
+    def __call__(self, event: ProgressEvent):
+        if event["type"] == "file_started":
+            return
+
+        end = "\n" if event["type"] == "run_finished" else ""
+        sys.stdout.write(f"\r{format_progress_line(event)}{end}")
+        sys.stdout.flush()
+
+
+class JsonRunLog:
+    """Grava os eventos da execução em JSON Lines na pasta do caso."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, event: ProgressEvent):
+        with self.lock:
+            if self.file.closed:
+                return
+
+            self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+            if event["type"] == "run_finished":
+                self.file.close()
+            else:
+                self.file.flush()
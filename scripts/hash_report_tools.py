@@ -2,21 +2,51 @@ from pathlib import Path
 import re
 from abc import ABC
 import hashlib
-from typing import TypedDict, Literal
+import itertools
+import heapq
+import json
+import shutil
+import tempfile
+import threading
+from typing import IO, Callable, Iterator, TypedDict, Literal
 from fpdf import FPDF
-
-chunk_size = 1024 * 32
+from scripts.hash_cache import HashCache, get_hash_cache
+from scripts.buffered_reader import IOConfig, iter_file_chunks
+from scripts.report_writers import (
+    DEFAULT_VOLUME_SIZE,
+    STREAMING_WRITERS,
+    PdfLayout,
+    PdfTableRenderer,
+    ReportFormat,
+    ReportWriter,
+    volume_name,
+)
+
+chunk_size = 1024 * 1024
 
 successIcon = "✅"
 errorIcon = "❌"
 
 Color = Literal["green", "black", "red"]
 
+ReportStatus = Literal["ok", "collision", "not_found", "size_mismatch", "missing"]
+
+# quantidade máxima de seções aguardando a vez na ordem natural dos arquivos
+REORDER_LIMIT = 256
+MAX_SPOOL_RUNS = 32
+
 
 class PDFSection(TypedDict):
+    file: str
     text: str
     color: Color
     collision: bool
+    status: ReportStatus
+    algorithm: str | None
+    original_hash: str
+    generated_hash: str | None
+    # linhas extras exibidas abaixo das hashes (tamanhos, trechos corrompidos)
+    details: list[str]
 
 
 class CompareResult(TypedDict):
@@ -25,43 +55,143 @@ class CompareResult(TypedDict):
     generated_hash: str
 
 
-HashFunc = Literal["SHA256", "SHA512"]
+HashFunc = Literal["SHA256", "SHA512", "SHA1", "MD5"]
+
+AUTO_HASH_FUNC = "Automático"
+
+HashFuncOption = HashFunc | Literal["Automático"]
+
+# o tamanho da hash em hexadecimal identifica o algoritmo
+HASH_FUNC_BY_LENGTH: dict[int, HashFunc] = {
+    32: "MD5",
+    40: "SHA1",
+    64: "SHA256",
+    128: "SHA512",
+}
+
+hash_pattern = re.compile(
+    r"\b(?:[0-9a-fA-F]{128}|[0-9a-fA-F]{64}|[0-9a-fA-F]{40}|[0-9a-fA-F]{32})\b"
+)
 
 
 class Hasher(ABC):
     @classmethod
-    def generate_file_hash(self, file_path: Path, is_google_hashes: bool):
+    def generate_file_hash(
+        self,
+        file_path: Path,
+        is_google_hashes: bool,
+        chunk_size: int = chunk_size,
+        force_rehash: bool = False,
+    ):
         generated_hash = (
-            Hasher.calculate_sha512(file_path)
+            Hasher.calculate_sha512(file_path, chunk_size, force_rehash)
             if is_google_hashes
-            else Hasher.calculate_sha256(file_path)
+            else Hasher.calculate_sha256(file_path, chunk_size, force_rehash)
         )
 
         return generated_hash
 
     @classmethod
-    def calculate_sha256(self, file_path: Path):
-        sha256 = hashlib.sha256()
+    def calculate_sha256(
+        self, file_path: Path, chunk_size: int = chunk_size, force_rehash: bool = False
+    ):
+        digests = Hasher.calculate_digests(
+            file_path, ("SHA256",), chunk_size, force_rehash
+        )
+        return digests["SHA256"]
+
+    @classmethod
+    def calculate_sha512(
+        self, file_path: Path, chunk_size: int = chunk_size, force_rehash: bool = False
+    ):
+        digests = Hasher.calculate_digests(
+            file_path, ("SHA512",), chunk_size, force_rehash
+        )
+        return digests["SHA512"]
+
+    @classmethod
+    def calculate_digests(
+        self,
+        file_path: Path,
+        hash_funcs: tuple[HashFunc, ...],
+        chunk_size: int = chunk_size,
+        force_rehash: bool = False,
+        progress: Callable[[int], None] | None = None,
+        io_config: IOConfig | None = None,
+        on_chunk: Callable[[memoryview], None] | None = None,
+    ) -> dict[HashFunc, str | None]:
+        # force_rehash ignora o cache (cadeia de custódia), mas atualiza as entradas
+        cache = get_hash_cache()
+
+        digests: dict[HashFunc, str | None] = {
+            hash_func: None for hash_func in hash_funcs
+        }
+
+        if cache and not force_rehash:
+            for hash_func in hash_funcs:
+                digests[hash_func] = cache.get(file_path, hash_func)
+
+        missing = tuple(hash_func for hash_func in hash_funcs if not digests[hash_func])
+
+        if not missing:
+            return digests
+
         try:
-            with open(file_path, "rb+") as file:
-                while chunk := file.read(chunk_size):
-                    sha256.update(chunk)
-            return sha256.hexdigest()
-        except Exception as e:
-            return None
+            identity = HashCache.file_identity(file_path)
+        except OSError:
+            identity = None
+
+        # todas as hashes que faltam são calculadas em uma única leitura
+        generated = Hasher.read_digests(
+            file_path, missing, chunk_size, progress, io_config, on_chunk
+        )
+
+        for hash_func in missing:
+            digests[hash_func] = generated.get(hash_func)
+
+            if cache and identity and digests[hash_func]:
+                cache.set(file_path, hash_func, digests[hash_func], identity)
+
+        return digests
 
     @classmethod
-    def calculate_sha512(self, file_path: Path):
-        sha512_hash = hashlib.sha512()
+    def read_digests(
+        self,
+        file_path: Path,
+        hash_funcs: tuple[HashFunc, ...],
+        chunk_size: int = chunk_size,
+        progress: Callable[[int], None] | None = None,
+        io_config: IOConfig | None = None,
+        on_chunk: Callable[[memoryview], None] | None = None,
+    ) -> dict[HashFunc, str]:
+        hashers = {
+            hash_func: hashlib.new(hash_func.lower()) for hash_func in hash_funcs
+        }
+
         try:
-            with open(file_path, "rb") as file:
-                while chunk := file.read(chunk_size):
-                    sha512_hash.update(chunk)
-            return sha512_hash.hexdigest()
+            for chunk in iter_file_chunks(file_path, chunk_size, io_config=io_config):
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+
+                # outros cálculos sobre a mesma leitura (hashes por bloco)
+                if on_chunk:
+                    on_chunk(chunk)
+
+                if progress:
+                    progress(len(chunk))
         except Exception as e:
             print(f"An error occurred: {e}")
+            return {}
+
+        return {hash_func: hasher.hexdigest() for hash_func, hasher in hashers.items()}
+
+    @classmethod
+    def detect_hash_func(self, original_hash: str | None) -> HashFunc | None:
+        if not original_hash:
             return None
 
+        return HASH_FUNC_BY_LENGTH.get(len(original_hash.strip()))
+
     @classmethod
     def extract_sha256(self, text: str):
         pattern = r"\b[a-f0-9]{64}\b"
@@ -78,19 +208,45 @@ class Hasher(ABC):
             return result.group(0)
         return None
 
+    @classmethod
+    def extract_hash(self, text: str):
+        # qualquer hash MD5, SHA1, SHA256 ou SHA512, a maior encontrada primeiro
+        result = hash_pattern.search(text)
+        if result:
+            return result.group(0)
+        return None
+
     @classmethod
     def hash_comparator(
-        self, file: str, original_hash: str, hash_func: HashFunc
+        self,
+        file: str,
+        original_hash: str,
+        hash_func: HashFuncOption,
+        force_rehash: bool = False,
     ) -> CompareResult:
         generated_hash = ""
         path = Path(file)
-
-        if hash_func == "SHA256":
-            generated_hash = Hasher.calculate_sha256(path)
-        elif hash_func == "SHA512":
-            generated_hash = Hasher.calculate_sha512(path)
+        original_hash = original_hash.strip().lower()
+
+        if hash_func == AUTO_HASH_FUNC:
+            detected = Hasher.detect_hash_func(original_hash)
+            # sem como identificar, calcula SHA256 e SHA512 na mesma leitura
+            hash_funcs: tuple[HashFunc, ...] = (
+                (detected,) if detected else ("SHA256", "SHA512")
+            )
+        elif hash_func in HASH_FUNC_BY_LENGTH.values():
+            hash_funcs = (hash_func,)
         else:
-            generated_hash = Hasher.calculate_sha256(path)
+            hash_funcs = ("SHA256",)
+
+        digests = Hasher.calculate_digests(
+            path, hash_funcs, force_rehash=force_rehash
+        )
+
+        generated_hash = next(
+            (digest for digest in digests.values() if digest == original_hash),
+            digests[hash_funcs[0]],
+        )
 
         is_equal = generated_hash == original_hash
 
@@ -110,50 +266,83 @@ class Hasher(ABC):
             }
 
 
-class Reporter(ABC):
-    collisions = 0
-    verified_files = 0
-    hashes_count = 0
-    pdf = FPDF()  # type: ignore
-    pdf_sections: list[PDFSection] = []
+class Reporter:
+    """
+    Relatório de uma verificação. Cada execução cria a sua instância; as
+    seções são gravadas em disco à medida que chegam e reordenadas na ordem
+    natural dos arquivos com um buffer limitado.
 
-    @classmethod
-    def clear_reporter(self):
-        Reporter.collisions = 0
-        Reporter.verified_files = 0
-        Reporter.hashes_count = 0
-        Reporter.pdf_sections = []
-        Reporter.pdf = FPDF()
+    Os formatos JSON, CSV e HTML são escritos durante a verificação; o PDF é
+    montado no fim, um volume a cada volume_size arquivos.
+    """
+
+    def __init__(
+        self,
+        hashes_count: int = 0,
+        files: list[Path] | None = None,
+        reorder_limit: int = REORDER_LIMIT,
+        formats: tuple[ReportFormat, ...] = ("pdf",),
+        volume_size: int = DEFAULT_VOLUME_SIZE,
+        pdf_layout: PdfLayout = "text",
+    ):
+        self.collisions = 0
+        # parâmetros da execução exibidos no cabeçalho do relatório
+        self.run_info: dict[str, str] = {}
+        self.verified_files = 0
+        self.hashes_count = hashes_count
+        self.lock = threading.Lock()
+
+        self.order = {str(file): index for index, file in enumerate(files or [])}
+        self.reorder_limit = reorder_limit
+        self.pending: list[tuple[int, int, PDFSection]] = []
+        self.next_index = 0
+        self.arrivals = 0
+
+        self.spool_dir = Path(tempfile.mkdtemp(prefix="relatorio_hashes_"))
+        self.runs: list[Path] = []
+        self.run_count = 0
+        self.run_file: IO[str] | None = None
+        self.run_last_index = -1
+
+        self.pdf: FPDF | None = None
+        self.pdf_layout = pdf_layout
+        self.formats = formats
+        self.volume_size = max(1, volume_size)
+
+        self.writers: list[ReportWriter] = [
+            STREAMING_WRITERS[report_format](self.spool_dir, self.volume_size)
+            for report_format in formats
+            if report_format in STREAMING_WRITERS
+        ]
 
-    @classmethod
     def configure_pdf(self):
-        Reporter.pdf.add_page()
-        Reporter.pdf.set_font("Arial", size=12)
+        self.pdf = FPDF()  # type: ignore
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", size=12)
 
-    @classmethod
     def add_text_to_pdf(self, text: str):
         formatted_text = text.replace(successIcon, "[OK] -").replace(
             errorIcon, "[ERRO] -"
         )
-        Reporter.pdf.multi_cell(0, 10, formatted_text, align="L")
+        self.pdf.multi_cell(0, 10, formatted_text, align="L")
 
-    @classmethod
     def set_pdf_text_color(self, color: Color):
         if color == "green":
-            Reporter.pdf.set_text_color(0, 150, 0)
+            self.pdf.set_text_color(0, 150, 0)
         elif color == "red":
-            Reporter.pdf.set_text_color(255, 0, 0)
+            self.pdf.set_text_color(255, 0, 0)
         elif color == "black":
-            Reporter.pdf.set_text_color(0, 0, 0)
+            self.pdf.set_text_color(0, 0, 0)
 
-    @classmethod
+    @staticmethod
     def create_file_report(
-        self,
         file_name: str,
         hash_not_found: bool,
         has_collision: bool,
         original_hash: str,
         generated_hash: str | None,
+        size_mismatch: tuple[int, int] | None = None,
+        file_missing: bool = False,
     ):
         text = ""
 
@@ -162,14 +351,38 @@ class Reporter(ABC):
         hashes_text = f"{indent}original: {original_hash}\n{indent}hash gerada: {generated_hash}\n"
 
         color = ""
+        status: ReportStatus = "ok"
+        details: list[str] = []
+
+        if size_mismatch:
+            expected_size, size = size_mismatch
+            text = f"{errorIcon} {file_name} houve colisão de hash, tamanho divergente\n"
+            hashes_text = (
+                f"{indent}tamanho original: {expected_size} bytes\n"
+                + f"{indent}tamanho encontrado: {size} bytes\n"
+                + f"{indent}original: {original_hash}\n"
+            )
+            color = "red"
+            status = "size_mismatch"
+            details = [
+                f"tamanho original: {expected_size} bytes",
+                f"tamanho encontrado: {size} bytes",
+            ]
+
+        elif file_missing:
+            text = f"{errorIcon} {file_name} não foi encontrado ou não pôde ser lido\n"
+            color = "red"
+            status = "missing"
 
-        if hash_not_found:
+        elif hash_not_found:
             text = f"{errorIcon} {file_name} não possui hash no arquivo de hashes.txt\n"
             color = "red"
+            status = "not_found"
 
         elif has_collision:
             text = f"{errorIcon} {file_name} houve colisão de hash\n"
             color = "red"
+            status = "collision"
         else:
             text = f"{successIcon} {file_name} foi verificado com sucesso\n"
             color = "green"
@@ -177,55 +390,200 @@ class Reporter(ABC):
         text += hashes_text + "\n"
 
         report: PDFSection = {
+            "file": str(file_name),
             "text": text,
             "color": color,
-            "collision": has_collision or hash_not_found,
+            "collision": (
+                has_collision or hash_not_found or file_missing or bool(size_mismatch)
+            ),
+            "status": status,
+            "algorithm": Hasher.detect_hash_func(original_hash)
+            or Hasher.detect_hash_func(generated_hash),
+            "original_hash": original_hash,
+            "generated_hash": generated_hash,
+            "details": details,
         }
 
         return report
 
-    @classmethod
     def add_report_to_pdf(self, file_report: PDFSection):
-        Reporter.verified_files += 1
+        self.add_reports_to_pdf([file_report])
 
-        if file_report["collision"]:
-            Reporter.collisions += 1
+    def add_reports_to_pdf(self, file_reports: list[PDFSection]):
+        # as seções do mesmo arquivo (uma por hash conferida) entram juntas e
+        # saem lado a lado em todos os formatos
+        with self.lock:
+            for file_report in file_reports:
+                self.verified_files += 1
 
-        Reporter.pdf_sections.append(file_report)
+                if file_report["collision"]:
+                    self.collisions += 1
+
+                self.arrivals += 1
+
+                # arquivos fora da lista original vão para o fim, na ordem de chegada
+                index = self.order.get(
+                    file_report["file"], len(self.order) + self.arrivals
+                )
+
+                heapq.heappush(self.pending, (index, self.arrivals, file_report))
+
+            # índices já gravados (o mesmo arquivo conferido com mais de uma
+            # hash) também saem na hora, sem esperar o fim da verificação
+            while self.pending and self.pending[0][0] <= self.next_index:
+                self.write_next_section()
+
+            # buffer cheio: grava o menor índice mesmo fora de sequência
+            while len(self.pending) > self.reorder_limit:
+                self.write_next_section()
+
+    def write_next_section(self):
+        index, _, section = heapq.heappop(self.pending)
+
+        # cada arquivo temporário precisa estar ordenado para o merge final
+        if self.run_file is None or index < self.run_last_index:
+            self.start_run()
+
+        self.run_file.write(json.dumps({"index": index, **section}) + "\n")
+        self.run_last_index = index
+        self.next_index = max(self.next_index, index + 1)
+
+        for writer in self.writers:
+            writer.write(section)
+
+    def start_run(self):
+        if self.run_file:
+            self.run_file.close()
+
+        if len(self.runs) >= MAX_SPOOL_RUNS:
+            self.compact_runs()
+
+        run_path = self.new_run_path()
+        self.runs.append(run_path)
+        self.run_file = open(run_path, "w", encoding="utf-8")
+        self.run_last_index = -1
+
+    def new_run_path(self):
+        self.run_count += 1
+        return self.spool_dir.joinpath(f"secoes_{self.run_count}.jsonl")
+
+    def compact_runs(self):
+        # junta os arquivos temporários para não manter muitos abertos no merge
+        merged_path = self.new_run_path()
+        runs = [Reporter.read_run(run) for run in self.runs]
+
+        with open(merged_path, "w", encoding="utf-8") as merged:
+            for section in heapq.merge(*runs, key=lambda section: section["index"]):
+                merged.write(json.dumps(section) + "\n")
+
+        for run in self.runs:
+            run.unlink()
+
+        self.runs = [merged_path]
+
+    def flush_pending(self):
+        # as seções ainda retidas para reordenar vão para o spool e para os
+        # writers, na ordem dos índices, antes de qualquer formato ser fechado
+        with self.lock:
+            while self.pending:
+                self.write_next_section()
+
+            if self.run_file:
+                self.run_file.close()
+                self.run_file = None
+
+    def iter_sections(self) -> Iterator[PDFSection]:
+        self.flush_pending()
+
+        runs = [Reporter.read_run(run) for run in self.runs]
+
+        for section in heapq.merge(*runs, key=lambda section: section["index"]):
+            section.pop("index")
+            yield section
+
+    @staticmethod
+    def read_run(run_path: Path) -> Iterator[dict]:
+        with open(run_path, "r", encoding="utf-8") as file:
+            for line in file:
+                yield json.loads(line)
 
-    @classmethod
     def print_file_report(self, file_report: PDFSection):
-        print(file_report.get("text"))
+        with self.lock:
+            verified_files = self.verified_files
 
-        print(
-            f"Arquivos verificados: {Reporter.verified_files}/{Reporter.hashes_count}"
-        )
+        print(file_report.get("text"))
 
-    @classmethod
-    def save_report_pdf(self, folder_path: Path):
-        Reporter.set_pdf_text_color(color="black")
-        file_name = "relatorio_hashes.pdf"
+        print(f"Arquivos verificados: {verified_files}/{self.hashes_count}")
 
+    def head_text(self, volume: int = 1, volumes: int = 1):
         alert_missing_files = ""
 
-        if Reporter.hashes_count > Reporter.verified_files:
+        if self.hashes_count > self.verified_files:
             alert_missing_files = "\n** Há arquivos em falta, a quantidade de arquivos verificados foi menor do que a quantidade de hashes encontradas **\n\n"
 
-        head_text = (
-            f"Quantidade de hashes encontradas: {Reporter.hashes_count}\n"
-            + f"Arquivos verificados: {Reporter.verified_files}\n"
-            + f"Verificados com sucesso: {Reporter.verified_files-Reporter.collisions}\n"
-            + f"Quantidade de colisões: {Reporter.collisions}\n"
+        volume_text = f"Volume {volume} de {volumes}\n" if volumes > 1 else ""
+
+        return (
+            f"Quantidade de hashes encontradas: {self.hashes_count}\n"
+            + f"Arquivos verificados: {self.verified_files}\n"
+            + f"Verificados com sucesso: {self.verified_files-self.collisions}\n"
+            + f"Quantidade de colisões: {self.collisions}\n"
+            + "".join(f"{key}: {value}\n" for key, value in self.run_info.items())
+            + volume_text
             + alert_missing_files
         )
 
-        Reporter.add_text_to_pdf(head_text)
+    def save_report_pdf(self, folder_path: Path):
+        self.save_reports(folder_path)
+
+    def save_reports(self, folder_path: Path):
+        try:
+            self.flush_pending()
+
+            if "pdf" in self.formats:
+                self.save_pdf_volumes(folder_path)
+
+            for writer in self.writers:
+                writer.finish(folder_path)
+        finally:
+            self.close()
+
+    def save_pdf_volumes(self, folder_path: Path):
+        # cada volume é gravado antes do próximo começar: a memória do PDF
+        # fica limitada a volume_size arquivos
+        volumes = max(1, -(-self.verified_files // self.volume_size))
+        sections = self.iter_sections()
+
+        for volume in range(1, volumes + 1):
+            volume_sections = itertools.islice(sections, self.volume_size)
+            path = folder_path.joinpath(volume_name("pdf", volume, volumes))
+            head_text = self.head_text(volume, volumes)
+
+            if self.pdf_layout == "table":
+                renderer = PdfTableRenderer(head_text)
+                renderer.add_rows(volume_sections)
+                renderer.output(path)
+                continue
+
+            if self.pdf is None or volume > 1:
+                self.configure_pdf()
+
+            self.set_pdf_text_color(color="black")
+            self.add_text_to_pdf(head_text)
+
+            for section in volume_sections:
+                self.set_pdf_text_color(section.get("color", "black"))
+                self.add_text_to_pdf(section.get("text"))
+
+            self.pdf.output(path.resolve())
 
-        for section in Reporter.pdf_sections:
-            Reporter.set_pdf_text_color(section.get("color", "black"))
-            Reporter.add_text_to_pdf(section.get("text"))
+    def close(self):
+        with self.lock:
+            if self.run_file:
+                self.run_file.close()
+                self.run_file = None
 
-        path = folder_path.joinpath(file_name)
+            for writer in self.writers:
+                writer.close_volume()
 
-        Reporter.pdf.output(path.resolve())
-        Reporter.clear_reporter()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
@@ -0,0 +1,310 @@
+import os
+import time
+from pathlib import Path
+from natsort import natsorted
+from scripts.hash_report_tools import HashFunc, Reporter
+from scripts.manifest_parser import Manifest
+from scripts.evidence_walker import (
+    INCOMPLETE_DOWNLOAD_SUFFIXES,
+    EvidenceFile,
+    walk_evidence_tree,
+)
+from scripts.hash_engine import (
+    DEFAULT_CHUNK_SIZE,
+    EngineMode,
+    HashEngine,
+    HashJob,
+    HashJobResult,
+    SchedulePolicy,
+)
+from scripts.report_writers import DEFAULT_VOLUME_SIZE, ReportFormat
+from scripts.hash_progress import ProgressListener, ProgressTracker
+from scripts.verifica_hashes_threads import (
+    check_if_google_file,
+    create_manifest,
+    hash_funcs_for_file,
+    process_file,
+)
+
+DEFAULT_POLL_SECONDS = 10.0
+
+# um arquivo só é lido depois de manter tamanho e mtime por estas verificações
+STABLE_POLLS = 2
+
+DEFAULT_IDLE_MINUTES = 60.0
+
+FileState = tuple[int, int]
+
+
+def find_incomplete_downloads(root_path: Path):
+    incomplete: list[Path] = []
+
+    for folder, _, files in os.walk(root_path):
+        for name in files:
+            if name.lower().endswith(INCOMPLETE_DOWNLOAD_SUFFIXES):
+                incomplete.append(Path(folder).joinpath(name))
+
+    return incomplete
+
+
+def download_in_progress(file: Path):
+    # o Firefox cria o arquivo final vazio enquanto grava o .part ao lado
+    return any(
+        file.with_name(file.name + suffix).exists()
+        for suffix in INCOMPLETE_DOWNLOAD_SUFFIXES
+    )
+
+
+class DownloadWatcher:
+    """
+    Acompanha a pasta enquanto os downloads chegam, por varredura periódica:
+    cada arquivo é lido assim que o tamanho e o mtime param de mudar. O
+    relatório é gravado uma vez, no fim do acompanhamento, com o último
+    resultado de cada arquivo.
+    """
+
+    def __init__(
+        self,
+        root_path: Path,
+        mode: EngineMode = "thread",
+        max_workers: int | None = None,
+        progress_listeners: list[ProgressListener] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        report_formats: tuple[ReportFormat, ...] = ("pdf",),
+        volume_size: int = DEFAULT_VOLUME_SIZE,
+        force_rehash: bool = False,
+        schedule: SchedulePolicy = "smallest_first",
+        drop_cache: bool = False,
+        max_mbps: float | None = None,
+    ):
+        self.root_path = root_path
+        self.mode: EngineMode = mode
+        self.max_workers = max_workers
+        self.progress_listeners = progress_listeners or []
+        self.chunk_size = chunk_size
+        self.force_rehash = force_rehash
+        self.schedule: SchedulePolicy = schedule
+        self.drop_cache = drop_cache
+        self.max_mbps = max_mbps
+        self.report_formats = report_formats
+        self.volume_size = volume_size
+
+        self.manifest = Manifest()
+        self.manifest_state: tuple[Path, int, int] | None = None
+        self.default_hash_func: HashFunc = "SHA256"
+
+        self.observed: dict[Path, tuple[FileState, int]] = {}
+        self.results: dict[Path, tuple[FileState, HashJobResult]] = {}
+
+    def reload_manifest(self, hashes_path: Path | None):
+        if hashes_path is None:
+            return False
+
+        try:
+            stat = hashes_path.stat()
+        except OSError:
+            return False
+
+        state = (hashes_path, stat.st_size, stat.st_mtime_ns)
+
+        if state == self.manifest_state:
+            return False
+
+        is_google_hashes = check_if_google_file(hashes_path)
+
+        try:
+            manifest = create_manifest(hashes_path, is_google_hashes)
+        except Exception as e:
+            print(f"Erro ao ler o arquivo de hashes {hashes_path.name}: {e}")
+            return False
+
+        self.manifest = manifest
+        self.manifest_state = state
+        self.default_hash_func = "SHA512" if is_google_hashes else "SHA256"
+
+        print(f"Arquivo de hashes carregado: {hashes_path.name} ({len(manifest)})")
+
+        # arquivos lidos antes do manifesto podem precisar de outro algoritmo
+        for file, (_, result) in list(self.results.items()):
+            if not set(self.hash_funcs(file)) <= set(result["digests"]):
+                del self.results[file]
+
+        return True
+
+    def hash_funcs(self, file: Path):
+        return hash_funcs_for_file(file, self.manifest, self.default_hash_func)
+
+    def ready_files(self, files: list[EvidenceFile]):
+        ready: list[EvidenceFile] = []
+
+        for file in files:
+            state: FileState = (file.size, file.mtime_ns)
+
+            done = self.results.get(file.path)
+            if done and done[0] == state:
+                continue
+
+            previous = self.observed.get(file.path)
+            stable_polls = previous[1] + 1 if previous and previous[0] == state else 0
+            self.observed[file.path] = (state, stable_polls)
+
+            if stable_polls >= STABLE_POLLS and not download_in_progress(file.path):
+                ready.append(file)
+
+        return ready
+
+    def hash_batch(self, files: list[EvidenceFile]):
+        jobs: list[HashJob] = [
+            {
+                "file": file.path,
+                "hash_funcs": self.hash_funcs(file.path),
+                "size": file.size,
+                "inode": file.inode,
+            }
+            for file in files
+        ]
+        states = {file.path: (file.size, file.mtime_ns) for file in files}
+
+        progress = ProgressTracker(
+            total_bytes=sum(job["size"] for job in jobs),
+            files_total=len(jobs),
+            listeners=self.progress_listeners,
+        )
+
+        engine = HashEngine(
+            mode=self.mode,
+            max_workers=self.max_workers,
+            force_rehash=self.force_rehash,
+            progress=progress,
+            schedule=self.schedule,
+            chunk_size=self.chunk_size,
+            drop_cache=self.drop_cache,
+            max_mbps=self.max_mbps,
+        )
+
+        progress.run_started()
+
+        try:
+            for result in engine.run(jobs):
+                self.results[result["file"]] = (states[result["file"]], result)
+
+                report = process_file(result, self.manifest, self.default_hash_func)
+                print(report["text"])
+        finally:
+            progress.run_finished()
+
+    def save_report(self):
+        # gravado uma única vez: regravar o relatório inteiro a cada lote
+        # custaria O(N²) em uma sessão longa
+        files = natsorted(self.results, key=str)
+
+        reporter = Reporter(
+            hashes_count=len(self.manifest),
+            files=files,
+            formats=self.report_formats,
+            volume_size=self.volume_size,
+            pdf_layout="table",
+        )
+        reporter.run_info["Modo de execução"] = f"{self.mode}, acompanhando downloads"
+        if self.max_mbps:
+            reporter.run_info["Limite de leitura"] = f"{self.max_mbps:g} MB/s"
+
+        for file in files:
+            result = self.results[file][1]
+            report = process_file(result, self.manifest, self.default_hash_func)
+            reporter.add_report_to_pdf(report)
+
+        reporter.save_reports(self.root_path)
+
+        return reporter
+
+    def all_verified(self, incomplete_downloads: list[Path]):
+        if not len(self.manifest) or incomplete_downloads:
+            return False
+
+        verified_names = {Manifest.normalize_name(file.name) for file in self.results}
+
+        return all(
+            Manifest.normalize_name(entry.name) in verified_names
+            for entry in self.manifest
+        )
+
+    def run(
+        self,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        idle_minutes: float | None = DEFAULT_IDLE_MINUTES,
+    ):
+        last_change = time.monotonic()
+
+        print(f"\nAcompanhando {self.root_path} (Ctrl+C para encerrar)\n")
+
+        try:
+            while True:
+                tree = walk_evidence_tree(self.root_path)
+                changed = self.reload_manifest(tree["hashes_path"])
+
+                ready = self.ready_files(tree["files"])
+                if ready:
+                    self.hash_batch(ready)
+                    changed = True
+
+                if changed:
+                    last_change = time.monotonic()
+                    print(f"Arquivos verificados até agora: {len(self.results)}\n")
+
+                incomplete_downloads = find_incomplete_downloads(self.root_path)
+
+                if self.all_verified(incomplete_downloads):
+                    print("Todos os arquivos do arquivo de hashes foram verificados")
+                    break
+
+                idle_seconds = time.monotonic() - last_change
+                if idle_minutes is not None and idle_seconds >= idle_minutes * 60:
+                    print(f"Nenhum arquivo novo em {idle_minutes:g} minutos")
+                    break
+
+                time.sleep(poll_seconds)
+        except KeyboardInterrupt:
+            print("\nAcompanhamento interrompido")
+
+        reporter = self.save_report()
+
+        return {"verified": len(self.results), "collisions": reporter.collisions}
+
+
+def watch_hashes(
+    files_folder_path: str,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    progress_listeners: list[ProgressListener] | None = None,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+    idle_minutes: float | None = DEFAULT_IDLE_MINUTES,
+    report_formats: tuple[ReportFormat, ...] = ("pdf",),
+    volume_size: int = DEFAULT_VOLUME_SIZE,
+    force_rehash: bool = False,
+    schedule: SchedulePolicy = "smallest_first",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    drop_cache: bool = False,
+    max_mbps: float | None = None,
+):
+    path = Path(files_folder_path)
+    if not path.exists():
+        msg = "o caminho da pasta de arquivos não existe"
+        print(msg)
+        return {"error": msg}
+
+    watcher = DownloadWatcher(
+        path.resolve(),
+        mode=mode,
+        max_workers=max_workers,
+        progress_listeners=progress_listeners,
+        chunk_size=chunk_size,
+        report_formats=report_formats,
+        volume_size=volume_size,
+        force_rehash=force_rehash,
+        schedule=schedule,
+        drop_cache=drop_cache,
+        max_mbps=max_mbps,
+    )
+
+    return watcher.run(poll_seconds, idle_minutes)
@@ -0,0 +1,295 @@
+import csv
+import itertools
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Literal
+from scripts.hash_report_tools import HASH_FUNC_BY_LENGTH, HashFunc
+
+ManifestFormat = Literal["txt", "csv", "google", "sha256sum"]
+
+ManifestRow = tuple[str, str, int | None]
+
+GOOGLE_FOOTER = (
+    "GoogleLLC1600AmphitheatreParkwMountainView,California94043www.google.com"
+)
+
+hex_hash = r"[0-9a-fA-F]{128}|[0-9a-fA-F]{64}|[0-9a-fA-F]{40}|[0-9a-fA-F]{32}"
+
+hex_hash_pattern = re.compile(hex_hash)
+
+# nome:hash (modelo gerado pela aba 3)
+txt_line_pattern = re.compile(rf"^(?P<name>[^:]*):.*?\b(?P<hash>{hex_hash})\b")
+
+# sha256sum / sha512sum: "<hash>  nome" ou "<hash> *nome"
+sum_line_pattern = re.compile(rf"^\\?(?P<hash>{hex_hash})\s[ *](?P<name>.+)$")
+
+# formato BSD: "SHA256 (nome) = <hash>"
+bsd_line_pattern = re.compile(
+    rf"^\w+\s?\((?P<name>.+)\)\s?=\s?(?P<hash>{hex_hash})$"
+)
+
+# texto extraído do PDF do Google, já sem espaços e quebras de linha
+google_entry_pattern = re.compile(r"^(?P<name>[^:]*):.*?(?P<hash>[0-9a-fA-F]{128})")
+
+CSV_NAME_KEYWORDS = ("name", "nome", "arquivo", "file")
+CSV_HASH_KEYWORDS = ("hash", "sha", "md5", "digest")
+CSV_SIZE_KEYWORDS = ("size", "tamanho", "bytes")
+
+# unidades no cabeçalho que indicam que a coluna de tamanho não está em bytes
+csv_size_unit_pattern = re.compile(r"(?<![a-z])[kmgt]i?b(?![a-z])|kilo|mega|giga|tera")
+
+MAX_GOOGLE_BUFFER = 1024 * 64
+
+# posições das colunas do nome e da hash no CSV do Google
+CSV_DEFAULT_NAME_COLUMN = 1
+CSV_DEFAULT_HASH_COLUMN = 5
+
+
+class ManifestEntry:
+    __slots__ = ("name", "digest", "size")
+
+    def __init__(self, name: str, digest: bytes, size: int | None = None):
+        self.name = name
+        self.digest = digest
+        self.size = size
+
+    @property
+    def hexdigest(self):
+        return self.digest.hex()
+
+    @property
+    def hash_func(self) -> HashFunc | None:
+        return HASH_FUNC_BY_LENGTH.get(len(self.digest) * 2)
+
+    def matches(self, generated_hash: str | None):
+        if not generated_hash:
+            return False
+
+        try:
+            return bytes.fromhex(generated_hash) == self.digest
+        except ValueError:
+            return False
+
+
+class Manifest:
+    """
+    Índice das hashes originais por nome normalizado (sem espaços), com as
+    hashes guardadas em bytes. Maiúsculas são diferenciadas: "A.zip" e
+    "a.zip" podem ser evidências distintas.
+    """
+
+    def __init__(self, format: ManifestFormat = "txt"):
+        self.format: ManifestFormat = format
+        self.entries: dict[str, ManifestEntry] = {}
+
+    @staticmethod
+    def normalize_name(name: str):
+        return name.replace(" ", "").strip()
+
+    def add(self, name: str, hexdigest: str, size: int | None = None):
+        try:
+            digest = bytes.fromhex(hexdigest)
+        except ValueError:
+            return
+
+        key = Manifest.normalize_name(name)
+        if key:
+            self.entries[key] = ManifestEntry(name.strip(), digest, size)
+
+    def get(self, name: str) -> ManifestEntry | None:
+        return self.entries.get(Manifest.normalize_name(name))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        return iter(self.entries.values())
+
+    @classmethod
+    def from_file(cls, path: Path, format: ManifestFormat | None = None):
+        format = format or detect_manifest_format(path)
+        manifest = cls(format)
+
+        for name, hexdigest, size in PARSERS[format](path):
+            manifest.add(name, hexdigest, size)
+
+        return manifest
+
+
+def detect_manifest_format(path: Path) -> ManifestFormat:
+    name = path.name.lower()
+
+    if name.endswith(".csv"):
+        return "csv"
+
+    if name.endswith((".sha256", ".sha512", ".sha1", ".md5")):
+        return "sha256sum"
+
+    return "txt"
+
+
+def parse_sum_line(line: str, keep_path: bool = False) -> ManifestRow | None:
+    line = line.rstrip("\r\n")
+
+    match = sum_line_pattern.match(line) or bsd_line_pattern.match(line)
+    if not match:
+        return None
+
+    name = match.group("name")
+    # sha256sum escapa nomes com barra invertida ou quebra de linha
+    if line.startswith("\\"):
+        name = name.replace("\\\\", "\\").replace("\\n", "\n")
+
+    if not keep_path:
+        name = Path(name).name
+
+    return name, match.group("hash"), None
+
+
+def parse_txt(path: Path) -> Iterator[ManifestRow]:
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            match = txt_line_pattern.match(line)
+
+            if match:
+                yield match.group("name"), match.group("hash"), None
+            elif row := parse_sum_line(line):
+                yield row
+
+
+def parse_sum_file(path: Path) -> Iterator[ManifestRow]:
+    with open(path, "r", encoding="utf-8") as file:
+        yield from parse_sum_lines(file)
+
+
+def parse_sum_lines(lines, keep_path: bool = False) -> Iterator[ManifestRow]:
+    for line in lines:
+        if row := parse_sum_line(line, keep_path):
+            yield row
+
+
+def find_columns(header: list[str], keywords: tuple[str, ...]):
+    return [
+        index
+        for index, column in enumerate(header)
+        if any(keyword in column.strip().lower() for keyword in keywords)
+    ]
+
+
+def find_hash_column(header: list[str], first_row: list[str]):
+    # a coluna com "hash" no cabeçalho pode ser só o nome do algoritmo, então
+    # vale a primeira cujo valor na primeira linha seja de fato uma hash
+    candidates = find_columns(header, CSV_HASH_KEYWORDS)
+    candidates += range(len(first_row))
+
+    for index in candidates:
+        value = first_row[index].strip() if index < len(first_row) else ""
+        if hex_hash_pattern.fullmatch(value):
+            return index
+
+    return CSV_DEFAULT_HASH_COLUMN
+
+
+def find_size_column(header: list[str], excluded: tuple[int, ...]):
+    # "Size (MB)" com 1.5 não pode virar 15 bytes: só colunas em bytes valem
+    for index in find_columns(header, CSV_SIZE_KEYWORDS):
+        column = header[index].strip().lower()
+
+        if index not in excluded and not csv_size_unit_pattern.search(column):
+            return index
+
+    return None
+
+
+def parse_size(value: str):
+    # apenas a quantidade de bytes como inteiro, sem separadores ou decimais
+    size = value.strip()
+    return int(size) if size.isascii() and size.isdigit() else None
+
+
+def is_google_csv(first_row: list[str]):
+    if len(first_row) <= CSV_DEFAULT_HASH_COLUMN:
+        return False
+
+    return bool(hex_hash_pattern.fullmatch(first_row[CSV_DEFAULT_HASH_COLUMN].strip()))
+
+
+def find_csv_columns(header: list[str], first_row: list[str]):
+    # o CSV do Google mantém as posições fixas; os nomes do cabeçalho só
+    # identificam as colunas de outros CSVs
+    if is_google_csv(first_row):
+        hash_column = CSV_DEFAULT_HASH_COLUMN
+        name_column = CSV_DEFAULT_NAME_COLUMN
+        size_column = find_size_column(header, (hash_column, name_column))
+
+        return name_column, hash_column, size_column
+
+    hash_column = find_hash_column(header, first_row)
+
+    size_column = find_size_column(header, (hash_column,))
+
+    # "file size" não pode ser tomado como a coluna do nome
+    name_column = next(
+        (
+            index
+            for index in find_columns(header, CSV_NAME_KEYWORDS)
+            if index not in (hash_column, size_column)
+        ),
+        CSV_DEFAULT_NAME_COLUMN,
+    )
+
+    return name_column, hash_column, size_column
+
+
+def parse_csv(path: Path) -> Iterator[ManifestRow]:
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        csv_reader = csv.reader(file)
+        header = next(csv_reader, [])
+        first_row = next(csv_reader, None)
+
+        if first_row is None:
+            return
+
+        name_column, hash_column, size_column = find_csv_columns(header, first_row)
+
+        for row in itertools.chain([first_row], csv_reader):
+            if len(row) <= max(hash_column, name_column):
+                continue
+
+            size = None
+            if size_column is not None and size_column < len(row):
+                size = parse_size(row[size_column])
+
+            yield row[name_column], row[hash_column].strip(), size
+
+
+def parse_google_text(path: Path) -> Iterator[ManifestRow]:
+    with open(path, "r", encoding="utf-8") as file:
+        yield from parse_google_lines(file)
+
+
+def parse_google_lines(lines: Iterable[str]) -> Iterator[ManifestRow]:
+    # o texto do PDF quebra nomes e hashes em várias linhas, então as entradas
+    # são montadas em um buffer que só guarda o trecho ainda não reconhecido.
+    # Mudanças aqui exigem incrementar PARSER_VERSION do google_pdf_reader
+    buffer = ""
+
+    for line in lines:
+        buffer += line.replace("\n", "").replace(" ", "")
+        buffer = buffer.replace("SHA512-", "").replace(GOOGLE_FOOTER, "")
+
+        while match := google_entry_pattern.match(buffer):
+            yield match.group("name"), match.group("hash"), None
+            buffer = buffer[match.end() :]
+
+        # texto sem nenhuma hash não deve crescer indefinidamente
+        if len(buffer) > MAX_GOOGLE_BUFFER:
+            buffer = buffer[-1024:]
+
+
+PARSERS = {
+    "txt": parse_txt,
+    "csv": parse_csv,
+    "google": parse_google_text,
+    "sha256sum": parse_sum_file,
+}
@@ -5,10 +5,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions
 import time
 import sys
+import argparse
 from selenium.common.exceptions import NoSuchElementException
 import pathlib
 from typing import TypedDict, Literal
 from scripts.zip_tools import recursive_unzip_files
+from scripts.digest_index import disable_digest_index, get_digest_index, index_files
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
@@ -42,6 +44,7 @@ FileType = Literal["log", "bilhetagem"]
 class FileItem(TypedDict):
     path: str
     type: FileType
+    digest: str | None
 
 
 class DriverResult(TypedDict):
@@ -161,6 +164,10 @@ def process_file(args: tuple[int, FileItem, str, int]):
 
             print(f"📄 Enviando arquivo {idx}/{total}: {file}📄")
 
+            # o resultado do Peron é baixado na pasta do próprio arquivo
+            folder = pathlib.Path(file).resolve().parent
+            before = downloaded_files(folder)
+
             print(file)
 
             # CLICA NA ABA "Carregar arquivo"
@@ -204,6 +211,12 @@ def process_file(args: tuple[int, FileItem, str, int]):
                 time.sleep(wait_time)
 
             print("🎉 Todos os arquivos foram processados.")
+
+            # a etapa só é registrada quando um download terminou na pasta
+            downloads = downloaded_files(folder) - before
+            digest_index = get_digest_index()
+            if digest_index and file_info.get("digest") and downloads:
+                digest_index.mark_stage(file_info["digest"], "peron", folder)
         except NoSuchElementException as e:
             print("ERRO_COOKIE_INVALIDO")
             sys.exit(2)
@@ -215,6 +228,12 @@ def process_file(args: tuple[int, FileItem, str, int]):
                 driver.quit()
 
 
+def downloaded_files(folder: pathlib.Path):
+    return {
+        item.name for item in folder.iterdir() if not item.name.endswith(".crdownload")
+    }
+
+
 def process_all_files(files: list[FileItem], cookie: str):
     # LOOP PARA ENVIAR CADA ARQUIVO
 
@@ -282,7 +301,7 @@ def create_files_list(root_path: str):
                 ):
                     continue
 
-                files.append({"path": file_path, "type": file_type})
+                files.append({"path": file_path, "type": file_type, "digest": None})
 
         return files
     except Exception as e:
@@ -290,8 +309,40 @@ def create_files_list(root_path: str):
         return files
 
 
+def skip_duplicate_files(files: list[FileItem]):
+    # bilhetagens idênticas já enviadas a partir de outra pasta não são reenviadas
+    digests = index_files([pathlib.Path(file["path"]) for file in files])
+    digest_index = get_digest_index()
+
+    pending: list[FileItem] = []
+    seen_digests: set[str] = set()
+
+    for file in files:
+        digest = digests.get(pathlib.Path(file["path"]))
+        file["digest"] = digest
+
+        if digest in seen_digests:
+            print(f"{file['path']} é idêntico a outro arquivo desta pasta")
+            continue
+
+        if digest:
+            seen_digests.add(digest)
+
+        if digest_index and digest:
+            previous = digest_index.previous_output(
+                digest, "peron", pathlib.Path(file["path"]).resolve().parent
+            )
+            if previous:
+                print(f"{file['path']} é idêntico ao já enviado em {previous}")
+                continue
+
+        pending.append(file)
+
+    return pending
+
+
 def process_files_peron(cur_path: str):
-    files = create_files_list(cur_path)
+    files = skip_duplicate_files(create_files_list(cur_path))
 
     print(f"Processando {len(files)} arquivos")
 
@@ -301,17 +352,21 @@ def process_files_peron(cur_path: str):
 
 
 if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) != 2:
-        print(
-            "Use: python script.py <root_folder_path>\nor\nUse: python script.py <root_folder_path>"
-        )
-        sys.exit(1)
-
-    cur_path = sys.argv[1]
-
-    process_files_peron(cur_path)
+    parser = argparse.ArgumentParser(
+        description="Envia as bilhetagens da pasta para o Peron"
+    )
+    parser.add_argument("pasta", type=str, help="Pasta raiz com os arquivos .txt")
+    parser.add_argument(
+        "--sem-indice",
+        action="store_true",
+        help="Não consulta nem atualiza o índice de arquivos idênticos entre casos",
+    )
+    args = parser.parse_args()
+
+    if args.sem_indice:
+        disable_digest_index()
+
+    process_files_peron(args.pasta)
 
     # if len(sys.argv) == 3:
     #     cookie = sys.argv[2]
@@ -1,12 +1,26 @@
 import re
-from bs4 import BeautifulSoup
+import os
 import argparse
+import itertools
+import tempfile
 import zipfile
 import time
 import shutil
-from typing import TypedDict
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import IO, TypedDict
 from pathlib import Path
-from scripts.zip_tools import recursive_delete_zips
+from scripts.zip_tools import (
+    extraction_complete,
+    print_zip_test_errors,
+    recursive_delete_zips,
+    test_zip_files,
+)
+from scripts.digest_index import (
+    disable_digest_index,
+    get_digest_index,
+    index_files,
+)
 
 
 class FolderRenameItem(TypedDict):
@@ -23,164 +37,305 @@ class FullFileName(TypedDict):
     date_hour: str
 
 
-folders_to_rename: dict[str, FolderRenameItem] = {}
+class ConversionResult(TypedDict):
+    # pastas extraídas a renomear no fim, na ordem em que foram convertidas
+    folders_to_rename: dict[str, FolderRenameItem]
+    # zips não extraídos por serem cópias de outro já extraído: não são apagados
+    duplicate_zips: set[str]
+    # zips com CRC conferido e extraídos por completo: os únicos apagados
+    extracted_zips: set[str]
+    # pasta de cada extração -> hash do zip, para o índice entre casos
+    extractions: dict[str, str]
+    # (pasta, subpasta) na ordem em que o conteúdo de uma pasta foi movido
+    # para a subpasta do registro convertido
+    moved_contents: list[tuple[str, str]]
 
 
-def process_html_file(file_path: Path):
-    # Ler conteúdo do HTML
-    html_content = ""
-    with open(file_path, "r", encoding="utf-8") as f:
-        html_content = f.read()
-
-    isMeta = False
-    is_whats = False
-
-    # Extrair data do campo "Generated"
-    date_pattern = r">(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) UTC<"
-    match = re.search(date_pattern, html_content)
-
-    if not match:
-        print("Data após 'Generated' não encontrada.")
-        exit()
-
-    date_hour = match.group(1)
-
-    # Extrair texto puro
-    soup = BeautifulSoup(html_content, "html.parser")
-    pure_text = soup.get_text(separator="\n", strip=True)
-
-    # Separar linhas e limpar
-    lines = [
-        line.strip()
-        for line in pure_text.splitlines()
-        if line.strip() and not line.startswith("WhatsApp Business Record Page")
-    ]
-
-    # Separar linhas e limpar
-    lines = [
-        line.strip()
-        for line in lines
-        if line.strip() and not line.startswith("Meta Platforms Business Record")
-    ]
-
-    # Encontrar início em "Service"
-    start = next((i for i, line in enumerate(lines) if line == "Service"), None)
-    if start is None:
-        print("Cabeçalho 'Service' não encontrado.")
-        exit()
-
-    lines = lines[start:]
-
-    is_whats = "WhatsApp" in lines[1]
-    isMeta = "Facebook" in lines[1] or "Instagram" in lines[1]
-
-    # Cabeçalhos que ficam sempre sozinhos
-    solo_headers = {"Message Log", "Message", "Call Log", "Call", "Events"}
-
-    # Campos especiais que SEMPRE devem juntar próxima linha
-    upper_letter_fields = {
-        "Service",
-        "Account Type",
-        "First Name",
-        "First",
-        "Last",
-        "Full Name",
-        "IP Address",
-        "Location",
-        "Enabled",
-        "Phone Type",
-        "Alternate Name",
-        "Middle Name",
-        "Last Name",
-        "Type",
-        "Alternate Name Type",
-        "Card Type",
-        "Payment Credential ID",
-        "Country",
-        "Zip",
-        "State",
-        "City",
-        "Street2",
-        "Last Street",
-        "First Middle",
+def new_conversion_result() -> ConversionResult:
+    return {
+        "folders_to_rename": {},
+        "duplicate_zips": set(),
+        "extracted_zips": set(),
+        "extractions": {},
+        "moved_contents": [],
     }
 
-    # Regex para detectar hashes ou IDs hexadecimais longos
-    regex_hash = re.compile(r"^[A-F0-9]{6,}$")
 
-    # Função para saber se é hash
-    def is_hash(line):
-        return bool(regex_hash.match(line))
+def merge_conversion_result(target: ConversionResult, source: ConversionResult):
+    # update mantém a posição das chaves repetidas, como na execução serial
+    target["folders_to_rename"].update(source["folders_to_rename"])
+    target["duplicate_zips"] |= source["duplicate_zips"]
+    target["extracted_zips"] |= source["extracted_zips"]
+    target["extractions"].update(source["extractions"])
+    target["moved_contents"] += source["moved_contents"]
+
+
+# Cabeçalhos que ficam sempre sozinhos
+solo_headers = {"Message Log", "Message", "Call Log", "Call", "Events"}
+
+# Campos especiais que SEMPRE devem juntar próxima linha
+upper_letter_fields = {
+    "Service",
+    "Account Type",
+    "First Name",
+    "First",
+    "Last",
+    "Full Name",
+    "IP Address",
+    "Location",
+    "Enabled",
+    "Phone Type",
+    "Alternate Name",
+    "Middle Name",
+    "Last Name",
+    "Type",
+    "Alternate Name Type",
+    "Card Type",
+    "Payment Credential ID",
+    "Country",
+    "Zip",
+    "State",
+    "City",
+    "Street2",
+    "Last Street",
+    "First Middle",
+}
+
+# Regex para detectar hashes ou IDs hexadecimais longos
+regex_hash = re.compile(r"^[A-F0-9]{6,}$")
+
+# data do campo "Generated", sozinha entre duas tags
+date_pattern = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) UTC")
+
+# cabeçalhos repetidos em todas as páginas do registro
+whatsapp_page_header = "WhatsApp Business Record Page"
+meta_page_header = "Meta Platforms Business Record"
+
+# conteúdo que o get_text do BeautifulSoup não inclui
+non_text_tags = {"script", "style", "template"}
+
+html_read_size = 1024 * 1024
+
+
+class RecordTextParser(HTMLParser):
+    """
+    Extrai as linhas de texto do HTML à medida que ele é lido, na mesma
+    sequência do get_text(separator="\n", strip=True) do BeautifulSoup,
+    sem montar a árvore do documento.
+    """
 
-    # Resultado final
-    resultLines = []
-    i = 0
-    while i < len(lines):
-        current = lines[i]
-        nextLine = lines[i + 1] if i + 1 < len(lines) else None
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[str] = []
+        self.text_parts: list[str] = []
+        self.non_text_depth = 0
+        self.date_hour: str | None = None
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        if tag in non_text_tags:
+            self.non_text_depth += 1
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        if tag in non_text_tags and self.non_text_depth:
+            self.non_text_depth -= 1
+
+    def handle_data(self, data):
+        # o mesmo texto pode chegar em pedaços entre uma leitura e outra
+        self.text_parts.append(data)
+
+    def handle_comment(self, data):
+        self.flush_text()
+
+    def handle_decl(self, decl):
+        self.flush_text()
+
+    def unknown_decl(self, data):
+        # o BeautifulSoup mantém o conteúdo de CDATA como um texto separado
+        self.flush_text()
+        if data.upper().startswith("CDATA["):
+            self.text_parts.append(data[len("CDATA[") :])
+            self.flush_text()
+
+    def handle_pi(self, data):
+        self.flush_text()
+
+    def close(self):
+        super().close()
+        self.flush_text()
+
+    def flush_text(self):
+        if not self.text_parts:
+            return
+
+        text = "".join(self.text_parts)
+        self.text_parts = []
+
+        if self.non_text_depth:
+            return
+
+        if self.date_hour is None:
+            match = date_pattern.fullmatch(text)
+            if match:
+                self.date_hour = match.group(1)
+
+        # o cabeçalho do WhatsApp é comparado antes do strip, como no
+        # processamento original sobre o texto do get_text
+        for raw_line in text.strip().splitlines():
+            line = raw_line.strip()
+            if (
+                line
+                and not raw_line.startswith(whatsapp_page_header)
+                and not line.startswith(meta_page_header)
+            ):
+                self.lines.append(line)
+
+    def take_lines(self):
+        lines = self.lines
+        self.lines = []
+        return lines
+
+
+class RecordLineMerger:
+    """Junta cada campo com o valor da linha seguinte, gravando aos poucos."""
+
+    def __init__(self, output: IO[str]):
+        self.output = output
+        self.pending: str | None = None
+        self.first_line = True
+        self.has_message_log = False
+
+    def emit(self, line: str):
+        if "Message Log" in line:
+            self.has_message_log = True
+
+        self.output.write(line if self.first_line else "\n" + line)
+        self.first_line = False
+
+    def add(self, next_line: str):
+        current = self.pending
+        self.pending = next_line
+
+        if current is None:
+            return
 
         if current in solo_headers:
-            resultLines.append(current)
-            i += 1
+            self.emit(current)
         elif current in upper_letter_fields:
             # Sempre junta próxima linha, mesmo maiúscula
-            if nextLine and nextLine not in upper_letter_fields:
-                resultLines.append(f"{current} {nextLine}")
-                i += 2
+            if next_line not in upper_letter_fields:
+                self.emit(f"{current} {next_line}")
+                self.pending = None
             else:
-                resultLines.append(current)
-                i += 1
+                self.emit(current)
+        # Se a próxima linha é um hash, ou começa minúscula ou dígito, junta
+        elif (
+            regex_hash.match(next_line)
+            or next_line[0].islower()
+            or next_line[0].isdigit()
+            or next_line[0] in "+@"
+        ):
+            self.emit(f"{current} {next_line}")
+            self.pending = None
         else:
-            # Caso geral
-            if nextLine:
-                # Se a próxima linha é um hash, junta
-                if is_hash(nextLine):
-                    resultLines.append(f"{current} {nextLine}")
-                    i += 2
-                # Se próxima começa minúscula ou dígito, junta
-                elif (
-                    nextLine[0].islower()
-                    or nextLine[0].isdigit()
-                    or nextLine[0] in "+@"
-                ):
-                    resultLines.append(f"{current} {nextLine}")
-                    i += 2
-                else:
-                    # Próxima parece outro cabeçalho
-                    resultLines.append(current)
-                    i += 1
-            else:
-                resultLines.append(current)
-                i += 1
+            # Próxima parece outro cabeçalho
+            self.emit(current)
 
-    # Juntar e salvar
-    text_content = "\n".join(resultLines)
+    def finish(self):
+        if self.pending is not None:
+            self.emit(self.pending)
+            self.pending = None
 
-    file_info = generate_text_file_name(lines, file_path, date_hour)
 
-    save_converted_text_file(
-        html_file_path=file_path,
-        file_info=file_info,
-        text_content=text_content,
-        is_whats=is_whats,
+def process_html_file(file_path: Path):
+    parser = RecordTextParser()
+
+    # o texto convertido vai para um arquivo temporário: o nome final depende
+    # de campos que podem aparecer em qualquer parte do registro. Ele fica na
+    # pasta do HTML para que a mudança de nome final não copie o arquivo
+    # entre discos
+    output = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", suffix=".txt", delete=False, dir=file_path.parent
     )
+    output_path = Path(output.name)
+
+    merger = RecordLineMerger(output)
+    started = False
+    service = ""
+    account_identifier: str | None = None
+    previous_line: str | None = None
+
+    try:
+        with output, open(file_path, "r", encoding="utf-8") as file:
+            while True:
+                chunk = file.read(html_read_size)
+                if chunk:
+                    parser.feed(chunk)
+                else:
+                    parser.close()
+
+                for line in parser.take_lines():
+                    # Encontrar início em "Service"
+                    if not started:
+                        if line != "Service":
+                            continue
+                        started = True
+                    elif not service:
+                        service = line
+
+                    is_identifier = previous_line == "Account Identifier"
+                    if is_identifier and account_identifier is None:
+                        account_identifier = line
+
+                    previous_line = line
+                    merger.add(line)
+
+                if not chunk:
+                    break
+
+            merger.finish()
+
+        if not parser.date_hour:
+            print("Data após 'Generated' não encontrada.")
+            exit()
+
+        if not started:
+            print("Cabeçalho 'Service' não encontrado.")
+            exit()
+
+        is_whats = "WhatsApp" in service
+
+        file_info = generate_text_file_name(
+            service, account_identifier, file_path, parser.date_hour
+        )
+
+        return save_converted_text_file(
+            html_file_path=file_path,
+            file_info=file_info,
+            converted_file_path=output_path,
+            is_bilhetagem=merger.has_message_log,
+            is_whats=is_whats,
+        )
+    finally:
+        output_path.unlink(missing_ok=True)
 
 
 def generate_text_file_name(
-    lines: list[str], html_file_path: Path, date_hour: str
+    service: str,
+    account_identifier: str | None,
+    html_file_path: Path,
+    date_hour: str,
 ) -> FullFileName:
-    service = lines[1]
-
     original_name = html_file_path.stem
-    account_identifier = ""
 
-    try:
-        index = lines.index("Account Identifier")
-        account_identifier = lines[index + 1].replace("+55", "+55 ")
-        if account_identifier:
-            service += f" {account_identifier}"
-    except Exception as e:
-        print(f"Account identifier error: {e}")
+    if account_identifier is None:
+        print("Account identifier error: 'Account Identifier' não encontrado")
+        account_identifier = ""
+
+    account_identifier = account_identifier.replace("+55", "+55 ")
+    if account_identifier:
+        service += f" {account_identifier}"
 
     date_hour_formatted = date_hour.replace(":", "-").replace(" ", "_")
 
@@ -193,7 +348,9 @@ def generate_text_file_name(
     }
 
 
-def resolve_textfile_path(file_info: FullFileName, old_path: Path, is_whats: bool):
+def resolve_textfile_path(
+    file_info: FullFileName, old_path: Path, is_whats: bool, converted_file_path: Path
+):
     file_name = file_info.get("file_name")
 
     if is_whats:
@@ -206,9 +363,10 @@ def resolve_textfile_path(file_info: FullFileName, old_path: Path, is_whats: boo
         sub_folder = old_path.joinpath(f"{date_hour}-{old_path.name}")
         sub_folder.mkdir(exist_ok=True)
 
-        # copy files from original extracted folder to new sub_folder
+        # copy files from original extracted folder to new sub_folder; the
+        # converted text is still a temp file in this folder and is moved below
         for file in old_path.glob("*"):
-            if file.name != sub_folder.name:
+            if file.name not in (sub_folder.name, converted_file_path.name):
 
                 if file.is_dir():
                     shutil.copytree(file, sub_folder.joinpath(file.name))
@@ -226,11 +384,10 @@ def save_converted_text_file(
     *,
     html_file_path: Path,
     file_info: FullFileName,
-    text_content: str,
+    converted_file_path: Path,
+    is_bilhetagem: bool,
     is_whats: bool,
 ):
-    global folders_to_rename
-
     file_name = file_info.get("file_name")
     account_identifier = file_info.get("account_identifier")
 
@@ -241,9 +398,9 @@ def save_converted_text_file(
         old_path.joinpath("..").joinpath(account_identifier).resolve()
     )
 
-    is_bilhetagem = "Message Log" in text_content or "bilhetagem" in old_path_str
+    is_bilhetagem = is_bilhetagem or "bilhetagem" in old_path_str
 
-    folders_to_rename[old_path_str] = {
+    rename_item: FolderRenameItem = {
         "path": identifier_folder_name,
         "account_identifier": account_identifier,
         "is_whats": is_whats,
@@ -251,30 +408,85 @@ def save_converted_text_file(
         "is_bilhetagem": is_bilhetagem,
     }
 
-    text_file_path = resolve_textfile_path(file_info, old_path, is_whats)
+    text_file_path = resolve_textfile_path(
+        file_info, old_path, is_whats, converted_file_path
+    )
+
+    shutil.move(converted_file_path, text_file_path)
+    print(f"Salvo: {text_file_path}")
+
+    contents_folder = str(text_file_path.parent.resolve())
 
-    with open(text_file_path, "w", encoding="utf-8") as file:
-        file.write(text_content)
-        print(f"Salvo: {text_file_path}")
+    return old_path_str, rename_item, contents_folder
 
 
 def process_zip_files(*, root_path: Path):
+    result = new_conversion_result()
 
     directories: list[Path] = []
 
     try:
-        for file in root_path.iterdir():
-            is_zip = file.name.endswith(".zip")
+        zip_files = [file for file in root_path.iterdir() if file.name.endswith(".zip")]
+
+        # o mesmo zip recebido duas vezes (com outro nome ou em outro caso)
+        # é extraído e convertido só uma vez
+        digests = index_files(zip_files)
+        digest_index = get_digest_index()
 
-            if is_zip:
-                file_path = str(file.resolve())
-                destination_directory = file.parent.joinpath(file.stem)
-                destination_directory.mkdir(exist_ok=True)
+        files_to_extract: list[Path] = []
+
+        for file in zip_files:
+            file_path = str(file.resolve())
+            destination_directory = file.parent.joinpath(file.stem)
+            digest = digests.get(file)
+
+            if digest_index and digest:
+                previous = digest_index.previous_output(
+                    digest, "extraction", destination_directory
+                )
+                if previous:
+                    print(f"{file.name} é idêntico ao já extraído em {previous}")
+                    result["duplicate_zips"].add(file_path)
+                    continue
 
-                directories.append(destination_directory)
+            files_to_extract.append(file)
+
+        # CRC de todos os zips conferido em paralelo antes de extrair qualquer um
+        test_results = test_zip_files(
+            [str(file.resolve()) for file in files_to_extract]
+        )
+        print_zip_test_errors(test_results)
+
+        for file in files_to_extract:
+            file_path = str(file.resolve())
+            destination_directory = file.parent.joinpath(file.stem)
+            digest = digests.get(file)
+
+            if not test_results[file_path]["ok"]:
+                continue
+
+            destination_directory.mkdir(exist_ok=True)
+
+            directories.append(destination_directory)
+            try:
                 with zipfile.ZipFile(file_path, "r") as zip_ref:
 
                     zip_ref.extractall(destination_directory)
+            except Exception as e:
+                print(f"Unzip error: {e}")
+                continue
+
+            if not extraction_complete(file_path, destination_directory):
+                print(f"extração incompleta, zip mantido: {file.name}")
+                continue
+
+            result["extracted_zips"].add(file_path)
+
+            # registrada já aqui para os zips repetidos nesta mesma execução;
+            # o caminho final é gravado depois de renomear as pastas
+            if digest_index and digest:
+                digest_index.mark_stage(digest, "extraction", destination_directory)
+                result["extractions"][str(destination_directory.resolve())] = digest
 
         for dir in directories:
             while not dir.exists():
@@ -283,10 +495,55 @@ def process_zip_files(*, root_path: Path):
     except Exception as e:
         print(f"Unzip error: {e}")
 
+    return result
+
+
+def relocated_path(path: str, old_path: str, new_path: Path, contents_only=False):
+    if path == old_path and not contents_only:
+        return str(new_path)
+
+    prefix = old_path + os.sep
+    if path.startswith(prefix):
+        return str(new_path.joinpath(path[len(prefix) :]))
 
-def rename_folders():
+    return path
+
+
+def relocate_paths(
+    paths: set[str], old_path: str, new_path: Path, contents_only=False
+):
+    # zips dentro da pasta renomeada continuam reconhecidos pelo novo caminho
+    relocated = {
+        relocated_path(path, old_path, new_path, contents_only) for path in paths
+    }
+
+    paths.clear()
+    paths |= relocated
+
+
+def relocate_result(
+    result: ConversionResult, old_path: str, new_path: Path, contents_only=False
+):
+    relocate_paths(result["duplicate_zips"], old_path, new_path, contents_only)
+    relocate_paths(result["extracted_zips"], old_path, new_path, contents_only)
+
+    result["extractions"] = {
+        relocated_path(path, old_path, new_path, contents_only): digest
+        for path, digest in result["extractions"].items()
+    }
+
+
+def relocate_moved_contents(result: ConversionResult):
+    # a conversão move o conteúdo da pasta (a bilhetagem extraída, por
+    # exemplo) para a subpasta do registro; a própria pasta não muda de lugar
+    for folder, contents_folder in result["moved_contents"]:
+        relocate_result(result, folder, Path(contents_folder), contents_only=True)
+
+
+def rename_folders(result: ConversionResult):
     # renomeia os diretorios extraídos para o nome do identificador (email, telefone)
-    global folders_to_rename
+    folders_to_rename = result["folders_to_rename"]
+
     for old_path in folders_to_rename:
         try:
 
@@ -308,6 +565,8 @@ def rename_folders():
             else:
                 Path.rename(Path(old_path), new_path)
 
+            relocate_result(result, old_path, new_path)
+
             if is_whats and not is_bilhetagem:
                 bilhetagem_folder = new_path.joinpath("bilhetagem")
                 bilhetagem_folder.mkdir(exist_ok=True)
@@ -315,32 +574,98 @@ def rename_folders():
             print(f"Erro ao renomear diretórios: {e}")
 
 
-def process_html_folders_in_path(root_path: str, level=0):
-    root = Path(root_path)
+def record_extractions(result: ConversionResult):
+    # o índice aponta a pasta já renomeada, onde a extração de fato ficou
+    digest_index = get_digest_index()
+    if not digest_index:
+        return
 
-    # try to process zip files
-    if level == 0:
-        process_zip_files(root_path=root)
+    for path, digest in result["extractions"].items():
+        digest_index.mark_stage(digest, "extraction", Path(path))
+
+
+def is_bilhetagem_trigger(sub_item: Path, level: int):
+    return "bilhetagem" in str(sub_item.resolve()) and level == 0
+
+
+def extract_bilhetagem_zips(item: Path):
+    # extração em série e na ordem das pastas: o índice de hashes decide os
+    # zips repetidos entre alvos da mesma forma que a execução serial
+    result = new_conversion_result()
 
+    for sub_item in item.iterdir():
+        if is_bilhetagem_trigger(sub_item, level=0):
+            bilhetagem_path = item.joinpath("bilhetagem")
+            merge_conversion_result(
+                result, process_zip_files(root_path=bilhetagem_path)
+            )
+
+    return result
+
+
+def convert_html_folder(item: Path, level: int):
+    """
+    Converte os .html de uma subpasta (e da bilhetagem dentro dela). Executada
+    em um processo separado para cada alvo, sem alterar estado do módulo.
+    """
+    result = new_conversion_result()
+
+    # Para cada subpasta, listar arquivos .html
+    for sub_item in item.iterdir():
+        if "preservation" not in sub_item.name and sub_item.name.endswith(".html"):
+            old_path, rename_item, contents_folder = process_html_file(
+                sub_item.resolve()
+            )
+            result["folders_to_rename"][old_path] = rename_item
+            if contents_folder != old_path:
+                result["moved_contents"].append((old_path, contents_folder))
+        if is_bilhetagem_trigger(sub_item, level):
+            bilhetagem_path = item.joinpath("bilhetagem")
+            merge_conversion_result(
+                result, process_html_folders_in_path(bilhetagem_path, level=1)
+            )
+
+    return result
+
+
+def process_html_folders_in_path(
+    root_path: str | Path, level=0, max_workers: int | None = None
+):
     """
     Procura arquivos .html em subpastas 1 nível abaixo de raiz
-    e executa salvar_html_como_txt para cada um.
+    e converte cada um para texto, uma subpasta por processo.
     """
-    for item in root.iterdir():
-        if item.is_dir():
-            # Para cada subpasta, listar arquivos .html
-            for sub_item in item.iterdir():
-                if "preservation" not in sub_item.name and sub_item.name.endswith(
-                    ".html"
-                ):
-                    process_html_file(sub_item.resolve())
-                if "bilhetagem" in str(sub_item.resolve()) and level == 0:
-                    bilhetagem_path = item.joinpath("bilhetagem")
-                    process_zip_files(root_path=bilhetagem_path)
-                    process_html_folders_in_path(bilhetagem_path, level=1)
+    root = Path(root_path)
+    result = new_conversion_result()
+
+    # try to process zip files
+    if level == 0:
+        merge_conversion_result(result, process_zip_files(root_path=root))
+
+    folders = [item for item in root.iterdir() if item.is_dir()]
 
     if level == 0:
-        rename_folders()
+        for item in folders:
+            merge_conversion_result(result, extract_bilhetagem_zips(item))
+
+    if level == 0 and len(folders) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            folder_results = list(
+                executor.map(convert_html_folder, folders, itertools.repeat(level))
+            )
+    else:
+        folder_results = [convert_html_folder(item, level) for item in folders]
+
+    # resultados juntados na ordem das pastas, como na execução serial
+    for folder_result in folder_results:
+        merge_conversion_result(result, folder_result)
+
+    if level == 0:
+        relocate_moved_contents(result)
+        rename_folders(result)
+        record_extractions(result)
+
+    return result
 
 
 def get_arguments():
@@ -351,16 +676,31 @@ def get_arguments():
         required=True,
         help="Pasta raiz contendo subpastas com arquivos html",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade máxima de processos (padrão: quantidade de núcleos)",
+    )
+    parser.add_argument(
+        "--sem-indice",
+        action="store_true",
+        help="Não consulta nem atualiza o índice de arquivos idênticos entre casos",
+    )
 
     args = parser.parse_args()
 
     return args
 
 
-def process_html_logs_extractions_to_text(root_path: str):
-    process_html_folders_in_path(root_path)
+def process_html_logs_extractions_to_text(
+    root_path: str, max_workers: int | None = None
+):
+    result = process_html_folders_in_path(root_path, max_workers=max_workers)
 
-    recursive_delete_zips(root_path)
+    recursive_delete_zips(
+        root_path, keep=result["duplicate_zips"], verified=result["extracted_zips"]
+    )
 
 
 if __name__ == "__main__":
@@ -368,4 +708,7 @@ if __name__ == "__main__":
 
     root_path: str = args.pasta_raiz
 
-    process_html_logs_extractions_to_text(root_path)
+    if args.sem_indice:
+        disable_digest_index()
+
+    process_html_logs_extractions_to_text(root_path, max_workers=args.workers)
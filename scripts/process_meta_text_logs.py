@@ -7,6 +7,11 @@ from scripts.process_html_logs_extractions_to_text import (
 from scripts.ip_api import get_ips_info, AccessLog, UserAcessLogs
 from scripts.create_logs_sheet import create_logs_sheet
 from scripts.ip_tools import extract_ip_port
+from scripts.digest_index import (
+    disable_digest_index,
+    get_digest_index,
+    index_files,
+)
 
 
 BILHETAGEM_KEYWORDS = ["Message Log", "Call Log", "Call Logs"]
@@ -109,7 +114,7 @@ def process_logfile(file: str):
     #     ips_results: dict[str, InfoIP_API] = json.load(fj)
     path = Path(file).parent
 
-    create_logs_sheet(path=path, user_logs=user_logs, ips_results=ips_results)
+    return create_logs_sheet(path=path, user_logs=user_logs, ips_results=ips_results)
 
 
 def is_file_empty(file_path):
@@ -182,8 +187,24 @@ def process_meta_text_logs(root_path: str):
 
     print(f"Processando {len(files)} arquivos")
 
+    digests = index_files([Path(file) for file in files])
+    digest_index = get_digest_index()
+
     for file in files:
-        process_logfile(file)
+        digest = digests.get(Path(file))
+
+        # a planilha fica na pasta do log: só conta uma planilha de outra pasta
+        if digest_index and digest:
+            folder = Path(file).parent
+            previous = digest_index.previous_output(digest, "meta_logs", folder)
+            if previous:
+                print(f"{file} é idêntico ao já processado em {previous}")
+                continue
+
+        sheet_path = process_logfile(file)
+
+        if digest_index and digest and sheet_path:
+            digest_index.mark_stage(digest, "meta_logs", sheet_path)
 
 
 def get_arguments():
@@ -194,6 +215,11 @@ def get_arguments():
         required=True,
         help="Pasta raiz contendo subpastas com arquivos html",
     )
+    parser.add_argument(
+        "--sem-indice",
+        action="store_true",
+        help="Não consulta nem atualiza o índice de arquivos idênticos entre casos",
+    )
 
     args = parser.parse_args()
 
@@ -206,4 +232,7 @@ if __name__ == "__main__":
 
     root_path: str = args.pasta_raiz
 
+    if args.sem_indice:
+        disable_digest_index()
+
     process_meta_text_logs(root_path)
@@ -0,0 +1,349 @@
+import csv
+import html
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Iterable, Literal
+from fpdf import FPDF
+
+ReportFormat = Literal["pdf", "json", "csv", "html"]
+
+PdfLayout = Literal["text", "table"]
+
+REPORT_FORMATS: tuple[ReportFormat, ...] = ("pdf", "json", "csv", "html")
+
+report_base_name = "relatorio_hashes"
+
+# acima desta quantidade de arquivos o relatório é dividido em volumes
+DEFAULT_VOLUME_SIZE = 5000
+
+STATUS_LABELS = {
+    "ok": "OK",
+    "collision": "COLISÃO",
+    "not_found": "SEM HASH",
+    "size_mismatch": "TAMANHO",
+    "missing": "ILEGÍVEL",
+}
+
+COLORS = {"green": (0, 150, 0), "red": (255, 0, 0), "black": (0, 0, 0)}
+
+TABLE_ROW_HEIGHT = 4
+TABLE_STATUS_WIDTH = 18
+
+
+def volume_name(extension: str, volume: int, volumes: int):
+    if volumes == 1:
+        return f"{report_base_name}.{extension}"
+
+    return f"{report_base_name}_parte_{volume}.{extension}"
+
+
+def pdf_text(text: str):
+    # as fontes padrão do PDF só têm Latin-1
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+class ReportWriter(ABC):
+    """
+    Grava as seções do relatório à medida que chegam, abrindo um novo volume
+    a cada volume_size arquivos. Os volumes ficam na pasta temporária até
+    finish() movê-los para a pasta do caso.
+    """
+
+    extension = ""
+
+    def __init__(self, spool_dir: Path, volume_size: int = DEFAULT_VOLUME_SIZE):
+        self.spool_dir = spool_dir
+        self.volume_size = volume_size
+        self.volumes: list[Path] = []
+        self.file: IO[str] | None = None
+        self.entries = 0
+        self.collisions = 0
+
+    def write(self, section: dict):
+        if self.file is None or self.entries >= self.volume_size:
+            self.close_volume()
+            self.open_volume()
+
+        self.entries += 1
+        if section["collision"]:
+            self.collisions += 1
+
+        self.write_entry(section)
+
+    def open_volume(self):
+        volume = len(self.volumes) + 1
+        path = self.spool_dir.joinpath(f"volume_{volume}.{self.extension}")
+        self.volumes.append(path)
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.entries = 0
+        self.collisions = 0
+        self.write_start()
+
+    def close_volume(self):
+        if self.file is None:
+            return
+
+        self.write_end()
+        self.file.close()
+        self.file = None
+
+    def finish(self, folder_path: Path):
+        if self.file is None and not self.volumes:
+            # nenhum arquivo verificado: ainda assim gera um volume vazio
+            self.open_volume()
+
+        self.close_volume()
+
+        saved: list[Path] = []
+        for volume, path in enumerate(self.volumes, start=1):
+            destination = folder_path.joinpath(
+                volume_name(self.extension, volume, len(self.volumes))
+            )
+            path.replace(destination)
+            saved.append(destination)
+
+        return saved
+
+    def write_start(self):
+        pass
+
+    def write_end(self):
+        pass
+
+    @abstractmethod
+    def write_entry(self, section: dict):
+        pass
+
+
+class JsonReportWriter(ReportWriter):
+    extension = "json"
+
+    def write_start(self):
+        self.file.write('{\n"entries": [\n')
+
+    def write_entry(self, section: dict):
+        separator = ",\n" if self.entries > 1 else ""
+        entry = json.dumps(entry_fields(section), ensure_ascii=False)
+        self.file.write(separator + entry)
+
+    def write_end(self):
+        summary = {
+            "volume": len(self.volumes),
+            "files": self.entries,
+            "collisions": self.collisions,
+        }
+        self.file.write(f'\n],\n"summary": {json.dumps(summary)}\n}}\n')
+
+
+class CsvReportWriter(ReportWriter):
+    extension = "csv"
+
+    def write_start(self):
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(
+            ["arquivo", "status", "algoritmo", "hash_original", "hash_gerada"]
+        )
+
+    def write_entry(self, section: dict):
+        fields = entry_fields(section)
+        self.writer.writerow(
+            [
+                fields["file"],
+                fields["status"],
+                fields["algorithm"] or "",
+                fields["original_hash"] or "",
+                fields["generated_hash"] or "",
+            ]
+        )
+
+
+HTML_STYLE = """
+body { font-family: Arial, sans-serif; font-size: 13px; margin: 24px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ccc; padding: 4px 6px; text-align: left; }
+td { vertical-align: top; }
+td.hash { font-family: monospace; font-size: 11px; word-break: break-all; }
+tr.ok td.status { color: #009600; font-weight: bold; }
+tr.erro td.status { color: #ff0000; font-weight: bold; }
+"""
+
+
+class HtmlReportWriter(ReportWriter):
+    extension = "html"
+
+    def write_start(self):
+        self.file.write(
+            '<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+            + f"<title>Relatório de hashes - volume {len(self.volumes)}</title>\n"
+            + f"<style>{HTML_STYLE}</style>\n</head>\n<body>\n"
+            + f"<h1>Relatório de hashes - volume {len(self.volumes)}</h1>\n"
+            + "<table>\n<tr><th>Situação</th><th>Arquivo</th>"
+            + "<th>Hash original</th><th>Hash gerada</th></tr>\n"
+        )
+
+    def write_entry(self, section: dict):
+        fields = entry_fields(section)
+        row_class = "erro" if section["collision"] else "ok"
+
+        self.file.write(
+            f'<tr class="{row_class}">'
+            + f'<td class="status">{STATUS_LABELS.get(fields["status"], "")}</td>'
+            + f"<td>{html.escape(fields['file'])}</td>"
+            + f'<td class="hash">{html.escape(fields["original_hash"] or "")}</td>'
+            + f'<td class="hash">{html.escape(fields["generated_hash"] or "")}</td>'
+            + "</tr>\n"
+        )
+
+    def write_end(self):
+        self.file.write(
+            "</table>\n"
+            + f"<p>Arquivos neste volume: {self.entries} | "
+            + f"colisões: {self.collisions}</p>\n</body>\n</html>\n"
+        )
+
+
+STREAMING_WRITERS: dict[ReportFormat, type[ReportWriter]] = {
+    "json": JsonReportWriter,
+    "csv": CsvReportWriter,
+    "html": HtmlReportWriter,
+}
+
+
+def entry_fields(section: dict):
+    return {
+        "file": section["file"],
+        "status": section.get("status"),
+        "algorithm": section.get("algorithm"),
+        "original_hash": section.get("original_hash"),
+        "generated_hash": section.get("generated_hash"),
+        "collision": section["collision"],
+        "details": section.get("details"),
+    }
+
+
+def split_to_width(text: str, width: float, char_widths: dict[str, float]):
+    # cell() não quebra linhas: o texto é dividido nos caracteres que cabem
+    # na largura (hashes e caminhos não têm espaços para quebrar), somando a
+    # largura de cada caractere em vez de medir a linha inteira a cada passo
+    lines: list[str] = []
+    start = 0
+    line_width = 0.0
+    for index, char in enumerate(text):
+        char_width = char_widths[char]
+        if index > start and line_width + char_width > width:
+            lines.append(text[start:index])
+            start = index
+            line_width = 0.0
+        line_width += char_width
+
+    lines.append(text[start:])
+    return lines
+
+
+def split_fixed(text: str, chars_per_line: int):
+    # fonte monoespaçada: todas as linhas têm a mesma quantidade de caracteres
+    if not text:
+        return [text]
+
+    return [
+        text[start : start + chars_per_line]
+        for start in range(0, len(text), chars_per_line)
+    ]
+
+
+class CharWidths(dict):
+    # usado apenas enquanto a fonte dele é a fonte atual do PDF
+    def __init__(self, pdf):
+        super().__init__()
+        self.pdf = pdf
+
+    def __missing__(self, char: str):
+        width = self.pdf.get_string_width(char)
+        self[char] = width
+        return width
+
+
+class PdfTableRenderer:
+    """
+    Monta o PDF como tabela com cell(), que é bem mais rápido que multi_cell,
+    trocando a cor do texto apenas quando a situação muda de uma linha para
+    a outra.
+    """
+
+    def __init__(self, head_text: str):
+        self.pdf = FPDF()  # type: ignore
+        self.pdf.set_auto_page_break(True, margin=10)
+        self.pdf.add_page()
+        self.color = None
+        self.widths: dict[tuple, CharWidths] = {}
+
+        self.pdf.set_font("Arial", size=11)
+        self.set_color("black")
+        self.pdf.multi_cell(0, 6, pdf_text(head_text), align="L")
+        self.pdf.ln(2)
+
+    def set_color(self, color: str):
+        if color != self.color:
+            self.pdf.set_text_color(*COLORS.get(color, COLORS["black"]))
+            self.color = color
+
+    def wrapped_cells(self, text: str, height: float):
+        # a primeira linha segue a célula de situação; as continuações ficam
+        # alinhadas na mesma coluna
+        pdf = self.pdf
+        width = pdf.w - pdf.l_margin - pdf.r_margin - TABLE_STATUS_WIDTH
+        width -= 2 * pdf.c_margin
+
+        if pdf.font_family == "courier":
+            chars_per_line = max(1, int(width // self.char_widths()["0"]))
+            lines = split_fixed(text, chars_per_line)
+        else:
+            lines = split_to_width(text, width, self.char_widths())
+
+        for index, line in enumerate(lines):
+            if index:
+                pdf.cell(TABLE_STATUS_WIDTH, height, "", 0, 0)
+            pdf.cell(0, height, line, 0, 1)
+
+    def char_widths(self) -> dict[str, float]:
+        # larguras medidas uma vez por caractere em cada fonte usada
+        pdf = self.pdf
+        font = (pdf.font_family, pdf.font_style, pdf.font_size_pt)
+        if font not in self.widths:
+            self.widths[font] = CharWidths(pdf)
+
+        return self.widths[font]
+
+    def add_rows(self, sections: Iterable[dict]):
+        pdf = self.pdf
+
+        for section in sections:
+            fields = entry_fields(section)
+
+            self.set_color(section.get("color", "black"))
+            pdf.set_font("Arial", "B", 8)
+            pdf.cell(
+                TABLE_STATUS_WIDTH,
+                TABLE_ROW_HEIGHT,
+                pdf_text(STATUS_LABELS.get(fields["status"], "")),
+                0,
+                0,
+            )
+            pdf.set_font("Arial", "", 8)
+            self.wrapped_cells(pdf_text(fields["file"]), TABLE_ROW_HEIGHT)
+
+            pdf.set_font("Courier", "", 6)
+            lines = [
+                f"original: {fields['original_hash'] or '-'}",
+                f"gerada:   {fields['generated_hash'] or '-'}",
+                *(pdf_text(line.strip()) for line in fields["details"] or []),
+            ]
+            for line in lines:
+                pdf.cell(TABLE_STATUS_WIDTH, TABLE_ROW_HEIGHT - 1, "", 0, 0)
+                self.wrapped_cells(line, TABLE_ROW_HEIGHT - 1)
+
+            pdf.ln(1)
+
+    def output(self, path: Path):
+        self.pdf.output(str(path.resolve()))
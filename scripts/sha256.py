@@ -1,13 +1,20 @@
 import hashlib
 
+try:
+    from scripts.buffered_reader import iter_file_chunks
+except ImportError:
+    # executado direto (python scripts/sha256.py): a pasta do script está no path
+    from buffered_reader import iter_file_chunks
+
+chunk_size = 1024 * 1024
+
 
 def calculate_sha256(file_path: str):
     sha256 = hashlib.sha256()
     print(f"calculando hash para o arquivo: {file_path}...\n")
     try:
-        with open(file_path, "rb+") as file:
-            while chunk := file.read(8192):
-                sha256.update(chunk)
+        for chunk in iter_file_chunks(file_path, chunk_size):
+            sha256.update(chunk)
         return sha256.hexdigest()
     except Exception as e:
         return None
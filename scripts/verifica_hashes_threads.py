@@ -1,18 +1,58 @@
-import csv
-from natsort import natsorted
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 from pathlib import Path
-from scripts.google_pdf_reader import read_google_hashes_pdf
-from scripts.hash_report_tools import Hasher, Reporter
-import py7zr
+from scripts.google_pdf_reader import read_google_hashes
+from scripts.hash_report_tools import Reporter, HashFunc, PDFSection
+from scripts.report_writers import (
+    DEFAULT_VOLUME_SIZE,
+    REPORT_FORMATS,
+    PdfLayout,
+    ReportFormat,
+)
+from scripts.manifest_parser import Manifest
+from scripts.hash_engine import (
+    DEFAULT_CHUNK_SIZE,
+    SCHEDULE_POLICIES,
+    ChunkSpec,
+    EngineMode,
+    HashEngine,
+    HashJob,
+    HashJobResult,
+    SchedulePolicy,
+)
+from scripts.evidence_walker import EvidenceFile, walk_evidence_tree
+from scripts.hash_journal import HashJournal
+from scripts.digest_index import (
+    DigestIndex,
+    disable_digest_index,
+    get_digest_index,
+)
+from scripts.chunk_manifest import (
+    MANIFEST_CHUNK_SIZE,
+    format_bad_ranges,
+    load_chunk_manifest,
+    save_chunk_manifest,
+    verify_chunk_manifest,
+)
+from scripts.hash_progress import (
+    ConsoleProgress,
+    JsonRunLog,
+    ProgressListener,
+    ProgressTracker,
+)
 
 successIcon = "✅"
 errorIcon = "❌"
 
 google_pdf_filename = str("Valores de Hash")
 
+run_log_filename = "log_verificacao_hashes.jsonl"
+
+journal_filename = ".diario_verificacao_hashes.jsonl"
+
+# arquivos a partir deste tamanho recebem manifesto de blocos com --gerar-blocos
+CHUNK_MANIFEST_THRESHOLD = 1024 * 1024 * 1024
+
 
 def check_if_google_file(text_file: Path):
     if google_pdf_filename in text_file.name and text_file.name.endswith(".pdf"):
@@ -21,212 +61,325 @@ def check_if_google_file(text_file: Path):
     return False
 
 
-def create_google_hashes_file(text_file: Path):
-    with open(text_file, "tr+") as file:
-        filtered_lines: list[str] = []
+def create_manifest(hashes_path: Path, is_google_hashes: bool):
+    if is_google_hashes:
+        manifest = Manifest("google")
 
-        text = file.read()
-        if "SHA512" not in text:
-            return
+        for name, hexdigest in read_google_hashes(hashes_path).items():
+            manifest.add(name, hexdigest)
 
-        text = text.replace("\n", "")
-        # text = text.replace(":", "-")
-        text = text.replace(" ", "")
-
-        lines = text.split("SHA512-")
-
-        for line in lines:
-            line = line.replace(
-                "GoogleLLC1600AmphitheatreParkwMountainView,California94043www.google.com",
-                "",
-            )
+        return manifest
 
-            hash = Hasher.extract_sha512(line)
+    return Manifest.from_file(hashes_path)
 
-            if hash:
-                line = line.replace(hash, f"{hash}\n")
 
-            if line:
-                filtered_lines.append(line)
+def find_size_mismatch(file: EvidenceFile, manifest: Manifest):
+    entry = manifest.get(file.path.name)
 
-        file.seek(0)
-        file.truncate()
-        file.writelines(filtered_lines)
+    if entry is None or entry.size is None:
+        return None
 
+    # o tamanho vem do stat feito na listagem da pasta
+    if file.size == entry.size:
+        return None
 
-def create_hashes_dict_from_csv(csv_file: Path):
-    with open(csv_file, mode="r", newline="") as file:
-        csv_reader = csv.reader(file)
-        next(csv_reader)
+    return entry.size, file.size
 
-        hashes_dict: dict[str, str] = {}
 
-        for row in csv_reader:
-            file_name = row[1]
-            hash = row[5]
-            hashes_dict[file_name] = hash
+def create_files_list(files_folder_path: Path):
+    tree = walk_evidence_tree(files_folder_path)
 
-        return hashes_dict
-
-
-def create_hashes_dict_from_txt(txt_file: Path, isSha512: bool):
-    hashes_dict: dict[str, str | None] = {}
-
-    with open(txt_file, "tr", encoding="utf-8") as file:
-        lines = file.readlines()
-
-        for line in lines:
-            splitted = line.replace(" ", "").split(":")
-            file_name = splitted[0]
-            original_hash = (
-                Hasher.extract_sha512(line) if isSha512 else Hasher.extract_sha256(line)
-            )
-            hashes_dict[file_name] = original_hash
+    return {"folder_files": tree["files"], "hashes_path": tree["hashes_path"]}
 
-        return hashes_dict
 
+def hash_funcs_for_file(
+    file: Path, manifest: Manifest, default_hash_func: HashFunc
+) -> tuple[HashFunc, ...]:
+    # o algoritmo é escolhido pelo tamanho da hash original de cada arquivo
+    entry = manifest.get(file.name)
 
-def create_hashes_dict(hashes_path: Path, is_google_hashes: bool):
-    hashes_dict: dict[str, str] = {}
+    if entry and entry.hash_func:
+        return (entry.hash_func,)
 
-    if hashes_path.name.endswith(".csv"):
-        hashes_dict = create_hashes_dict_from_csv(hashes_path)
-    else:
-        if is_google_hashes:
-            read_google_hashes_pdf(hashes_path)
+    # sem hash original válida: SHA256 e SHA512 na mesma leitura
+    return tuple(dict.fromkeys((default_hash_func, "SHA256", "SHA512")))
 
-            hashes_path = hashes_path.parent.joinpath("hashes.txt")
 
-            create_google_hashes_file(hashes_path)
+def process_file(
+    result: HashJobResult, manifest: Manifest, default_hash_func: HashFunc
+):
+    file = result["file"]
+    digests = result["digests"]
+    entry = manifest.get(file.name)
 
-        hashes_dict = create_hashes_dict_from_txt(
-            hashes_path, isSha512=is_google_hashes
+    if not entry:
+        return Reporter.create_file_report(
+            file,
+            hash_not_found=True,
+            has_collision=True,
+            original_hash="- - - -",
+            generated_hash=digests.get(default_hash_func),
         )
 
-    return hashes_dict
+    generated_hash = digests.get(entry.hash_func)
 
+    return Reporter.create_file_report(
+        file,
+        hash_not_found=False,
+        has_collision=not entry.matches(generated_hash),
+        original_hash=entry.hexdigest,
+        generated_hash=generated_hash,
+    )
 
-def create_files_list(files_folder_path: Path, level: int):
-    hashes_path: Path | None = None
 
+def report_duplicates(digest_index: DigestIndex, result: HashJobResult):
+    # registra no índice entre casos e avisa sobre cópias idênticas
+    duplicates: dict[str, None] = {}
 
-    folder_files: list[Path] = []
+    for hash_func, digest in result["digests"].items():
+        if not digest:
+            continue
 
-    for item in files_folder_path.iterdir():
-        subfolder_files = []
+        digest_index.add_file(result["file"], hash_func, digest, result["size"])
 
-        is_dir = item.is_dir()
+        for duplicate in digest_index.duplicates(result["file"], hash_func, digest):
+            duplicates[duplicate] = None
 
-        item = item.resolve()
+    for duplicate in duplicates:
+        print(f"      arquivo idêntico: {duplicate}")
 
-        print(py7zr.is_7zfile(item.resolve()))
 
-        if is_dir and level == 0:
-            subfolder_files = create_files_list(item, level=1).get("folder_files", [])
-        elif item.name.endswith(".zip"):
-            folder_files.append(item)
-        elif item.name.endswith(".7z"):
-            folder_files.append(item)
-        elif py7zr.is_7zfile(item.resolve()):
-            folder_files.append(item)
-            # adiciona os arquivos contidos nas subpastas em até 1 nível abaixo
-        elif item.name.endswith(".gpg"):
-            folder_files.append(item)
-        elif item.name == "HASHES.txt":
-            hashes_path = item
-        elif item.name == "hashes.txt":
-            hashes_path = item
-        elif item.name.endswith(".csv"):
-            hashes_path = item
-        elif google_pdf_filename in item.name and item.name.endswith(".pdf"):
-            hashes_path = item
-        elif item.name.endswith(".pdf") and "relatorio_hashes" not in item.name:
-            folder_files.append(item)
+def chunk_spec_for(
+    file: EvidenceFile, create_chunk_manifests: bool
+) -> ChunkSpec | None:
+    # blocos calculados na mesma leitura da hash: para conferir um manifesto
+    # existente em caso de colisão, ou para gravar um novo com --gerar-blocos
+    create = create_chunk_manifests and file.size >= CHUNK_MANIFEST_THRESHOLD
 
-        folder_files.extend(subfolder_files)
+    try:
+        manifest = load_chunk_manifest(file.path)
+    except (OSError, ValueError):
+        manifest = None
+
+    if manifest:
+        return (manifest["algorithm"], manifest["chunk_size"], create)
+
+    if create:
+        return ("SHA256", MANIFEST_CHUNK_SIZE, True)
+
+    return None
+
+
+def check_chunk_manifest(
+    report: PDFSection,
+    file: Path,
+    mode: EngineMode,
+    chunks: list[str] | None = None,
+):
+    # com o manifesto de blocos de uma verificação anterior, a colisão aponta
+    # os trechos corrompidos em vez do arquivo inteiro
+    manifest = load_chunk_manifest(file)
+    if manifest is None:
+        return report
+
+    verification = verify_chunk_manifest(file, manifest, mode=mode, chunks=chunks)
+    if verification is None or verification["ok"]:
+        return report
+
+    bad_ranges = format_bad_ranges(verification)
+    text = report["text"].rstrip("\n") + "\n" + bad_ranges
+    details = report["details"] + [line.strip() for line in bad_ranges.splitlines()]
+
+    return {**report, "text": text + "\n\n", "details": details}
+
+
+def verify_hashes(
+    files_folder_path: str,
+    mode: EngineMode = "thread",
+    max_workers: int | None = None,
+    force_rehash: bool = False,
+    progress_listeners: list[ProgressListener] | None = None,
+    schedule: SchedulePolicy = "largest_first",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    drop_cache: bool = False,
+    max_mbps: float | None = None,
+    create_chunk_manifests: bool = False,
+    report_formats: tuple[ReportFormat, ...] = ("pdf",),
+    volume_size: int = DEFAULT_VOLUME_SIZE,
+    pdf_layout: PdfLayout = "text",
+):
+    path = Path(files_folder_path)
+    if not path.exists():
+        # sem sys.exit: na interface a verificação roda em uma thread
+        msg = "o caminho da pasta de arquivos não existe"
+        print(msg)
+        return {"error": msg}
 
-    folder_files = natsorted(folder_files)
+    object = create_files_list(path)
 
-    return {"folder_files": folder_files, "hashes_path": hashes_path}
+    folder_files: list[EvidenceFile] = object["folder_files"]
+    hashes_path: Path | None = object["hashes_path"]
 
+    if not hashes_path:
+        msg = "o caminho do arquivo de hashes.txt ou .csv não existe"
+        print(msg)
+        return {"error": msg}
 
-def process_file(args: tuple[Path, Path, dict[str, str], bool]):
-    file, files_folder_path, hashes_dict, is_google_hashes = args
-    file_name = file.name
-    file_path = file.resolve()
+    hashes_path = hashes_path.resolve()
 
-    try:
-        file_name_in_dict = file_name.replace(" ", "")
-        original_hash = hashes_dict.get(file_name_in_dict, None)
-        generated_hash = Hasher.generate_file_hash(file_path, is_google_hashes)
-        has_collision = original_hash != generated_hash
+    is_google_hashes = check_if_google_file(hashes_path)
+    manifest = create_manifest(hashes_path, is_google_hashes)
 
-        if not original_hash:
-            raise ValueError("não encontrou a hash original")
+    hashes_count = len(manifest)
 
-        file_report = Reporter.create_file_report(
-            file,
-            hash_not_found=False,
-            has_collision=has_collision,
-            original_hash=original_hash,
-            generated_hash=generated_hash,
-        )
+    reporter = Reporter(
+        hashes_count=hashes_count,
+        files=[file.path for file in folder_files],
+        formats=report_formats,
+        volume_size=volume_size,
+        pdf_layout=pdf_layout,
+    )
+    reporter.configure_pdf()
+    print(f"\nIniciando verificação\n")
 
-    except Exception as e:
-        file_report = Reporter.create_file_report(
-            file,
-            hash_not_found=not original_hash,
-            has_collision=True,
-            original_hash=original_hash or "- - - -",
-            generated_hash=generated_hash,
-        )
+    default_hash_func: HashFunc = "SHA512" if is_google_hashes else "SHA256"
 
-    return file_report
+    journal = HashJournal(path.joinpath(journal_filename), path.resolve())
+    journal.load()
+    resumed_count = 0
 
+    jobs: list[HashJob] = []
+    files_by_path = {file.path: file for file in folder_files}
 
-def verify_hashes(files_folder_path: str):
-    path = Path(files_folder_path)
-    if not path.exists():
-        print("o caminho da pasta de arquivos não existe")
-        sys.exit(1)
+    for file in folder_files:
+        # tamanho diferente do manifesto já prova a colisão, sem ler o arquivo
+        size_mismatch = find_size_mismatch(file, manifest)
 
-    Reporter.configure_pdf()
+        if size_mismatch:
+            report = Reporter.create_file_report(
+                file.path,
+                hash_not_found=False,
+                has_collision=True,
+                original_hash=manifest.get(file.path.name).hexdigest,
+                generated_hash=None,
+                size_mismatch=size_mismatch,
+            )
+            reporter.add_report_to_pdf(report)
+            reporter.print_file_report(report)
+            continue
+
+        hash_funcs = hash_funcs_for_file(file.path, manifest, default_hash_func)
+
+        # arquivo já verificado por uma execução interrompida e que não mudou;
+        # com force_rehash o diário é ignorado como o cache de hashes
+        record = None
+        if not force_rehash:
+            record = journal.get(file.path, file.size, file.mtime_ns, hash_funcs)
+
+        if record:
+            result: HashJobResult = {
+                "file": file.path,
+                "digests": record["digests"],
+                "size": file.size,
+                "seconds": 0.0,
+                "chunk_size": 0,
+            }
+            report = process_file(result, manifest, default_hash_func)
+            reporter.add_report_to_pdf(report)
+            resumed_count += 1
+            continue
+
+        job: HashJob = {
+            "file": file.path,
+            "hash_funcs": hash_funcs,
+            "size": file.size,
+            "inode": file.inode,
+        }
+
+        chunk_spec = chunk_spec_for(file, create_chunk_manifests)
+        if chunk_spec:
+            job["chunk_spec"] = chunk_spec
+
+        jobs.append(job)
+
+    if resumed_count:
+        print(f"Retomando verificação: {resumed_count} arquivos já verificados\n")
+
+    if force_rehash:
+        print("Recalculando todas as hashes, o cache será ignorado\n")
+
+    run_info = {"Modo de execução": mode, "Ordem de processamento": schedule}
+    if drop_cache:
+        run_info["Cache de páginas"] = "preservado (posix_fadvise)"
+    if max_mbps:
+        run_info["Limite de leitura"] = f"{max_mbps:g} MB/s"
+    reporter.run_info.update(run_info)
+
+    listeners = [JsonRunLog(path.joinpath(run_log_filename))]
+    listeners += progress_listeners or []
+
+    progress = ProgressTracker(
+        total_bytes=sum(job["size"] for job in jobs),
+        files_total=len(jobs),
+        listeners=listeners,
+        run_info=run_info,
+    )
 
-    object = create_files_list(path, level=0)
+    digest_index = get_digest_index()
+
+    engine = HashEngine(
+        mode=mode,
+        max_workers=max_workers,
+        force_rehash=force_rehash,
+        progress=progress,
+        schedule=schedule,
+        chunk_size=chunk_size,
+        drop_cache=drop_cache,
+        max_mbps=max_mbps,
+    )
 
-    folder_files: list[Path] = object["folder_files"]
-    hashes_path: Path | None = object["hashes_path"]
+    chunk_specs: dict[Path, ChunkSpec] = {
+        job["file"]: job["chunk_spec"] for job in jobs if "chunk_spec" in job
+    }
 
-    if not hashes_path:
-        msg = "o caminho do arquivo de hashes.txt ou .csv não existe"
-        print(msg)
-        return {"error": msg}
+    progress.run_started()
 
-    hashes_path = hashes_path.resolve()
+    try:
+        for result in engine.run(jobs):
+            report = process_file(result, manifest, default_hash_func)
 
-    is_google_hashes = check_if_google_file(hashes_path)
-    hashes_dict = create_hashes_dict(hashes_path, is_google_hashes)
+            chunks = result.get("chunks")
+            chunk_spec = chunk_specs.get(result["file"])
 
-    hashes_count = len(hashes_dict)
+            if report["collision"]:
+                report = check_chunk_manifest(report, result["file"], mode, chunks)
+            elif chunk_spec and chunk_spec[2] and chunks is not None:
+                hash_func, chunk_size, _ = chunk_spec
+                save_chunk_manifest(result["file"], hash_func, chunk_size, chunks)
 
-    Reporter.hashes_count = hashes_count
-    print(f"\nIniciando verificação\n")
+            reporter.add_report_to_pdf(report)
 
-    args_list = [
-        (file, files_folder_path, hashes_dict, is_google_hashes)
-        for file in folder_files
-    ]
+            reporter.print_file_report(report)
 
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = [executor.submit(process_file, args) for args in args_list]
-        for future in as_completed(futures):
-            report = future.result()
+            if digest_index:
+                report_duplicates(digest_index, result)
 
-            Reporter.add_report_to_pdf(report)
+            if any(result["digests"].values()):
+                file = files_by_path[result["file"]]
+                journal.append(
+                    file.path,
+                    file.size,
+                    file.mtime_ns,
+                    result["digests"],
+                    report["collision"],
+                )
+    finally:
+        progress.run_finished()
+        journal.close()
 
-            Reporter.print_file_report(report)
+    reporter.save_reports(path)
 
-    Reporter.save_report_pdf(path)
+    journal.remove()
 
     return {}
 
@@ -240,7 +393,132 @@ if __name__ == "__main__":
         help="Pasta onde estão os arquivos a serem verificados e o arquivo de hashes",
     )
 
+    parser.add_argument(
+        "--modo",
+        type=str,
+        choices=["thread", "process"],
+        default="thread",
+        help="Executa o cálculo das hashes em threads ou em processos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Quantidade máxima de workers (padrão: definida pela quantidade de núcleos)",
+    )
+    parser.add_argument(
+        "--forcar-recalculo",
+        action="store_true",
+        help="Ignora o cache e lê novamente todos os arquivos (cadeia de custódia)",
+    )
+
+    parser.add_argument(
+        "--ordem",
+        type=str,
+        choices=SCHEDULE_POLICIES,
+        default=None,
+        help="Ordem de processamento: maiores primeiro (padrão), menores primeiro "
+        + "(padrão com --acompanhar), natural ou física (pelo inode, para discos "
+        + "mecânicos)",
+    )
+
+    parser.add_argument(
+        "--preservar-cache",
+        action="store_true",
+        help="Descarta do cache de páginas o que já foi lido, para não prejudicar "
+        + "outros programas (Linux)",
+    )
+    parser.add_argument(
+        "--limite-mbps",
+        type=float,
+        default=None,
+        help="Limita a leitura dos arquivos a esta quantidade de MB/s",
+    )
+
+    parser.add_argument(
+        "--gerar-blocos",
+        action="store_true",
+        help="Grava o manifesto de hashes por bloco dos arquivos grandes verificados, "
+        + "para localizar trechos corrompidos em verificações futuras",
+    )
+    parser.add_argument(
+        "--sem-indice",
+        action="store_true",
+        help="Não consulta nem atualiza o índice de arquivos idênticos entre casos",
+    )
+
+    parser.add_argument(
+        "--formatos",
+        nargs="+",
+        choices=REPORT_FORMATS,
+        default=["pdf"],
+        help="Formatos do relatório: pdf, json, csv e/ou html",
+    )
+    parser.add_argument(
+        "--volume",
+        type=int,
+        default=DEFAULT_VOLUME_SIZE,
+        help="Quantidade máxima de arquivos por volume do relatório",
+    )
+
+    parser.add_argument(
+        "--acompanhar",
+        action="store_true",
+        help="Acompanha a pasta enquanto os downloads chegam e verifica cada "
+        + "arquivo assim que ele termina de baixar",
+    )
+    parser.add_argument(
+        "--intervalo",
+        type=float,
+        default=10.0,
+        help="Com --acompanhar, segundos entre as varreduras da pasta",
+    )
+    parser.add_argument(
+        "--tempo-ocioso",
+        type=float,
+        default=60.0,
+        help="Com --acompanhar, encerra após estes minutos sem arquivos novos",
+    )
+
     args = parser.parse_args()
 
     folder_path: str = args.pasta
-    verify_hashes(folder_path)
+
+    if args.sem_indice:
+        disable_digest_index()
+
+    if args.acompanhar:
+        from scripts.hash_watcher import watch_hashes
+
+        watch_hashes(
+            folder_path,
+            mode=args.modo,
+            max_workers=args.workers,
+            progress_listeners=[ConsoleProgress()],
+            poll_seconds=args.intervalo,
+            idle_minutes=args.tempo_ocioso,
+            report_formats=tuple(args.formatos),
+            volume_size=args.volume,
+            force_rehash=args.forcar_recalculo,
+            schedule=args.ordem or "smallest_first",
+            drop_cache=args.preservar_cache,
+            max_mbps=args.limite_mbps,
+        )
+        sys.exit(0)
+
+    result = verify_hashes(
+        folder_path,
+        mode=args.modo,
+        max_workers=args.workers,
+        force_rehash=args.forcar_recalculo,
+        progress_listeners=[ConsoleProgress()],
+        schedule=args.ordem or "largest_first",
+        drop_cache=args.preservar_cache,
+        max_mbps=args.limite_mbps,
+        create_chunk_manifests=args.gerar_blocos,
+        report_formats=tuple(args.formatos),
+        volume_size=args.volume,
+    )
+
+    if result.get("error"):
+        sys.exit(1)
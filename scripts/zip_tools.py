@@ -1,5 +1,8 @@
+import os
 import pathlib
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from scripts.archive_integrity import ArchiveResult, verify_zip
 
 
 def recursive_create_zip_list(root_path: str):
@@ -21,8 +24,99 @@ def recursive_create_zip_list(root_path: str):
         return files
 
 
-def recursive_delete_zips(root_path: str):
-    files = recursive_create_zip_list(root_path)
+def default_test_workers():
+    # zlib e crc32 liberam o GIL, mas muitos zips ao mesmo tempo só disputam o disco
+    return min(8, os.cpu_count() or 1)
+
+
+def test_zip_files(
+    files: list[str], max_workers: int | None = None
+) -> dict[str, ArchiveResult]:
+    """
+    Confere o CRC de todos os membros de vários zips ao mesmo tempo, sem
+    extrair nada. Cada zip é lido por uma única thread do pool.
+    """
+    max_workers = max_workers or default_test_workers()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda file: verify_zip(pathlib.Path(file), max_workers=1), files
+        )
+
+        return dict(zip(files, results))
+
+
+def print_zip_test_errors(results: dict[str, ArchiveResult]):
+    for file, result in results.items():
+        if result["ok"]:
+            continue
+
+        print(f"zip corrompido, não será extraído nem apagado: {file}")
+
+        if result["error"]:
+            print(f"      erro: {result['error']}")
+
+        for member in result["members"]:
+            if not member["ok"]:
+                print(f"      {member['member']}: {member['error']}")
+
+
+def extracted_member_path(destination: pathlib.Path, info: zipfile.ZipInfo):
+    # mesmo saneamento de nomes feito pelo ZipFile.extract; no Windows o próprio
+    # zipfile troca os caracteres inválidos e remove o fim de cada parte
+    arcname = info.filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_parts = ("", os.curdir, os.pardir)
+    parts = [part for part in arcname.split(os.path.sep) if part not in invalid_parts]
+
+    if os.path.sep == "\\":
+        arcname = os.path.sep.join(parts)
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+        parts = arcname.split(os.path.sep)
+
+    return destination.joinpath(*parts)
+
+
+def extraction_complete(file: str, destination: pathlib.Path):
+    # todos os membros existem no destino com o tamanho registrado no zip
+    try:
+        with zipfile.ZipFile(file) as zip_file:
+            infos = [info for info in zip_file.infolist() if not info.is_dir()]
+    except Exception as e:
+        print(f"unzip check error {e}")
+        return False
+
+    for info in infos:
+        path = extracted_member_path(destination, info)
+
+        try:
+            if path.stat().st_size != info.file_size:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def recursive_delete_zips(
+    root_path: str,
+    keep: set[str] | None = None,
+    verified: set[str] | None = None,
+):
+    # com verified, apenas os zips testados e extraídos por completo são apagados
+    keep = keep or set()
+    files = [file for file in recursive_create_zip_list(root_path) if file not in keep]
+
+    if verified is not None:
+        skipped = [file for file in files if file not in verified]
+        files = [file for file in files if file in verified]
+
+        if skipped:
+            print(f"mantendo {len(skipped)} arquivos zip não extraídos por completo")
+
     print(f"deletando {len(files)} arquivos zip")
 
     for file in files:
@@ -34,15 +128,25 @@ def recursive_delete_zips(root_path: str):
             print(f"delete file error {e}")
 
 
-def recursive_unzip_files(root_path: str):
+def recursive_unzip_files(root_path: str, max_workers: int | None = None):
     files = recursive_create_zip_list(root_path)
+
+    print(f"testando {len(files)} arquivos zips")
+    results = test_zip_files(files, max_workers)
+    print_zip_test_errors(results)
+
+    files = [file for file in files if results[file]["ok"]]
     print(f"descompactando {len(files)} arquivos zips")
 
     for file in files:
         try:
             file_path = pathlib.Path(file)
-            dir = str(file_path.parent.resolve())
-            zipfile.ZipFile(file).extractall(dir)
-            file_path.unlink()
+            dir = file_path.parent.resolve()
+            zipfile.ZipFile(file).extractall(str(dir))
+
+            if extraction_complete(file, dir):
+                file_path.unlink()
+            else:
+                print(f"extração incompleta, zip mantido: {file}")
         except Exception as e:
             print(f"unzip error {e}")
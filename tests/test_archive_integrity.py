@@ -0,0 +1,68 @@
+import hashlib
+import zipfile
+from pathlib import Path
+
+import py7zr
+
+from scripts.archive_integrity import verify_archive
+
+CONTENT = bytes(range(256)) * 4096
+
+
+def corrupt(path: Path):
+    # troca bytes no meio dos dados compactados, longe dos cabeçalhos
+    data = bytearray(path.read_bytes())
+    start = len(data) // 2
+    data[start : start + 16] = bytes(byte ^ 0xFF for byte in data[start : start + 16])
+    path.write_bytes(bytes(data))
+
+
+def create_zip(path: Path):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zip_file:
+        zip_file.writestr("pasta/dados.bin", CONTENT)
+        zip_file.writestr("leia.txt", b"texto")
+
+    return path
+
+
+def create_7z(path: Path):
+    with py7zr.SevenZipFile(path, "w") as archive:
+        archive.writestr(CONTENT, "dados.bin")
+
+    return path
+
+
+def test_good_zip(tmp_path: Path):
+    result = verify_archive(create_zip(tmp_path.joinpath("bom.zip")), with_sha256=True)
+
+    assert result["ok"]
+    members = {member["member"]: member for member in result["members"]}
+    assert set(members) == {"pasta/dados.bin", "leia.txt"}
+    assert members["pasta/dados.bin"]["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_corrupted_zip(tmp_path: Path):
+    path = create_zip(tmp_path.joinpath("ruim.zip"))
+    corrupt(path)
+
+    result = verify_archive(path)
+
+    assert not result["ok"]
+    assert any(not member["ok"] for member in result["members"])
+
+
+def test_good_7z(tmp_path: Path):
+    result = verify_archive(create_7z(tmp_path.joinpath("bom.7z")))
+
+    assert result["ok"]
+    assert result["error"] is None
+
+
+def test_corrupted_7z(tmp_path: Path):
+    path = create_7z(tmp_path.joinpath("ruim.7z"))
+    corrupt(path)
+
+    result = verify_archive(path)
+
+    assert not result["ok"]
+    assert result["error"]
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from scripts.manifest_parser import (
+    GOOGLE_FOOTER,
+    Manifest,
+    detect_manifest_format,
+    parse_google_lines,
+)
+
+SHA256 = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+SHA512 = "ee26b0dd4af7e749aa1a8ee3c10ae9923f618980772e473f8819a5d4940e0db2" * 2
+
+
+def write(tmp_path: Path, name: str, text: str):
+    path = tmp_path.joinpath(name)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def rows(manifest: Manifest):
+    return {entry.name: (entry.hexdigest, entry.size) for entry in manifest}
+
+
+def test_txt_model(tmp_path: Path):
+    path = write(tmp_path, "hashes.txt", f"arquivo 1.zip:{SHA256}\nlixo\n")
+    manifest = Manifest.from_file(path)
+
+    assert manifest.format == "txt"
+    assert rows(manifest) == {"arquivo 1.zip": (SHA256, None)}
+    # a busca ignora os espaços do nome
+    assert manifest.get("arquivo1.zip").hash_func == "SHA256"
+
+
+def test_txt_accepts_sha256sum_lines(tmp_path: Path):
+    path = write(tmp_path, "hashes.txt", f"{SHA256}  pasta/a.zip\n")
+
+    assert rows(Manifest.from_file(path)) == {"a.zip": (SHA256, None)}
+
+
+def test_sha256sum_gnu_bsd_and_escaped(tmp_path: Path):
+    text = (
+        f"{SHA256}  a.zip\n"
+        + f"{SHA256} *b.zip\n"
+        + f"SHA256 (c.zip) = {SHA256}\n"
+        + f"\\{SHA256}  d\\\\e.zip\n"
+    )
+    path = write(tmp_path, "lista.sha256", text)
+    manifest = Manifest.from_file(path)
+
+    assert detect_manifest_format(path) == "sha256sum"
+    assert set(rows(manifest)) == {"a.zip", "b.zip", "c.zip", "d\\e.zip"}
+
+
+def test_csv_by_header(tmp_path: Path):
+    text = (
+        "Arquivo,Tamanho (MB),Algoritmo,Hash,Size\n"
+        + f"a.zip,1.5,SHA256,{SHA256},1572864\n"
+        + f"b.zip,2,SHA256,{SHA256},1.000\n"
+    )
+    path = write(tmp_path, "hashes.csv", text)
+
+    assert rows(Manifest.from_file(path)) == {
+        "a.zip": (SHA256, 1572864),
+        "b.zip": (SHA256, None),
+    }
+
+
+def test_google_csv_keeps_fixed_columns(tmp_path: Path):
+    text = (
+        "Account,File name,Created,Size,Algorithm,Hash\n"
+        + f"conta,Nome.zip,2024-01-01,123,SHA512,{SHA512}\n"
+    )
+    path = write(tmp_path, "hashes.csv", text)
+    manifest = Manifest.from_file(path)
+
+    assert rows(manifest) == {"Nome.zip": (SHA512, 123)}
+    # maiúsculas diferenciam evidências
+    assert manifest.get("nome.zip") is None
+
+
+def test_google_pdf_text_split_across_lines():
+    lines = [
+        "conta-1.zip:SHA512-",
+        SHA512[:70] + "\n",
+        GOOGLE_FOOTER,
+        SHA512[70:] + " conta-2.zip:",
+        f"SHA512-{SHA512}",
+    ]
+
+    assert list(parse_google_lines(lines)) == [
+        ("conta-1.zip", SHA512, None),
+        ("conta-2.zip", SHA512, None),
+    ]
+
+
+def test_entry_matches_in_any_case():
+    manifest = Manifest()
+    manifest.add("a.zip", SHA256.upper())
+
+    entry = manifest.get("a.zip")
+    assert entry.matches(SHA256)
+    assert not entry.matches(None)
+    assert not entry.matches("zz")
@@ -0,0 +1,102 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.hash_report_tools import Reporter
+
+
+def file_names(count: int):
+    return [Path(f"/evidencias/arquivo_{index}.zip") for index in range(count)]
+
+
+def section(file: Path, collision: bool = False):
+    return Reporter.create_file_report(
+        str(file),
+        hash_not_found=False,
+        has_collision=collision,
+        original_hash="a" * 64,
+        generated_hash="b" * 64 if collision else "a" * 64,
+    )
+
+
+def read_files(folder: Path, report_format: str):
+    path = folder.joinpath(f"relatorio_hashes.{report_format}")
+
+    if report_format == "json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [entry["file"] for entry in data["entries"]]
+
+    if report_format == "csv":
+        with open(path, newline="", encoding="utf-8") as file:
+            return [row[0] for row in list(csv.reader(file))[1:]]
+
+    rows = path.read_text(encoding="utf-8").splitlines()
+    return [
+        row.split("<td>")[1].split("</td>")[0]
+        for row in rows
+        if row.startswith("<tr class=")
+    ]
+
+
+@pytest.mark.parametrize("report_format", ["json", "csv", "html"])
+def test_sections_out_of_order_are_flushed(tmp_path: Path, report_format):
+    files = file_names(5)
+    reporter = Reporter(hashes_count=5, files=files, formats=(report_format,))
+
+    for index in (3, 1, 4, 0):
+        reporter.add_report_to_pdf(section(files[index]))
+
+    reporter.save_reports(tmp_path)
+
+    assert read_files(tmp_path, report_format) == [str(files[i]) for i in (0, 1, 3, 4)]
+
+
+def test_pdf_sections_out_of_order_are_flushed(tmp_path: Path, monkeypatch):
+    files = file_names(5)
+    texts: list[str] = []
+    monkeypatch.setattr(
+        Reporter, "add_text_to_pdf", lambda self, text: texts.append(text)
+    )
+
+    reporter = Reporter(hashes_count=5, files=files, formats=("pdf",))
+    reporter.configure_pdf()
+    for index in (3, 1, 4, 0):
+        reporter.add_report_to_pdf(section(files[index]))
+
+    reporter.save_reports(tmp_path)
+
+    # o primeiro texto é o cabeçalho
+    written = [text.split()[1] for text in texts[1:]]
+    assert written == [str(files[i]) for i in (0, 1, 3, 4)]
+
+
+def test_file_reported_twice_is_not_held(tmp_path: Path):
+    files = file_names(3)
+    reporter = Reporter(hashes_count=4, files=files, formats=("csv",))
+
+    # o mesmo arquivo conferido com duas hashes chega com o mesmo índice
+    for index in (0, 0, 1, 2):
+        reporter.add_report_to_pdf(section(files[index]))
+        assert not reporter.pending
+
+    reporter.save_reports(tmp_path)
+
+    assert read_files(tmp_path, "csv") == [str(files[i]) for i in (0, 0, 1, 2)]
+
+
+def test_reorder_limit_spools_and_keeps_order(tmp_path: Path):
+    files = file_names(20)
+    reporter = Reporter(
+        hashes_count=20, files=files, formats=("json",), reorder_limit=3
+    )
+
+    # o primeiro arquivo é o mais lento: o buffer enche antes de ele chegar
+    for index in [*range(1, 20), 0]:
+        reporter.add_report_to_pdf(section(files[index], collision=index == 7))
+
+    assert len(reporter.pending) <= 3
+    assert [item["file"] for item in reporter.iter_sections()] == list(map(str, files))
+    assert reporter.collisions == 1
+    reporter.close()